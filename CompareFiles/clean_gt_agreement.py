@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from agreement import AM_PAIRS, compare_am
+from columnar_io import read_table
+
+
+def main() -> None:
+    clean_path = "C:/Users/HELIOS-300/Desktop/WAVES/AM Full Code/Cameron_AM_Clean"
+    gt_path = "C:/Users/HELIOS-300/Desktop/Data/am_gt_3.csv"
+
+    # Only the join keys and the scored label columns are loaded
+    clean_cols = ["id", "do_session", "date_time"] + [c for c, _ in AM_PAIRS]
+    gt_cols = ["id", "DO_session", "day", "actual_time"] + [g for _, g in AM_PAIRS]
+    clean_df = read_table(clean_path, columns=clean_cols)
+    gt_df = read_table(gt_path, columns=gt_cols)
+
+    scores, confusions, coverage = compare_am(clean_df, gt_df)
+    print("Aligned seconds:")
+    print(coverage.to_string(index=False))
+
+    for pair, conf in confusions.items():
+        print(f"\n===== {pair} =====")
+        print(scores[scores["pair"] == pair].drop(columns="pair").to_string(index=False))
+        print("\nConfusion (clean rows x GT columns):")
+        print(conf.to_string())
+
+
+if __name__ == "__main__":
+    main()
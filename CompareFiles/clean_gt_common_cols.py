@@ -1,16 +1,23 @@
-import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from columnar_io import read_table, table_columns
 
 
 def main() -> None:
-    clean_path = "C:/Users/HELIOS-300/Desktop/WAVES/AM Full Code/Cameron_AM_Clean.csv"
+    clean_path = "C:/Users/HELIOS-300/Desktop/WAVES/AM Full Code/Cameron_AM_Clean"
     gt_path = "C:/Users/HELIOS-300/Desktop/Data/am_gt_3.csv"
 
-    clean_df = pd.read_csv(clean_path)
-    gt_df = pd.read_csv(gt_path)
-
-    common_cols = [c for c in clean_df.columns if c in gt_df.columns]
+    # Only the columns both sides share are ever loaded
+    gt_cols = set(table_columns(gt_path))
+    common_cols = [c for c in table_columns(clean_path) if c in gt_cols]
     print("Common columns:", common_cols)
 
+    clean_df = read_table(clean_path, columns=common_cols)
+    gt_df = read_table(gt_path, columns=common_cols)
+
     for col in common_cols:
         print(f"\n===== {col} =====")
         print("Clean value counts:")
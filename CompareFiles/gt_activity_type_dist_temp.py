@@ -1,11 +1,16 @@
-import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from columnar_io import read_table
 
 
 def main() -> None:
     gt_path = "C:/Users/HELIOS-300/Desktop/Data/am_gt_3.csv"
-    gt_df = pd.read_csv(gt_path)
 
     col = "updated_activity"
+    gt_df = read_table(gt_path, columns=[col])
     print(f"Using gt_df['{col}'] for Activity_Type comparison.")
     print("\nValue counts:")
     print(gt_df[col].value_counts(dropna=False).to_string())
@@ -0,0 +1,376 @@
+"""
+Binary per-session store for raw accelerometer samples.
+
+A session directory (e.g. accel_store/ACT24_116_2/) holds
+    time.i8    int64 nanoseconds since 1970 (wall clock as written in the CSV)
+    xyz.f4     float32, shape (n, 3)
+    meta.json  n, source, sorted
+and is opened as np.memmap, so nothing is read until it is sliced.
+
+    write_session("process_sessions_output/ACT24_116_2.csv", "accel_store/ACT24_116_2")
+    session = open_session("accel_store/ACT24_116_2")
+    labels = EpochLabels.from_frame(gt_obs, columns=["activity_type", "posture"])
+    for chunk in labelled_samples(session, labels):     # raw rows + labels, chunk by chunk
+        ...
+    features = feature_table(session, labels, window_s=1)
+
+Labels are joined by second arithmetic (sample second - first GT second
+-> row in a dense lookup table) instead of string-splitting `time` and
+pd.merge on (id, observation, date_time) as in (1-3) feature_gt_merge.ipynb.
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from columnar_io import append_table, remove_table
+
+
+NS = 1_000_000_000
+AXES = ["x", "y", "z"]
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def write_session(
+    csv_path: str | Path,
+    store_dir: str | Path,
+    time_col: str = "time",
+    chunksize: int = 1_000_000,
+) -> Path:
+    """
+    Convert one raw-sample CSV (time, x, y, z) to a session directory.
+
+    The CSV is read `chunksize` rows at a time and appended to the binary
+    files, so memory stays flat whatever the session length. Files are
+    written under *.tmp names and renamed at the end; meta.json is written
+    last, so a half-written session is never opened.
+    """
+    if not Path(csv_path).is_file():
+        raise FileNotFoundError(f"No such file: {csv_path}")
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    t_tmp, xyz_tmp = store_dir / "time.i8.tmp", store_dir / "xyz.f4.tmp"
+
+    n = 0
+    is_sorted = True
+    last = np.iinfo(np.int64).min
+    with open(t_tmp, "wb") as ft, open(xyz_tmp, "wb") as fx:
+        for chunk in pd.read_csv(csv_path, usecols=[time_col] + AXES, chunksize=chunksize):
+            t = pd.to_datetime(chunk[time_col], format="ISO8601", errors="coerce")
+            ok = t.notna().to_numpy()
+            ns = t.to_numpy()[ok].astype("datetime64[ns]").astype(np.int64)
+            xyz = chunk[AXES].to_numpy(dtype=np.float32)[ok]
+            if len(ns):
+                is_sorted &= bool(ns[0] >= last) and bool(np.all(np.diff(ns) >= 0))
+                last = ns[-1]
+            ft.write(ns.tobytes())
+            fx.write(np.ascontiguousarray(xyz).tobytes())
+            n += len(ns)
+
+    os.replace(t_tmp, store_dir / "time.i8")
+    os.replace(xyz_tmp, store_dir / "xyz.f4")
+    meta = {"n": n, "source": str(csv_path), "sorted": is_sorted}
+    (store_dir / "meta.json").write_text(json.dumps(meta, indent=1))
+    return store_dir
+
+
+def is_up_to_date(csv_path: str | Path, store_dir: str | Path) -> bool:
+    """Session directory exists and is newer than its CSV."""
+    meta = Path(store_dir) / "meta.json"
+    return meta.exists() and meta.stat().st_mtime >= Path(csv_path).stat().st_mtime
+
+
+class AccelSession:
+    """Memory-mapped view of one session directory: .time (int64 ns), .xyz (float32 n x 3)."""
+
+    def __init__(self, store_dir: str | Path):
+        self.path = Path(store_dir)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        n = self.meta["n"]
+        if n:
+            self.time = np.memmap(self.path / "time.i8", dtype=np.int64, mode="r", shape=(n,))
+            self.xyz = np.memmap(self.path / "xyz.f4", dtype=np.float32, mode="r", shape=(n, 3))
+        else:
+            self.time = np.zeros(0, dtype=np.int64)
+            self.xyz = np.zeros((0, 3), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self.meta["n"]
+
+    def chunks(self, chunk_samples: int = 2_000_000, window_ns: int | None = None):
+        """
+        Yield (start, stop) sample slices. With `window_ns`, slices end on a
+        window boundary (windows anchored at the epoch), so no window is split.
+        """
+        n = len(self)
+        start = 0
+        while start < n:
+            stop = min(start + chunk_samples, n)
+            if window_ns is not None and stop < n:
+                w_last = self.time[stop - 1] // window_ns
+                cut = start + int(np.searchsorted(self.time[start:stop], w_last * window_ns, side="left"))
+                if cut > start:
+                    stop = cut
+                else:
+                    # one window longer than a chunk: take it whole
+                    stop = start + int(np.searchsorted(self.time[start:], (w_last + 1) * window_ns, side="left"))
+            yield start, stop
+            start = stop
+
+
+def open_session(store_dir: str | Path) -> AccelSession:
+    return AccelSession(store_dir)
+
+
+class EpochLabels:
+    """
+    Per-second labels for one session, looked up by epoch arithmetic.
+
+    `seconds` are whole epoch seconds of the GT rows; `values` holds the
+    label columns in the same order. Lookup is a dense int array over
+    [first second, last second] holding the GT row (first row wins for a
+    repeated second), -1 where the GT has no row.
+    """
+
+    def __init__(self, seconds: np.ndarray, values: pd.DataFrame):
+        seconds = np.asarray(seconds, dtype="float64")
+        ok = ~np.isnan(seconds)
+        sec = seconds[ok].astype(np.int64)
+        self.values = values.iloc[np.flatnonzero(ok)].reset_index(drop=True)
+        self.first = int(sec.min()) if len(sec) else 0
+        self.table = np.full(int(sec.max()) - self.first + 1 if len(sec) else 0, -1, dtype=np.int64)
+        uniq, first_row = np.unique(sec, return_index=True)
+        self.table[uniq - self.first] = first_row
+
+    @classmethod
+    def from_frame(cls, gt: pd.DataFrame, columns: list[str], time_col: str = "date_time") -> "EpochLabels":
+        t = pd.to_datetime(gt[time_col], errors="coerce")
+        sec = t.to_numpy().astype("datetime64[s]").astype(np.int64).astype("float64")
+        sec[t.isna().to_numpy()] = np.nan
+        return cls(sec, gt[columns])
+
+    def rows(self, sample_ns: np.ndarray) -> np.ndarray:
+        """GT row for each sample time (int64 ns), -1 where the GT has no such second."""
+        off = np.asarray(sample_ns) // NS - self.first
+        ok = (off >= 0) & (off < len(self.table))
+        out = np.full(len(off), -1, dtype=np.int64)
+        out[ok] = self.table[off[ok]]
+        return out
+
+    def take(self, rows: np.ndarray) -> pd.DataFrame:
+        """Label columns for `rows` (from .rows); NaN where row is -1."""
+        if len(self.values) == 0:
+            return pd.DataFrame(index=range(len(rows)), columns=self.values.columns)
+        out = self.values.take(np.maximum(rows, 0)).reset_index(drop=True)
+        missing = rows < 0
+        if missing.any():
+            out = out.where(np.repeat(~missing[:, None], out.shape[1], axis=1))
+        return out
+
+
+def format_time(ns: np.ndarray) -> np.ndarray:
+    """int64 ns -> "YYYY-MM-DD HH:MM:SS.ffffff" (the process_sessions_output `time` text)."""
+    text = np.datetime_as_string(np.asarray(ns).astype("datetime64[ns]").astype("datetime64[us]"), unit="us")
+    return np.char.replace(text, "T", " ")
+
+
+def labelled_samples(
+    session: AccelSession,
+    labels: EpochLabels,
+    on_second_cols: list[str] | None = None,
+    on_second_fill=0,
+    inner: bool = True,
+    chunk_samples: int = 2_000_000,
+):
+    """
+    Yield DataFrames of raw samples with their second's labels: time (ns),
+    x, y, z, then the label columns.
+
+    inner drops samples whose second has no GT row (the old pd.merge).
+    `on_second_cols` only apply to the sample exactly on the whole second
+    (the old step merge on the full `time` text); other samples get
+    `on_second_fill`.
+    """
+    on_second_cols = on_second_cols or []
+    for a, b in session.chunks(chunk_samples):
+        t = np.asarray(session.time[a:b])
+        rows = labels.rows(t)
+        keep = rows >= 0 if inner else np.ones(len(t), dtype=bool)
+        if not keep.any():
+            continue
+        t, rows = t[keep], rows[keep]
+        xyz = np.asarray(session.xyz[a:b])[keep]
+        out = pd.DataFrame({"time": t, "x": xyz[:, 0], "y": xyz[:, 1], "z": xyz[:, 2]})
+        lab = labels.take(rows)
+        on_second = t % NS == 0
+        for c in on_second_cols:
+            lab[c] = lab[c].where(on_second, on_second_fill).fillna(on_second_fill)
+        yield pd.concat([out, lab], axis=1)
+
+
+def _percentiles(v: np.ndarray, starts: np.ndarray, counts: np.ndarray, qs) -> list[np.ndarray]:
+    """Linear-interpolated percentiles of `v` per window (v sorted within each window)."""
+    out = []
+    for q in qs:
+        pos = (counts - 1) * (q / 100.0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, counts - 1)
+        frac = pos - lo
+        out.append(v[starts + lo] + (v[starts + hi] - v[starts + lo]) * frac)
+    return out
+
+
+def window_features(
+    session: AccelSession,
+    window_s: float = 1.0,
+    percentiles=PERCENTILES,
+    chunk_samples: int = 2_000_000,
+):
+    """
+    Yield per-window feature frames, one per chunk of samples.
+
+    Windows are [k * window_s, (k + 1) * window_s) in epoch time, so 1 s
+    windows line up with GT seconds. Columns: window_start (int64 ns), n,
+    <axis>_mean, <axis>_sd, vm_mean, vm_sd, enmo_mean (mean of
+    max(|a| - 1, 0), in g), vm_p<q>. SDs use ddof=1 (NaN for n == 1).
+    """
+    if not session.meta.get("sorted", True):
+        raise ValueError(f"{session.path}: samples are not in time order")
+    window_ns = int(round(window_s * NS))
+
+    for a, b in session.chunks(chunk_samples, window_ns=window_ns):
+        t = np.asarray(session.time[a:b])
+        xyz = np.asarray(session.xyz[a:b], dtype="float64")
+        w = t // window_ns
+        head = np.flatnonzero(np.r_[True, w[1:] != w[:-1]])
+        counts = np.diff(np.r_[head, len(w)])
+        win = np.repeat(np.arange(len(head)), counts)
+
+        vm = np.sqrt((xyz ** 2).sum(axis=1))
+        cols = {"window_start": w[head] * window_ns, "n": counts}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for name, v in [*zip(AXES, xyz.T), ("vm", vm)]:
+                mean = np.add.reduceat(v, head) / counts
+                ss = np.add.reduceat((v - mean[win]) ** 2, head)
+                cols[f"{name}_mean"] = mean
+                cols[f"{name}_sd"] = np.where(counts > 1, np.sqrt(ss / (counts - 1)), np.nan)
+        cols["enmo_mean"] = np.add.reduceat(np.maximum(vm - 1.0, 0.0), head) / counts
+
+        vm_sorted = vm[np.lexsort((vm, win))]
+        for q, p in zip(percentiles, _percentiles(vm_sorted, head, counts, percentiles)):
+            cols[f"vm_p{q}"] = p
+        yield pd.DataFrame(cols)
+
+
+def feature_table(
+    session: AccelSession,
+    labels: EpochLabels | None = None,
+    window_s: float = 1.0,
+    inner: bool = True,
+    chunk_samples: int = 2_000_000,
+) -> pd.DataFrame:
+    """
+    Window features for a whole session, with the GT labels of each
+    window's first second (inner keeps labelled windows only). Only the
+    feature rows are ever held, never the samples.
+    """
+    frames = []
+    for feats in window_features(session, window_s, chunk_samples=chunk_samples):
+        if labels is not None:
+            rows = labels.rows(feats["window_start"].to_numpy())
+            if inner:
+                feats, rows = feats[rows >= 0].reset_index(drop=True), rows[rows >= 0]
+            feats = pd.concat([feats, labels.take(rows)], axis=1)
+        frames.append(feats)
+    if not frames:
+        return pd.DataFrame()
+    out = pd.concat(frames, ignore_index=True)
+    out.insert(1, "date_time", out["window_start"].to_numpy().astype("datetime64[ns]"))
+    return out
+
+
+CTRAIN_LABELS = [
+    "date", "activity_type", "broad_activity_type", "work_type", "posture",
+    "sedentary_not", "walking_not", "activity_intensity", "quality",
+]
+
+
+def attach_gt(units: list[dict], gt: pd.DataFrame) -> list[dict]:
+    """
+    Copy of `units` with unit["gt"] = that (id, do)'s rows of the merged GT,
+    split in one groupby. A worker then receives only its own session
+    instead of the whole cohort being pickled once per unit.
+    """
+    parts = {
+        (int(i), int(o)): g.reset_index(drop=True)
+        for (i, o), g in gt.groupby(["id", "observation"], sort=False, observed=True)
+    }
+    empty = gt.iloc[:0]
+    return [{**u, "gt": parts.get((int(u["id"]), int(u["do"])), empty)} for u in units]
+
+
+def trainset_unit(
+    unit: dict,
+    gt: pd.DataFrame | None = None,
+    store_root: str | Path = "accel_store",
+    ctrain_dir: str | Path | None = "classifier_trainsets",
+    ssl_dir: str | Path | None = "ACT24_Apr2024",
+    label_cols: list[str] = CTRAIN_LABELS,
+    window_s: float = 1.0,
+    output_suffix: str = "",
+):
+    """
+    batch_runner unit for (1-3): one discover_act24_sessions unit ->
+    per-window labelled features (returned), plus the raw-sample _CTRAIN /
+    _SSL exports streamed chunk by chunk through columnar_io.append_table
+    (skipped if the dir is None): Parquet datasets by default, CSV files
+    with output_suffix=".csv". Old exports are removed first, so a unit
+    with no labelled sample leaves none behind. The input CSV is converted
+    to the store once and reused.
+
+    `gt` is the merged per-second ground truth (id, observation, date_time,
+    label_cols, step); without it the unit's own unit["gt"] from
+    attach_gt is used.
+    """
+    key = unit["key"]
+    csv_path = Path(unit["inputs"]["accel"])
+    store_dir = Path(store_root) / f"ACT24_{key}"
+    if not is_up_to_date(csv_path, store_dir):
+        write_session(csv_path, store_dir)
+    session = open_session(store_dir)
+
+    if gt is None:
+        gt = unit["gt"]
+    gt_obs = gt[(gt["id"] == int(unit["id"])) & (gt["observation"] == int(unit["do"]))]
+    labels = EpochLabels.from_frame(gt_obs, columns=["date_time"] + label_cols + ["step"])
+
+    labelled = 0
+    sinks = []
+    if ctrain_dir is not None:
+        Path(ctrain_dir).mkdir(parents=True, exist_ok=True)
+        sinks.append((Path(ctrain_dir) / f"ACT24_{key}_CTRAIN{output_suffix}", "ctrain"))
+    if ssl_dir is not None:
+        Path(ssl_dir).mkdir(parents=True, exist_ok=True)
+        sinks.append((Path(ssl_dir) / f"ACT24_{key}_SSL{output_suffix}", "ssl"))
+    for path, _ in sinks:
+        remove_table(path)
+
+    for part, chunk in enumerate(labelled_samples(session, labels, on_second_cols=["step"])):
+        chunk["time"] = format_time(chunk["time"].to_numpy())
+        chunk.insert(0, "id", int(unit["id"]))
+        chunk.insert(1, "observation", int(unit["do"]))
+        for path, kind in sinks:
+            if kind == "ctrain":
+                out = chunk[["id", "observation", "time", "date_time"] + label_cols + AXES + ["step"]]
+            else:
+                out = chunk[["time"] + AXES + ["posture", "step"]].rename(columns={"time": "timestamp"})
+            append_table(out, path, part, partition_cols=[])
+        labelled += len(chunk)
+
+    feats = feature_table(session, EpochLabels.from_frame(gt_obs, columns=label_cols), window_s=window_s)
+    if len(feats):
+        feats.insert(0, "id", int(unit["id"]))
+        feats.insert(1, "observation", int(unit["do"]))
+    return feats, {"samples": len(session), "labelled_samples": labelled}
@@ -0,0 +1,193 @@
+"""
+Segment mode for the ACT24 activity/posture dual-track merge.
+
+Each track (activity states, posture states) becomes run-length segments
+[start_s, end_s) per Observation instead of one row per second. The two
+tracks are intersected with a sweep line over their segment boundaries, so a
+multi-hour observation of long constant states stays a few hundred rows.
+Per-second rows are only built on demand:
+
+    act = track_segments(activity_df, value_cols={"Behavior": "Behavior_activity", ...})
+    pos = track_segments(posture_df, value_cols={"Behavior": "Behavior_posture", ...})
+    segments = intersect_segments(act, pos, fill_cols=["id", "do", "start_time_new"])
+    merged = segments_to_seconds(segments)               # whole frame
+    for obs, sec_df in iter_observation_seconds(segments):  # or one Observation at a time
+        ...
+
+Per-second output matches expand_track_to_seconds + outer merge on
+(Observation, _second) in dataCleanOneChunk_ACT.ipynb, except that the
+id/do/start_time_new back fill stays inside each Observation.
+"""
+import numpy as np
+import pandas as pd
+
+
+_GROUP_SHIFT = 32
+
+
+def track_segments(
+    track_df: pd.DataFrame,
+    value_cols: dict[str, str],
+    group_col: str = "Observation",
+    sec_col: str = "_seconds",
+    duration_col: str = "Duration_sf",
+) -> pd.DataFrame:
+    """
+    One segment per retained state event: group_col, start_s, end_s (exclusive), values.
+
+    Same rules as expand_track_to_seconds: the last event in each whole
+    second wins, values are forward filled column by column within the
+    Observation, the grid starts at 0 if the first event is at ~0 s and at
+    ceil(first event) otherwise, and runs to floor(max(start, start + duration)).
+    `value_cols` maps source column -> output column.
+    """
+    t = track_df[track_df[sec_col].notna()]
+    t = t.sort_values([group_col, sec_col], kind="mergesort")
+    sec = t[sec_col].to_numpy(dtype="float64")
+    gcode, glabels = pd.factorize(t[group_col], sort=True)
+    n_groups = len(glabels)
+
+    ev_sec = np.floor(sec).astype(np.int64)
+    last_in_second = np.r_[(gcode[1:] != gcode[:-1]) | (ev_sec[1:] != ev_sec[:-1]), True] if len(t) else np.zeros(0, bool)
+
+    first_row = np.flatnonzero(np.r_[True, gcode[1:] != gcode[:-1]]) if len(t) else np.zeros(0, np.int64)
+    min_s = sec[first_row]
+    end_s = sec.copy()
+    if duration_col in t.columns:
+        dur = pd.to_numeric(t[duration_col], errors="coerce").fillna(0).to_numpy(dtype="float64")
+        end_s = np.maximum(end_s, sec + dur)
+    max_s = np.full(n_groups, -np.inf)
+    np.maximum.at(max_s, gcode, end_s)
+
+    start_second = np.where(np.isclose(min_s, 0.0), 0, np.ceil(min_s)).astype(np.int64)
+    end_second = np.maximum(np.floor(max_s).astype(np.int64), start_second)
+
+    kept = t[last_in_second]
+    kg = gcode[last_in_second]
+    ks = ev_sec[last_in_second]
+    values = kept[list(value_cols)].rename(columns=value_cols)
+    values = values.groupby(kg, sort=False).ffill()
+
+    next_same = np.r_[kg[1:] == kg[:-1], False] if len(kg) else np.zeros(0, bool)
+    seg_start = np.maximum(ks, start_second[kg])
+    seg_end = np.where(next_same, np.r_[ks[1:], 0] if len(ks) else ks, end_second[kg] + 1)
+    seg_end = np.minimum(seg_end, end_second[kg] + 1)
+    keep = seg_start < seg_end
+
+    out = pd.DataFrame({
+        group_col: glabels.take(kg[keep]),
+        "start_s": seg_start[keep],
+        "end_s": seg_end[keep],
+    })
+    for c in values.columns:
+        out[c] = values[c].to_numpy()[keep]
+    return out
+
+
+def _keyed(group_codes: np.ndarray, seconds: np.ndarray) -> np.ndarray:
+    return (group_codes.astype(np.int64) << _GROUP_SHIFT) + seconds.astype(np.int64)
+
+
+def _covering(starts: np.ndarray, ends: np.ndarray, order: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Row (via `order`) of the disjoint sorted segment containing each point, -1 if none."""
+    if len(starts) == 0:
+        return np.full(len(points), -1, dtype=np.int64)
+    idx = np.searchsorted(starts, points, side="right") - 1
+    on = (idx >= 0) & (points < ends[np.maximum(idx, 0)])
+    return np.where(on, order[np.maximum(idx, 0)], -1)
+
+
+def intersect_segments(
+    a: pd.DataFrame,
+    b: pd.DataFrame,
+    group_col: str = "Observation",
+    fill_cols: list[str] | None = None,
+    coalesce: bool = True,
+) -> pd.DataFrame:
+    """
+    Sweep-line intersection of two segment tables (outer: a span covered by
+    either side is kept, the other side's columns are NaN there).
+
+    fill_cols are forward then back filled within each Observation (the
+    per-second notebook used an unscoped bfill). With coalesce, touching
+    spans with identical values on both sides are merged.
+    """
+    labels = pd.Index(pd.concat([a[group_col], b[group_col]]).unique()).sort_values()
+    ga = labels.get_indexer(a[group_col])
+    gb = labels.get_indexer(b[group_col])
+
+    a_start, a_end = _keyed(ga, a["start_s"].to_numpy()), _keyed(ga, a["end_s"].to_numpy())
+    b_start, b_end = _keyed(gb, b["start_s"].to_numpy()), _keyed(gb, b["end_s"].to_numpy())
+    a_order, b_order = np.argsort(a_start, kind="mergesort"), np.argsort(b_start, kind="mergesort")
+    a_start, a_end = a_start[a_order], a_end[a_order]
+    b_start, b_end = b_start[b_order], b_end[b_order]
+
+    bps = np.unique(np.concatenate([a_start, a_end, b_start, b_end]))
+    lo, hi = bps[:-1], bps[1:]
+    same_group = (lo >> _GROUP_SHIFT) == (hi >> _GROUP_SHIFT)
+
+    a_row = _covering(a_start, a_end, a_order, lo)
+    b_row = _covering(b_start, b_end, b_order, lo)
+
+    keep = same_group & ((a_row >= 0) | (b_row >= 0))
+    lo, hi, a_row, b_row = lo[keep], hi[keep], a_row[keep], b_row[keep]
+    g = lo >> _GROUP_SHIFT
+
+    out = pd.DataFrame({
+        group_col: labels.take(g),
+        "start_s": lo - (g << _GROUP_SHIFT),
+        "end_s": hi - (g << _GROUP_SHIFT),
+    })
+    for side, rows in ((a, a_row), (b, b_row)):
+        for c in side.columns:
+            if c in (group_col, "start_s", "end_s"):
+                continue
+            if len(side) == 0:
+                out[c] = pd.Series(index=out.index, dtype=side[c].dtype)
+                continue
+            col = side[c].take(np.maximum(rows, 0)).reset_index(drop=True)
+            out[c] = col.where(rows >= 0)
+
+    if fill_cols:
+        grouped = out.groupby(g, sort=False)[fill_cols]
+        out[fill_cols] = grouped.ffill()
+        out[fill_cols] = out.groupby(g, sort=False)[fill_cols].bfill()
+
+    if coalesce and len(out) > 1:
+        value_cols = [c for c in out.columns if c not in (group_col, "start_s", "end_s")]
+        vcode = out.groupby(value_cols, sort=False, dropna=False).ngroup().to_numpy()
+        start = out["start_s"].to_numpy()
+        end = out["end_s"].to_numpy()
+        cont = np.r_[False, (g[1:] == g[:-1]) & (start[1:] == end[:-1]) & (vcode[1:] == vcode[:-1])]
+        run_head = np.flatnonzero(~cont)
+        run_last = np.r_[run_head[1:], len(out)] - 1
+        new_end = end[run_last]
+        out = out.iloc[run_head].reset_index(drop=True)
+        out["end_s"] = new_end
+    return out
+
+
+def segments_to_seconds(
+    segments: pd.DataFrame,
+    group_col: str = "Observation",
+    sec_col: str = "_second",
+) -> pd.DataFrame:
+    """Materialize one row per second: group_col, sec_col, then the segment values."""
+    start = segments["start_s"].to_numpy(dtype=np.int64)
+    lengths = segments["end_s"].to_numpy(dtype=np.int64) - start
+    rows = np.repeat(np.arange(len(segments)), lengths)
+    seg_first = np.cumsum(lengths) - lengths
+    seconds = np.repeat(start - seg_first, lengths) + np.arange(len(rows))
+
+    values = segments.drop(columns=[group_col, "start_s", "end_s"]).take(rows).reset_index(drop=True)
+    out = pd.DataFrame({
+        group_col: segments[group_col].take(rows).to_numpy(),
+        sec_col: seconds,
+    })
+    return pd.concat([out, values], axis=1)
+
+
+def iter_observation_seconds(segments: pd.DataFrame, group_col: str = "Observation", sec_col: str = "_second"):
+    """Yield (Observation, per-second frame) one Observation at a time."""
+    for obs, seg in segments.groupby(group_col, sort=False):
+        yield obs, segments_to_seconds(seg, group_col=group_col, sec_col=sec_col)
@@ -0,0 +1,251 @@
+"""
+Per-second agreement between a clean export and a ground-truth file.
+
+Both sides are reduced to one int64 key per row, (id, session) code << 32
+plus the second, and joined with one sort + searchsorted. Every label pair
+is then scored with a single np.bincount over category codes: one confusion
+matrix per participant, from which accuracy and Cohen's kappa follow
+directly.
+
+    scores, confusions, coverage = compare_am(clean_df, gt_df)
+    scores[scores["pair"] == "Activity_Type~updated_activity"]
+    confusions["posture_wbm~primary_posture"]        # clean rows x GT columns
+
+Replaces the value_counts/pie comparisons in CompareFiles/am_compare.ipynb
+and act24_comparison.ipynb, which never lined the two files up in time.
+"""
+import numpy as np
+import pandas as pd
+
+from waves_time import parse_seconds
+
+
+_GROUP_SHIFT = 32
+
+# (clean column, GT column)
+AM_PAIRS = [
+    ("Activity_Type", "updated_activity"),
+    ("posture_wbm", "primary_posture"),
+    ("broad_domain", "broad_activity"),
+]
+ACT24_PAIRS = [
+    ("activity_type", "activity_type"),
+    ("broad_domain", "broad_activity_type"),
+    ("posture_wbm", "posture"),
+    ("intensity", "activity_intensity"),
+]
+
+
+def epoch_seconds(values) -> np.ndarray:
+    """
+    Datetime text/values -> float seconds since 1970 (floored, NaN where unparseable).
+
+    Each value is parsed on its own (format="mixed"): an inferred format
+    would turn every row not shaped like the first, e.g. with fractional
+    seconds, into NaN.
+    """
+    t = pd.to_datetime(pd.Series(values), errors="coerce", format="mixed")
+    out = t.to_numpy().astype("datetime64[s]").astype(np.int64).astype("float64")
+    out[t.isna().to_numpy()] = np.nan
+    return out
+
+
+def relative_seconds(values) -> np.ndarray:
+    """"H:MM:SS(.f)" relative times -> whole seconds (floored, NaN where unparseable)."""
+    return np.floor(parse_seconds(values))
+
+
+def align_seconds(
+    clean_groups: pd.DataFrame,
+    clean_sec: np.ndarray,
+    gt_groups: pd.DataFrame,
+    gt_sec: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, dict]:
+    """
+    Row positions (clean_idx, gt_idx) of seconds present on both sides.
+
+    `*_groups` hold the session key columns (same names/order on both
+    sides, already normalized, e.g. id + do_session); `*_sec` are whole
+    seconds. Rows with a missing key or second never match. If the GT has
+    several rows for one second the first is used; the counts are in the
+    returned stats (clean_rows, gt_rows, matched, gt_duplicate_seconds,
+    and clean/gt_unparsed_seconds: rows whose time did not parse).
+    """
+    both = pd.concat([clean_groups, gt_groups], ignore_index=True)
+    gcode = both.groupby(list(both.columns), sort=False, dropna=True).ngroup().to_numpy()
+    sec = np.r_[np.asarray(clean_sec, dtype="float64"), np.asarray(gt_sec, dtype="float64")]
+    valid = (gcode >= 0) & ~np.isnan(sec)
+    base = np.nanmin(sec[valid]) if valid.any() else 0.0
+    key = (gcode.astype(np.int64) << _GROUP_SHIFT) + np.where(valid, sec - base, 0).astype(np.int64)
+
+    n_clean = len(clean_groups)
+    c_key, c_ok = key[:n_clean], valid[:n_clean]
+    g_key, g_ok = key[n_clean:], valid[n_clean:]
+
+    g_pos = np.flatnonzero(g_ok)
+    g_sorted = g_pos[np.argsort(g_key[g_pos], kind="mergesort")]
+    g_keys_sorted = g_key[g_sorted]
+    dup = np.r_[False, g_keys_sorted[1:] == g_keys_sorted[:-1]]
+    g_sorted, g_keys_sorted = g_sorted[~dup], g_keys_sorted[~dup]
+
+    c_pos = np.flatnonzero(c_ok)
+    at = np.searchsorted(g_keys_sorted, c_key[c_pos])
+    at_c = np.minimum(at, max(len(g_keys_sorted) - 1, 0))
+    hit = (at < len(g_keys_sorted)) & (g_keys_sorted[at_c] == c_key[c_pos]) if len(g_keys_sorted) else np.zeros(len(c_pos), bool)
+
+    stats = {
+        "clean_rows": n_clean,
+        "gt_rows": len(gt_groups),
+        "matched": int(hit.sum()),
+        "gt_duplicate_seconds": int(dup.sum()),
+        "clean_unparsed_seconds": int(np.isnan(sec[:n_clean]).sum()),
+        "gt_unparsed_seconds": int(np.isnan(sec[n_clean:]).sum()),
+    }
+    return c_pos[hit], g_sorted[at_c[hit]], stats
+
+
+def _kappa(counts: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(n, accuracy, Cohen's kappa) for a stack of square confusion matrices."""
+    n = counts.sum(axis=(1, 2)).astype("float64")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        po = np.trace(counts, axis1=1, axis2=2) / n
+        pe = (counts.sum(axis=2) * counts.sum(axis=1)).sum(axis=1) / n ** 2
+        kappa = np.where(pe < 1, (po - pe) / (1 - pe), np.nan)
+    return n, po, kappa
+
+
+def score_pair(
+    clean_labels,
+    gt_labels,
+    groups,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Per-group and overall agreement for one aligned label pair.
+
+    Rows where either side is missing are not scored. Returns
+    (scores: group, n, accuracy, kappa with an "ALL" row last;
+    confusion: clean labels x GT labels, overall counts).
+    """
+    c = pd.Series(clean_labels, dtype=object).to_numpy()
+    t = pd.Series(gt_labels, dtype=object).to_numpy()
+    ok = pd.notna(c) & pd.notna(t)
+    g_codes, g_labels = pd.factorize(pd.Series(groups, dtype=object)[ok].to_numpy(), sort=True)
+
+    codes, cats = pd.factorize(np.r_[c[ok], t[ok]], sort=True)
+    m = int(ok.sum())
+    k = max(len(cats), 1)
+    n_groups = len(g_labels)
+    idx = (g_codes.astype(np.int64) * k + codes[:m]) * k + codes[m:]
+    counts = np.bincount(idx, minlength=n_groups * k * k).reshape(n_groups, k, k)
+    total = counts.sum(axis=0, keepdims=True)
+
+    n, acc, kappa = _kappa(np.concatenate([counts, total]))
+    scores = pd.DataFrame({
+        "group": list(g_labels) + ["ALL"],
+        "n": n.astype(np.int64),
+        "accuracy": acc,
+        "kappa": kappa,
+    })
+
+    # rectangular view: only labels each side actually used
+    cats = pd.Index(cats, dtype=object) if len(cats) else pd.Index(["-"], dtype=object)
+    conf = pd.DataFrame(total[0], index=cats, columns=cats)
+    conf = conf.loc[conf.sum(axis=1) > 0, conf.sum(axis=0) > 0]
+    conf.index.name, conf.columns.name = "clean", "gt"
+    return scores, conf
+
+
+def compare(
+    clean: pd.DataFrame,
+    gt: pd.DataFrame,
+    pairs: list[tuple[str, str]],
+    clean_groups: pd.DataFrame,
+    clean_sec: np.ndarray,
+    gt_groups: pd.DataFrame,
+    gt_sec: np.ndarray,
+    participant: str = "id",
+    gt_recode: dict | None = None,
+) -> tuple[pd.DataFrame, dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    Align both frames per (session keys, second) and score every pair.
+
+    `participant` is the column of `clean_groups` used for per-participant
+    scores. `gt_recode` maps a GT column to a function applied to its
+    values first (e.g. raw Behavior text -> clean codes).
+
+    Returns (scores: pair, group, n, accuracy, kappa; confusions by
+    "clean~gt" pair name; coverage: the alignment counts, one row).
+    """
+    gt_recode = gt_recode or {}
+    ci, gi, stats = align_seconds(clean_groups, clean_sec, gt_groups, gt_sec)
+    groups = clean_groups[participant].to_numpy()[ci]
+
+    scores, confusions = [], {}
+    for clean_col, gt_col in pairs:
+        if clean_col not in clean.columns or gt_col not in gt.columns:
+            continue
+        gt_vals = gt[gt_col].to_numpy()[gi]
+        if gt_col in gt_recode:
+            gt_vals = gt_recode[gt_col](gt_vals)
+        name = f"{clean_col}~{gt_col}"
+        s, conf = score_pair(clean[clean_col].to_numpy()[ci], gt_vals, groups)
+        s.insert(0, "pair", name)
+        scores.append(s)
+        confusions[name] = conf
+
+    scores = pd.concat(scores, ignore_index=True) if scores else pd.DataFrame(columns=["pair", "group", "n", "accuracy", "kappa"])
+    return scores, confusions, pd.DataFrame([stats])
+
+
+def _recode_with(table):
+    """GT raw Behavior text -> clean code where the table knows it, else the text as-is."""
+    def _recode(values):
+        coded = table.map(values)
+        return np.where(pd.isna(coded), values, coded)
+    return _recode
+
+
+def compare_am(clean: pd.DataFrame, gt: pd.DataFrame, pairs: list[tuple[str, str]] = AM_PAIRS):
+    """
+    Cameron_AM_Clean (id, do_session, date_time) vs am_gt_3.csv
+    (id "AM02", DO_session, day + actual_time). GT updated_activity and
+    primary_posture are raw Behavior text and are coded with the AM tables.
+    """
+    from behavior_encoder import am_encoder
+
+    encoder = am_encoder()
+    clean_groups = pd.DataFrame({
+        "id": pd.to_numeric(clean["id"], errors="coerce").to_numpy(),
+        "session": clean["do_session"].astype(str).str.strip().to_numpy(),
+    })
+    gt_groups = pd.DataFrame({
+        "id": pd.to_numeric(gt["id"].astype(str).str.extract(r"(\d+)", expand=False), errors="coerce").to_numpy(),
+        "session": gt["DO_session"].astype(str).str.strip().to_numpy(),
+    })
+    gt_time = gt["day"].astype(str).str.strip() + " " + gt["actual_time"].astype(str).str.strip()
+    return compare(
+        clean, gt, pairs,
+        clean_groups, epoch_seconds(clean["date_time"]),
+        gt_groups, epoch_seconds(gt_time),
+        gt_recode={
+            "updated_activity": _recode_with(encoder.activity),
+            "primary_posture": _recode_with(encoder.posture),
+        },
+    )
+
+
+def compare_act24(clean: pd.DataFrame, gt: pd.DataFrame, pairs: list[tuple[str, str]] = ACT24_PAIRS):
+    """Cameron_ACT24_Clean (id, obs, rel_time) vs the ACT24 GT (id, observation, relative_time)."""
+    clean_groups = pd.DataFrame({
+        "id": pd.to_numeric(clean["id"], errors="coerce").to_numpy(),
+        "session": pd.to_numeric(clean["obs"], errors="coerce").to_numpy(),
+    })
+    gt_groups = pd.DataFrame({
+        "id": pd.to_numeric(gt["id"], errors="coerce").to_numpy(),
+        "session": pd.to_numeric(gt["observation"], errors="coerce").to_numpy(),
+    })
+    return compare(
+        clean, gt, pairs,
+        clean_groups, relative_seconds(clean["rel_time"]),
+        gt_groups, relative_seconds(gt["relative_time"]),
+    )
@@ -1,7 +1,14 @@
+import argparse
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from sec_by_sec import expand_states_to_seconds
+from sec_qc import validate_sec_by_sec
+from sec_schema import SEC_COL, build_label_dtypes, to_compact
+from stage_profile import StageProfiler
+
 
 DATA_PATH = Path("C:/Users/HELIOS-300/Desktop/Data/am_behposture_onesheet.xlsx")
 
@@ -17,10 +24,25 @@ def safe_value_counts(series: pd.Series, top_n: int = 15) -> None:
     print(vc.to_string())
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Profile the AM behposture export.")
+    parser.add_argument(
+        "--profile", nargs="?", const="am_behposture_profile.json", default=None, metavar="REPORT",
+        help="record time/memory/rows per stage and write them to REPORT (.json or .csv)",
+    )
+    parser.add_argument("--trace-memory", action="store_true", help="with --profile, also record tracemalloc peaks")
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="convert the sec-by-sec grid to the compact schema (sec_schema.py) before QC",
+    )
+    args = parser.parse_args(argv)
+    profiler = StageProfiler("am_behposture_profile", enabled=args.profile is not None, trace_memory=args.trace_memory)
+
     print_section("LOAD")
     print(f"Reading: {DATA_PATH}")
-    df = pd.read_excel(DATA_PATH, engine="openpyxl")
+    with profiler.stage("load", DATA_PATH) as st:
+        df = pd.read_excel(DATA_PATH, engine="openpyxl")
+        st.output(df)
     print(f"Rows: {len(df):,}")
     print(f"Cols: {len(df.columns):,}")
 
@@ -55,19 +77,27 @@ def main() -> None:
             print(uniques)
 
     print_section("STATE START FILTER")
+    profiler.start("parse", df)
     if "Event_Type" in df.columns:
         state_df = df[df["Event_Type"] == "State start"].copy()
         print(f"State start rows: {len(state_df):,} ({len(state_df) / len(df):.2%})")
     else:
-        state_df = df
+        state_df = df.copy()
         print("Event_Type column not found; using full dataset.")
 
+    # parse the State start times once; every section below reuses them
+    abs_col = "Date_Time_Absolute_dmy_hmsf"
+    if abs_col in state_df.columns:
+        state_df[abs_col] = pd.to_datetime(state_df[abs_col], errors="coerce")
+    if "Duration_sf" in state_df.columns:
+        state_df["_dur_s"] = pd.to_numeric(state_df["Duration_sf"], errors="coerce")
+    profiler.stop(state_df)
+
     # Try to parse time columns
     print_section("TIME COLUMNS PARSING CHECK")
     time_cols = [c for c in df.columns if "Time" in c or "Date" in c]
     print("Time/Date columns:", ", ".join(time_cols))
 
-    abs_col = "Date_Time_Absolute_dmy_hmsf"
     if abs_col in df.columns:
         abs_dt = pd.to_datetime(df[abs_col], errors="coerce")
         print(f"{abs_col} parsed: {abs_dt.notna().mean():.2%} non-null")
@@ -111,10 +141,6 @@ def main() -> None:
     # Observation-level span vs. duration sum for State start rows
     if abs_col in df.columns and "Duration_sf" in df.columns and "Observation" in df.columns:
         print_section("OBSERVATION SPAN VS DURATION (STATE START)")
-        state_df = state_df.copy()
-        state_df[abs_col] = pd.to_datetime(state_df[abs_col], errors="coerce")
-        state_df["_dur_s"] = pd.to_numeric(state_df["Duration_sf"], errors="coerce")
-
         span = (
             state_df.dropna(subset=[abs_col])
             .groupby("Observation")[abs_col]
@@ -148,10 +174,8 @@ def main() -> None:
     # Estimate potential second-by-second size for state starts
     if "Duration_sf" in df.columns and "Observation" in df.columns:
         print_section("SECOND-BY-SECOND SIZE ESTIMATE (STATE START)")
-        state_df = state_df.copy()
-        state_df["_dur_s"] = pd.to_numeric(state_df["Duration_sf"], errors="coerce").fillna(0.0)
-        state_df["_dur_s_ceil"] = np.ceil(state_df["_dur_s"]).astype("int64")
-        est_rows = state_df.groupby("Observation")["_dur_s_ceil"].sum()
+        dur_ceil = pd.Series(np.ceil(state_df["_dur_s"].fillna(0.0)).astype("int64"), index=state_df.index)
+        est_rows = dur_ceil.groupby(state_df["Observation"]).sum()
         print(f"Estimated total seconds (sum of ceil durations): {int(est_rows.sum()):,}")
         print("Top 10 observations by estimated seconds:")
         print(est_rows.sort_values(ascending=False).head(10).to_string())
@@ -159,120 +183,89 @@ def main() -> None:
     # Build second-by-second grid and validate coverage (matches notebook logic)
     if abs_col in df.columns and "Duration_sf" in df.columns and "Observation" in df.columns:
         print_section("SEC-BY-SEC BUILD + INTEGRITY CHECKS")
-        work = state_df.copy()
-        work[abs_col] = pd.to_datetime(work[abs_col], errors="coerce")
-        work = work.dropna(subset=["Observation", abs_col]).copy()
-
-        work["_start_dt_sec"] = work[abs_col].dt.floor("s")
-        work["_dur_s"] = pd.to_numeric(work["Duration_sf"], errors="coerce").fillna(0.0)
-        work["_dur_s_int"] = np.ceil(work["_dur_s"]).astype("int64")
-        work["_end_dt_sec"] = work["_start_dt_sec"] + pd.to_timedelta(work["_dur_s_int"], unit="s")
-
-        # stable ordering for "latest start wins"
-        work = work.sort_values(["Observation", "_start_dt_sec", abs_col], kind="mergesort")
+        work = state_df.dropna(subset=["Observation", abs_col])
 
         helper_cols = {"_start_dt_sec", "_dur_s", "_dur_s_int", "_end_dt_sec"}
         carry_cols = [c for c in work.columns if c not in helper_cols]
 
-        out = []
-        for obs, g in work.groupby("Observation", sort=False):
-            start_dt = g["_start_dt_sec"].min()
-            end_dt = g["_end_dt_sec"].max()
-            grid = pd.date_range(start=start_dt, end=end_dt, freq="1s")
-
-            starts = g["_start_dt_sec"].to_numpy()
-            ends = g["_end_dt_sec"].to_numpy()
-            tvals = grid.to_numpy()
-            idx = np.searchsorted(starts, tvals, side="right") - 1
-
-            res = pd.DataFrame({"Observation": obs, "date_time_abs": grid})
-            res["_sec"] = (res["date_time_abs"] - start_dt).dt.total_seconds().astype("int64")
-
-            valid = idx >= 0
-            valid &= (tvals <= ends[np.maximum(idx, 0)])
-            if valid.any():
-                take = g.iloc[idx[valid]][carry_cols].reset_index(drop=True)
-                for c in take.columns:
-                    if c in {"Observation"}:
-                        continue
-                    res.loc[valid, c] = take[c].to_numpy()
-
-            out.append(res)
-
-        sec_by_sec = pd.concat(out, ignore_index=True)
+        # one pass over every Observation ("latest start wins", inclusive end)
+        with profiler.stage("expand", work) as st:
+            sec_by_sec = expand_states_to_seconds(
+                work,
+                start_col=abs_col,
+                duration_col="Duration_sf",
+                group_col="Observation",
+                carry_cols=carry_cols,
+            )
+            st.output(sec_by_sec)
 
         print(f"sec_by_sec rows: {len(sec_by_sec):,}")
         print(f"Unique Observation (sec): {sec_by_sec['Observation'].nunique()}")
 
-        # 1) no duplicate seconds per Observation
-        dup = sec_by_sec.duplicated(subset=["Observation", "date_time_abs"]).sum()
-        print(f"Duplicate (Observation, date_time_abs): {dup}")
-
-        # 2) contiguity
-        def _is_contig(g: pd.DataFrame) -> bool:
-            dt = g["date_time_abs"].sort_values().to_numpy()
-            if len(dt) <= 1:
-                return True
-            diffs = np.diff(dt).astype("timedelta64[s]").astype(int)
-            return np.all(diffs == 1)
+        # int32 seconds since each Observation's start + categorical labels (sec_schema.py)
+        time_kw = {"time_col": "date_time_abs"}
+        if args.compact:
+            mb_before = sec_by_sec.memory_usage(deep=True).sum() / 2**20
+            with profiler.stage("compact", sec_by_sec) as st:
+                sec_by_sec, bases = to_compact(sec_by_sec, time_col="date_time_abs", dtypes=build_label_dtypes(sec_by_sec))
+                st.output(sec_by_sec)
+            mb_after = sec_by_sec.memory_usage(deep=True).sum() / 2**20
+            print(f"Compact schema: {mb_before:,.1f} MB -> {mb_after:,.1f} MB")
+            time_kw = {"time_col": None, "sec_col": SEC_COL}
+
+        # duplicates, contiguity, coverage, grid length vs span, negative relative
+        # times and NaN left after a per-Observation ffill, in one pass (see sec_qc.py)
+        carry_cols = ["Behavior", "Modifier_1", "Modifier_2", "Modifier_3", "Modifier_4"]
+        available = [c for c in carry_cols if c in sec_by_sec.columns]
+        with profiler.stage("qc", sec_by_sec) as st:
+            qc, qc_summary = validate_sec_by_sec(
+                sec_by_sec,
+                **time_kw,
+                ffill_cols=available,
+                rel_col="Time_Relative_sf" if "Time_Relative_sf" in sec_by_sec.columns else None,
+            )
+            st.output(qc)
+        print(qc_summary.to_string(index=False))
 
-        contig = sec_by_sec.groupby("Observation", sort=False).apply(_is_contig)
-        bad_contig = contig[~contig]
+        bad_contig = qc.loc[(qc["duplicates"] > 0) | (qc["gaps"] > 0), "Observation"]
         print(f"Non-contiguous Observations: {len(bad_contig)}")
         if len(bad_contig) > 0:
-            print("Examples:", bad_contig.index[:10].tolist())
+            print("Examples:", bad_contig.head(10).tolist())
 
-        # 3) coverage rate: % seconds with a Behavior value
         if "Behavior" in sec_by_sec.columns:
-            cov = sec_by_sec.groupby("Observation", sort=False).apply(
-                lambda g: float(g["Behavior"].notna().mean())
-            )
+            cov = qc.set_index("Observation")["coverage"]
             print(
                 "Coverage rate per observation (min/median/max):",
                 float(cov.min()),
                 float(cov.median()),
                 float(cov.max()),
             )
-            worst = cov.sort_values().head(10)
             print("Worst coverage observations (lowest 10):")
-            print(worst.to_string())
+            print(cov.sort_values().head(10).to_string())
 
-        # 4) event-to-grid consistency: for each obs, grid length vs span
-        span = (
-            sec_by_sec.groupby("Observation", sort=False)["date_time_abs"]
-            .agg(min_dt="min", max_dt="max", n="count")
-            .reset_index()
-        )
-        span["span_s_inclusive"] = (
-            (span["max_dt"] - span["min_dt"]).dt.total_seconds() + 1
-        )
-        span["n_minus_span"] = span["n"] - span["span_s_inclusive"]
         print("Grid length minus span (should be 0):")
-        print(span["n_minus_span"].describe().to_string())
+        print(qc["n_minus_span"].describe().to_string())
 
-        # 5) forward-fill Behavior + Modifiers per Observation (expected in sec-by-sec)
         print_section("SEC-BY-SEC WITH CARRY-FORWARD (Behavior + Modifiers)")
-        carry_cols = ["Behavior", "Modifier_1", "Modifier_2", "Modifier_3", "Modifier_4"]
-        available = [c for c in carry_cols if c in sec_by_sec.columns]
         if available:
-            sec_by_sec_cf = sec_by_sec.sort_values(
-                ["Observation", "date_time_abs"], kind="mergesort"
-            ).copy()
-            sec_by_sec_cf[available] = sec_by_sec_cf.groupby("Observation", sort=False)[
-                available
-            ].ffill()
-
-            # After carry-forward, report any remaining NaNs in these columns
             print("Remaining NaNs after forward-fill:")
-            remaining = sec_by_sec_cf[available].isna().sum()
+            remaining = qc[[f"nan_after_ffill_{c}" for c in available]].sum()
+            remaining.index = available
             print(remaining.to_string())
-
-            # Show one short sample where carry-forward changed values
-            changed = sec_by_sec_cf[available].isna().sum().sum() == 0
-            print(f"All carry-forward columns fully filled: {bool(changed)}")
+            print(f"All carry-forward columns fully filled: {bool(remaining.sum() == 0)}")
         else:
             print("No carry-forward columns available in sec_by_sec.")
 
+        failed = qc[~qc["passed"]]
+        print(f"QC passed: {len(qc) - len(failed)}/{len(qc)} Observations")
+        if len(failed):
+            print(failed.head(10).to_string(index=False))
+
+    if args.profile is not None:
+        print_section("STAGE PROFILE")
+        print(profiler.summary())
+        print(f"\nReport: {profiler.write(args.profile)}")
+
     print_section("DONE")
     print("Profiling complete.")
 
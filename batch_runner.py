@@ -0,0 +1,190 @@
+"""
+Run a per-participant function over many independent units in a process pool.
+
+A unit is a dict with at least:
+    "key":    label used in the report (ID, "116_2", ...)
+    "inputs": {name: path} read by the unit function
+    "output": optional path the unit writes; used for skip-if-up-to-date
+
+The unit function must be importable (defined in a module, not a notebook)
+and return a DataFrame, None, or (DataFrame, dict of extra report fields).
+Exceptions are captured per unit and reported instead of stopping the run.
+
+    units = discover_pals_pairs(pals_folder, activpal_folder)
+    _, report = run_units(partial(align_unit, epoch_s=30), units, out_path="PALS_Cycling_Merged.csv")
+"""
+import os
+import re
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+
+def discover_pals_pairs(pals_folder: str | Path, activpal_folder: str | Path) -> list[dict]:
+    """One unit per 5-digit PALS ID found in both folders (same rule as extract_id)."""
+    def _by_id(folder):
+        found = {}
+        for f in sorted(os.listdir(folder)):
+            m = re.search(r"PALS(\d{5})", f, re.IGNORECASE)
+            if m and f.endswith(".csv"):
+                found[m.group(1)] = Path(folder) / f
+        return found
+
+    pals = _by_id(pals_folder)
+    ap = _by_id(activpal_folder)
+    return [
+        {"key": id_val, "inputs": {"pals": pals[id_val], "activpal": ap[id_val]}}
+        for id_val in sorted(set(pals) & set(ap))
+    ]
+
+
+def discover_act24_sessions(
+    log_df: pd.DataFrame,
+    input_dir: str | Path = "process_sessions_output",
+    output_dir: str | Path | None = None,
+    output_suffix: str = "_CTRAIN",
+) -> list[dict]:
+    """One unit per (id, do) in the DO log, pointing at ACT24_<id>_<do>.csv."""
+    units = []
+    for id_val, do_val in log_df[["id", "do"]].drop_duplicates().itertuples(index=False):
+        key = f"{id_val}_{do_val}"
+        unit = {
+            "key": key,
+            "id": id_val,
+            "do": do_val,
+            "inputs": {"accel": Path(input_dir) / f"ACT24_{key}.csv"},
+        }
+        if output_dir is not None:
+            unit["output"] = Path(output_dir) / f"ACT24_{key}{output_suffix}"
+        units.append(unit)
+    return units
+
+
+def is_up_to_date(unit: dict) -> bool:
+    """Output exists and is newer than every input."""
+    out = unit.get("output")
+    if out is None or not Path(out).exists():
+        return False
+    out_mtime = Path(out).stat().st_mtime
+    for p in unit.get("inputs", {}).values():
+        if not Path(p).exists() or Path(p).stat().st_mtime > out_mtime:
+            return False
+    return True
+
+
+def _call(func, unit: dict):
+    t0 = time.perf_counter()
+    try:
+        result = func(unit)
+        extra = {}
+        if isinstance(result, tuple):
+            result, extra = result
+        return unit["key"], result, extra, None, time.perf_counter() - t0
+    except Exception as e:
+        err = f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=3)}"
+        return unit["key"], None, {}, err, time.perf_counter() - t0
+
+
+def _sink(df: pd.DataFrame, out_path: Path, first: bool, partition_cols: list[str] | None) -> None:
+    if out_path.suffix.lower() == ".csv":
+        df.to_csv(out_path, index=False, mode="w" if first else "a", header=first)
+        return
+
+    from columnar_io import PARTITION_COLS, write_table
+
+    cols = partition_cols or [c for c in PARTITION_COLS if c in df.columns]
+    if not cols:
+        # an unpartitioned dataset would be replaced by every unit's write
+        raise ValueError(f"dataset output {out_path} needs partition columns; pass partition_cols=")
+    write_table(df, out_path, partition_cols=cols)
+
+
+def run_units(
+    func,
+    units: list[dict],
+    max_workers: int | None = None,
+    skip_up_to_date: bool = True,
+    out_path: str | Path | None = None,
+    partition_cols: list[str] | None = None,
+) -> tuple[pd.DataFrame | None, pd.DataFrame]:
+    """
+    Run `func(unit)` for every unit and collect the results.
+
+    out_path=None: results are concatenated once at the end and returned.
+    out_path=*.csv: each result is appended to one CSV as it arrives.
+    out_path=directory: each result is written to a Parquet dataset
+    partitioned by `partition_cols` (default id/do_session, see
+    columnar_io.write_table); each unit must own its partitions.
+    In the two streaming modes (returns None) at most ~2 x max_workers
+    units are in flight and each result is dropped once written. Results
+    are concatenated / written in `units` order, whichever worker finishes
+    first.
+
+    skip_up_to_date skips units whose own "output" is newer than their
+    inputs. A single .csv out_path is rewritten on every run and would lose
+    the skipped units' rows, so that combination raises ValueError.
+
+    The report has one row per unit: key, status (ok/empty/skipped/error),
+    rows, seconds, error, plus any extra fields the function returned.
+    """
+    out_path = Path(out_path) if out_path is not None else None
+    if skip_up_to_date and out_path is not None and out_path.suffix.lower() == ".csv" and any(u.get("output") for u in units):
+        raise ValueError(f"skip_up_to_date would drop skipped units' rows from {out_path.name}; pass skip_up_to_date=False")
+    report = []
+    frames = []
+    first_write = True
+
+    todo = []
+    for unit in units:
+        if skip_up_to_date and is_up_to_date(unit):
+            report.append({"key": unit["key"], "status": "skipped", "rows": 0, "seconds": 0.0, "error": None})
+        else:
+            todo.append(unit)
+
+    def _collect(key, result, extra, err, secs):
+        nonlocal first_write
+        if err is not None:
+            status, rows = "error", 0
+            print(f"Error processing {key}: {err.splitlines()[0]}")
+        elif result is None or len(result) == 0:
+            status, rows = "empty", 0
+        else:
+            status, rows = "ok", len(result)
+            if out_path is None:
+                frames.append(result)
+            else:
+                _sink(result, out_path, first_write, partition_cols)
+                first_write = False
+        report.append({"key": key, "status": status, "rows": rows, "seconds": secs, "error": err, **extra})
+
+    workers = max_workers or min(len(todo), os.cpu_count() or 1)
+    if workers <= 1 or len(todo) <= 1:
+        for unit in todo:
+            _collect(*_call(func, unit))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # a sliding window of submitted units, collected in submission order so the output does
+            # not depend on worker timing; finished results are not kept behind the window
+            in_flight = deque()
+            for unit in todo:
+                if len(in_flight) >= 2 * workers:
+                    _collect(*in_flight.popleft().result())
+                in_flight.append(pool.submit(_call, func, unit))
+            while in_flight:
+                _collect(*in_flight.popleft().result())
+
+    order = {u["key"]: i for i, u in enumerate(units)}
+    report_df = pd.DataFrame(report, columns=list(dict.fromkeys(
+        ["key", "status", "rows", "seconds", "error"] + [k for r in report for k in r]
+    )))
+    report_df = report_df.sort_values("key", key=lambda s: s.map(order), kind="mergesort").reset_index(drop=True)
+
+    if out_path is not None:
+        return None, report_df
+    if not frames:
+        return pd.DataFrame(), report_df
+    return pd.concat(frames, ignore_index=True), report_df
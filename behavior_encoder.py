@@ -0,0 +1,319 @@
+"""
+Compiled Behavior -> code tables for the AM and ACT24 codings.
+
+A LabelTable turns one coding table from taxonomy.py (key -> output columns,
+plus Behavior aliases and prefix rules) into integer lookup arrays once.
+Encoding a column factorizes it, normalizes and matches only the distinct
+labels, and expands the result with one integer take, so the cost grows with
+the vocabulary, not with the number of seconds:
+
+    encoder = am_encoder()
+    sec_by_sec["Activity_Type"] = encoder.activity.map(sec_by_sec["Behavior"])
+    sec_by_sec["posture_wbm"] = encoder.posture.map(sec_by_sec["Behavior"])
+    sec_by_sec = encoder.add_domains(sec_by_sec)    # domains + sitting/driving rule
+    encoder.unmapped(sec_by_sec["Behavior"])        # labels neither table knows
+
+Replaces the .apply/.map(lambda) helpers in AM_restart1.ipynb and
+dataCleanOneChunk_ACT.ipynb (_classify_behavior, _map_behavior_to_activity_type,
+_activity_meta_lookup, _map_posture_wbm_from_behavior, _waves_sed_vec, ...).
+"""
+import numpy as np
+import pandas as pd
+
+from taxonomy import (
+    act24_activity_aliases,
+    act24_activity_meta,
+    act24_activity_meta_prefixes,
+    act24_activity_prefixes,
+    act24_posture_aliases,
+    act24_posture_domain_map,
+    act24_posture_prefixes,
+    activity_domain_map,
+    activity_map,
+    posture_domain_map,
+    posture_map,
+)
+
+
+DRIVE_TYPES = ("trav_drive", "trav_pass")
+
+
+def normalize_labels(values) -> pd.Series:
+    """Strip, lower-case, en/em dash -> "-", collapse whitespace. Missing stays missing."""
+    s = pd.Series(values, dtype=object)
+    out = s.astype(str).str.strip().str.lower()
+    out = out.str.replace("–", "-", regex=False).str.replace("—", "-", regex=False)
+    out = out.str.replace(r"\s+", " ", regex=True)
+    return out.astype(object).where(s.notna())
+
+
+def _factorize(values) -> tuple[np.ndarray, pd.Index]:
+    """(codes, distinct labels); categoricals reuse their own codes."""
+    s = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy(), s.cat.categories
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    return codes, pd.Index(uniques)
+
+
+def map_unique(values, func) -> np.ndarray:
+    """func applied once per distinct non-missing value, expanded back to every row."""
+    codes, uniques = _factorize(values)
+    mapped = np.array([func(u) for u in uniques] + [np.nan], dtype=object)
+    return mapped[codes]
+
+
+class LabelTable:
+    """
+    One coding table compiled to arrays.
+
+    `table` maps each key to its output row (a list of keys means no output
+    columns). `aliases`/`prefixes` map normalized Behavior labels to keys;
+    prefixes are checked first, in order, then the exact aliases.
+    `key_prefixes` map raw key prefixes to an extra output row, checked
+    before the exact keys. Codes index the table rows; -1 is unmapped.
+    """
+
+    def __init__(
+        self,
+        table: dict[str, tuple] | list[str],
+        columns: tuple[str, ...] = (),
+        key_col: str = "key",
+        aliases: dict[str, str] | None = None,
+        prefixes: dict[str, str] | None = None,
+        key_prefixes: dict[str, tuple] | None = None,
+    ):
+        if not isinstance(table, dict):
+            table = dict.fromkeys(table, ())
+        aliases = aliases or {}
+        prefixes = prefixes or {}
+        key_prefixes = key_prefixes or {}
+        self.key_col = key_col
+        self.columns = tuple(columns)
+
+        rows = dict(table)
+        for target in list(aliases.values()) + list(prefixes.values()):
+            rows.setdefault(target, (np.nan,) * len(self.columns))
+        keys = list(rows)
+        self._key_index = {k: i for i, k in enumerate(keys)}
+        self._aliases = {a: self._key_index[t] for a, t in aliases.items()}
+        self._prefixes = [(p, self._key_index[t]) for p, t in prefixes.items()]
+        self._key_prefixes = [(p, len(keys) + i) for i, p in enumerate(key_prefixes)]
+        keys += list(key_prefixes)
+        out_rows = list(rows.values()) + list(key_prefixes.values())
+
+        # per output column: row -> code into that column's categories; slot -1 is unmapped
+        self._out = {}
+        for j, col in enumerate((key_col,) + self.columns):
+            values = keys if j == 0 else [r[j - 1] for r in out_rows]
+            cat_codes, cats = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+            self._out[col] = (np.append(cat_codes, -1), pd.Index(cats, dtype=object))
+
+    def index_of(self, key: str) -> int:
+        return self._key_index.get(key, -1)
+
+    def row_values(self, col: str) -> np.ndarray:
+        """Value of `col` for every row (plus a trailing NaN for code -1)."""
+        cat_codes, cats = self._out[col]
+        return np.append(cats.to_numpy(dtype=object), np.nan)[cat_codes]
+
+    @staticmethod
+    def _match(text, exact: dict[str, int], prefixes: list[tuple[str, int]]) -> np.ndarray:
+        lut = np.full(len(text) + 1, -1, dtype=np.int64)
+        for i, t in enumerate(text):
+            if not isinstance(t, str):
+                continue
+            for p, row in prefixes:
+                if t.startswith(p):
+                    lut[i] = row
+                    break
+            else:
+                lut[i] = exact.get(t, -1)
+        return lut
+
+    def codes(self, values) -> np.ndarray:
+        """Row code per Behavior label (normalized, prefixes then aliases)."""
+        codes, uniques = _factorize(values)
+        text = normalize_labels(uniques).to_numpy(dtype=object)
+        return self._match(text, self._aliases, self._prefixes)[codes]
+
+    def key_codes(self, values) -> np.ndarray:
+        """Row code per key value (raw text, key prefixes then exact keys)."""
+        codes, uniques = _factorize(values)
+        text = pd.Series(uniques, dtype=object).to_numpy()
+        return self._match(text, self._key_index, self._key_prefixes)[codes]
+
+    def _column(self, codes: np.ndarray, col: str) -> tuple[np.ndarray, pd.Index]:
+        cat_codes, cats = self._out[col]
+        return cat_codes[codes], cats
+
+    def decode(
+        self,
+        codes: np.ndarray,
+        columns: list[str] | None = None,
+        index=None,
+        categorical: bool = False,
+    ) -> pd.DataFrame:
+        """Output columns (default: key_col + columns) for row codes; NaN where -1."""
+        columns = [self.key_col, *self.columns] if columns is None else columns
+        return pd.DataFrame(
+            {c: _materialize(*self._column(codes, c), categorical) for c in columns},
+            index=index,
+        )
+
+    def map(self, values, default=np.nan, categorical: bool = False):
+        """Key per Behavior label, `default` where unmapped (like Series.map)."""
+        cat_codes, cats = self._column(self.codes(values), self.key_col)
+        if categorical:
+            return _materialize(cat_codes, cats, True)
+        return np.append(cats.to_numpy(dtype=object), default)[cat_codes]
+
+    def unmapped(self, values) -> pd.DataFrame:
+        """Distinct labels with no key: label, normalized, rows (most frequent first)."""
+        codes, uniques = _factorize(values)
+        text = normalize_labels(uniques).to_numpy(dtype=object)
+        lut = self._match(text, self._aliases, self._prefixes)[:-1]
+        return _unmapped_report(codes, uniques, text, lut < 0)
+
+
+def _materialize(cat_codes: np.ndarray, cats: pd.Index, categorical: bool):
+    if categorical:
+        return pd.Categorical.from_codes(cat_codes, categories=cats)
+    return np.append(cats.to_numpy(dtype=object), np.nan)[cat_codes]
+
+
+def _unmapped_report(codes, uniques, text, missing: np.ndarray) -> pd.DataFrame:
+    rows = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    out = pd.DataFrame({
+        "label": pd.Series(uniques, dtype=object).to_numpy(),
+        "normalized": text,
+        "rows": rows,
+    })
+    out = out[missing & pd.notna(text)]
+    return out.sort_values("rows", ascending=False, kind="mergesort").reset_index(drop=True)
+
+
+class BehaviorEncoder:
+    """
+    Activity and posture tables for one coding plus the sitting rule.
+
+    The rule: where posture is `sitting_key` and the activity row's
+    `drive_from` column is in DRIVE_TYPES, `override_col` becomes "sed_drive"
+    (AM posture_waves, ACT24 waves_sedentary). It is applied on codes.
+    """
+
+    def __init__(
+        self,
+        activity: LabelTable,
+        posture: LabelTable,
+        override_col: str = "posture_waves",
+        drive_from: str = "Activity_Type",
+        drive_types: tuple[str, ...] = DRIVE_TYPES,
+        sitting_key: str = "sitting",
+        drive_value: str = "sed_drive",
+    ):
+        self.activity = activity
+        self.posture = posture
+        self.override_col = override_col
+        self.drive_value = drive_value
+        self._sitting = posture.index_of(sitting_key)
+        self._is_drive = np.isin(activity.row_values(drive_from), list(drive_types))
+
+    def codes(self, behavior) -> tuple[np.ndarray, np.ndarray]:
+        """(activity codes, posture codes) for raw Behavior labels."""
+        return self.activity.codes(behavior), self.posture.codes(behavior)
+
+    def decode(
+        self,
+        activity_codes: np.ndarray | None,
+        posture_codes: np.ndarray | None,
+        columns: list[str] | None = None,
+        index=None,
+        categorical: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Activity then posture output columns (default: every column, keys
+        included). Pass None for a side that is not available; the sitting
+        rule needs both.
+        """
+        sides = [(t, c) for t, c in ((self.activity, activity_codes), (self.posture, posture_codes)) if c is not None]
+        out = {}
+        for table, codes in sides:
+            for col in (table.key_col, *table.columns):
+                if columns is None or col in columns:
+                    out[col] = table._column(codes, col)
+
+        if self.override_col in out and activity_codes is not None and posture_codes is not None:
+            cat_codes, cats = out[self.override_col]
+            if self.drive_value not in cats:
+                cats = cats.append(pd.Index([self.drive_value], dtype=object))
+            hit = (posture_codes == self._sitting) & np.append(self._is_drive, False)[activity_codes]
+            out[self.override_col] = (np.where(hit, cats.get_loc(self.drive_value), cat_codes), cats)
+
+        return pd.DataFrame({c: _materialize(cc, cats, categorical) for c, (cc, cats) in out.items()}, index=index)
+
+    def encode(self, behavior, categorical: bool = False) -> pd.DataFrame:
+        """Every column straight from raw Behavior labels (no carry-forward)."""
+        index = behavior.index if isinstance(behavior, pd.Series) else None
+        return self.decode(*self.codes(behavior), index=index, categorical=categorical)
+
+    def add_domains(self, df: pd.DataFrame, columns: list[str] | None = None, categorical: bool = False) -> pd.DataFrame:
+        """
+        Output columns looked up from the key columns already in `df`
+        (e.g. after they were carried forward). Default: every non-key column
+        of each side whose key column is present.
+        """
+        act = self.activity.key_codes(df[self.activity.key_col]) if self.activity.key_col in df.columns else None
+        pos = self.posture.key_codes(df[self.posture.key_col]) if self.posture.key_col in df.columns else None
+        if columns is None:
+            columns = [c for t, k in ((self.activity, act), (self.posture, pos)) if k is not None for c in t.columns]
+        out = df.copy()
+        coded = self.decode(act, pos, columns=columns, index=df.index, categorical=categorical)
+        for c in coded.columns:
+            out[c] = coded[c]
+        return out
+
+    def unmapped(self, behavior) -> pd.DataFrame:
+        """Distinct Behavior labels matched by neither table."""
+        codes, uniques = _factorize(behavior)
+        text = normalize_labels(uniques).to_numpy(dtype=object)
+        act = self.activity._match(text, self.activity._aliases, self.activity._prefixes)[:-1]
+        pos = self.posture._match(text, self.posture._aliases, self.posture._prefixes)[:-1]
+        return _unmapped_report(codes, uniques, text, (act < 0) & (pos < 0))
+
+
+def am_encoder() -> BehaviorEncoder:
+    """AM_restart1.ipynb: Behavior -> Activity_Type / posture_wbm -> domains."""
+    activity = LabelTable(
+        activity_domain_map,
+        ("broad_domain", "waves_domain"),
+        key_col="Activity_Type",
+        aliases=activity_map,
+    )
+    posture = LabelTable(
+        posture_domain_map,
+        ("posture_broad", "posture_waves"),
+        key_col="posture_wbm",
+        aliases=posture_map,
+    )
+    return BehaviorEncoder(activity, posture, override_col="posture_waves", drive_from="Activity_Type")
+
+
+def act24_encoder() -> BehaviorEncoder:
+    """dataCleanOneChunk_ACT.ipynb: Behavior -> canonical Activity_Type / posture_wbm -> meta."""
+    activity = LabelTable(
+        act24_activity_meta,
+        ("activity_type", "broad_domain", "waves_domain"),
+        key_col="Activity_Type",
+        aliases=act24_activity_aliases,
+        prefixes=act24_activity_prefixes,
+        key_prefixes=act24_activity_meta_prefixes,
+    )
+    posture = LabelTable(
+        act24_posture_domain_map,
+        ("posture_broad", "posture_waves", "waves_sedentary"),
+        key_col="posture_wbm",
+        aliases=act24_posture_aliases,
+        prefixes=act24_posture_prefixes,
+    )
+    return BehaviorEncoder(activity, posture, override_col="waves_sedentary", drive_from="activity_type")
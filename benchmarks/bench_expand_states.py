@@ -0,0 +1,104 @@
+"""
+Timing benchmark: expand_states_to_seconds vs the per-Observation loop.
+
+Run from the repo root:
+    python -m benchmarks.bench_expand_states --obs 200 --hours 2
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from sec_by_sec import expand_states_to_seconds
+
+
+def make_state_events(n_obs: int, hours: float, seed: int = 0) -> pd.DataFrame:
+    """Synthetic AM-style State start rows (overlapping activity + posture events)."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    behaviors = ["ha- housework", "sb-sitting", "la- stand", "wa- walk", "les- socializing"]
+    for i in range(n_obs):
+        obs = f"AM{i % 100:02d}DO{i // 100 + 1}_J_FINAL_R"
+        t0 = pd.Timestamp("2018-01-01 08:00:00") + pd.Timedelta(days=i)
+        total = hours * 3600.0
+        t = 0.0
+        while t < total:
+            dur = float(rng.exponential(90.0)) + 0.5
+            rows.append((obs, t0 + pd.Timedelta(seconds=t), dur, behaviors[rng.integers(len(behaviors))]))
+            t += float(rng.exponential(60.0)) + 0.2
+    df = pd.DataFrame(rows, columns=["Observation", "Date_Time_Absolute_dmy_hmsf", "Duration_sf", "Behavior"])
+    df["Modifier_1"] = "mod"
+    return df
+
+
+def expand_loop(work: pd.DataFrame, abs_col: str = "Date_Time_Absolute_dmy_hmsf") -> pd.DataFrame:
+    """The original per-Observation loop from am_behposture_profile.py."""
+    work = work.copy()
+    work[abs_col] = pd.to_datetime(work[abs_col], errors="coerce")
+    work = work.dropna(subset=["Observation", abs_col]).copy()
+    work["_start_dt_sec"] = work[abs_col].dt.floor("s")
+    work["_dur_s"] = pd.to_numeric(work["Duration_sf"], errors="coerce").fillna(0.0)
+    work["_dur_s_int"] = np.ceil(work["_dur_s"]).astype("int64")
+    work["_end_dt_sec"] = work["_start_dt_sec"] + pd.to_timedelta(work["_dur_s_int"], unit="s")
+    work = work.sort_values(["Observation", "_start_dt_sec", abs_col], kind="mergesort")
+
+    helper_cols = {"_start_dt_sec", "_dur_s", "_dur_s_int", "_end_dt_sec"}
+    carry_cols = [c for c in work.columns if c not in helper_cols]
+
+    out = []
+    for obs, g in work.groupby("Observation", sort=False):
+        start_dt = g["_start_dt_sec"].min()
+        end_dt = g["_end_dt_sec"].max()
+        grid = pd.date_range(start=start_dt, end=end_dt, freq="1s")
+        starts = g["_start_dt_sec"].to_numpy()
+        ends = g["_end_dt_sec"].to_numpy()
+        tvals = grid.to_numpy()
+        idx = np.searchsorted(starts, tvals, side="right") - 1
+        res = pd.DataFrame({"Observation": obs, "date_time_abs": grid})
+        res["_sec"] = (res["date_time_abs"] - start_dt).dt.total_seconds().astype("int64")
+        valid = idx >= 0
+        valid &= (tvals <= ends[np.maximum(idx, 0)])
+        if valid.any():
+            take = g.iloc[idx[valid]][carry_cols].reset_index(drop=True)
+            for c in take.columns:
+                if c in {"Observation"}:
+                    continue
+                res.loc[valid, c] = take[c].to_numpy()
+        out.append(res)
+    return pd.concat(out, ignore_index=True)
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--obs", type=int, default=200)
+    parser.add_argument("--hours", type=float, default=2.0)
+    args = parser.parse_args()
+
+    events = make_state_events(args.obs, args.hours)
+    print(f"Events: {len(events):,} across {events['Observation'].nunique()} Observations")
+
+    old, t_old = _timed(expand_loop, events)
+    new, t_new = _timed(expand_states_to_seconds, events)
+
+    print(f"loop:       {t_old:8.3f}s  rows={len(old):,}")
+    print(f"vectorized: {t_new:8.3f}s  rows={len(new):,}")
+    print(f"speedup:    {t_old / max(t_new, 1e-9):8.1f}x")
+
+    cols = ["Observation", "date_time_abs", "_sec", "Behavior", "Modifier_1"]
+    pd.testing.assert_frame_equal(
+        old[cols].reset_index(drop=True),
+        new[cols].reset_index(drop=True),
+        check_dtype=False,
+    )
+    print("Outputs match.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Per-stage benchmarks on synthetic inputs (benchmarks/synthetic.py), fully offline.
+
+Run from the repo root, with pytest-benchmark:
+    python -m pytest benchmarks/bench_stages.py --benchmark-autosave     # saved under .benchmarks/
+    python -m pytest benchmarks/bench_stages.py --benchmark-compare      # against the last saved run
+    WAVES_BENCH_SCALE=1000x2x10 python -m pytest benchmarks/bench_stages.py
+
+or one timed pass per stage without pytest:
+    python -m benchmarks.bench_stages --participants 1000 --sessions 2 --hours 10
+
+Scale is participants x sessions x hours (default 20x2x2). Inputs are
+built once per run and only the stage itself is timed:
+    expand          AM State start rows -> sec-by-sec (sec_by_sec.expand_states_to_seconds)
+    act24_segments  ACT24 tracks -> segments -> intersected seconds (act24_segments)
+    encode_am       AM per-second Behavior -> Activity_Type / posture_wbm + domains, carried forward
+    encode_act24    ACT24 per-second activity / posture Behavior -> codes + domains
+    qc              sec_qc.validate_sec_by_sec on the AM sec-by-sec
+    steps_ingest    Steps workbooks -> one frame (steps_ingest.load_steps, no cache)
+    steps_recode    steps_recode.recode_steps against the do_log
+    device_align    PALS / activPAL epoch files -> aligned rows (device_align, 15 s epochs)
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from act24_segments import intersect_segments, segments_to_seconds, track_segments
+from behavior_encoder import LabelTable, act24_encoder, am_encoder
+from benchmarks.synthetic import (
+    make_device_epochs,
+    make_do_log,
+    make_events,
+    make_steps_events,
+    session_table,
+    write_device_epochs,
+    write_steps_workbooks,
+)
+from device_align import process_pair_aligned
+from sec_by_sec import expand_states_to_seconds
+from sec_qc import validate_sec_by_sec
+from steps_ingest import load_steps
+from steps_recode import recode_steps
+from taxonomy import act24_track_prefixes
+from waves_time import parse_seconds
+
+try:
+    import pytest
+except ImportError:  # the plain timed pass does not need pytest
+    pytest = None
+
+
+DEFAULT_SCALE = "20x2x2"
+CARRY_COLS = ["Behavior", "Modifier_1", "Modifier_2", "Modifier_3", "Modifier_4", "Comment"]
+
+
+def parse_scale(text: str) -> tuple[int, int, float]:
+    """"1000x2x10" -> (participants, sessions, hours)."""
+    p, s, h = text.lower().split("x")
+    return int(p), int(s), float(h)
+
+
+def build_inputs(
+    participants: int,
+    sessions: int,
+    hours: float,
+    work_dir: str | Path,
+    steps_workbooks: int = 10,
+    seed: int = 0,
+) -> dict:
+    """Every stage's input, generated once (files for the stages that read files)."""
+    work_dir = Path(work_dir)
+    table = session_table(participants, sessions, hours, seed)
+
+    am = make_events(table, "am", stops=False, seed=seed)
+    am_sec = expand_states_to_seconds(am, carry_cols=CARRY_COLS)
+    am_sec[CARRY_COLS] = am_sec.groupby("Observation", sort=False)[CARRY_COLS].ffill()
+
+    act24 = make_events(table, "act24", stops=False, seed=seed + 1)
+    act24["_seconds"] = parse_seconds(act24["Time_Relative_hms"])
+    track = LabelTable(["activity", "posture"], key_col="_track", prefixes=act24_track_prefixes)
+    act24["_track"] = track.map(act24["Behavior"], default="other")
+
+    steps_table = table.head(steps_workbooks)
+    write_steps_workbooks(make_steps_events(steps_table, seed=seed + 2), work_dir / "steps")
+    pals_files, ap_files = write_device_epochs(make_device_epochs(table, seed=seed + 3), work_dir)
+
+    inputs = {
+        "am_events": am,
+        "am_sec": am_sec,
+        "act24_events": act24,
+        "steps_dir": work_dir / "steps",
+        "steps_events": load_steps(work_dir / "steps", columns=["Time_Relative_hmsf", "Behavior"], cache_dir=None)[0],
+        "steps_log": make_do_log(table, "act24"),
+        "device_pairs": [(pals_files[k], ap_files[k], k) for k in sorted(pals_files)],
+    }
+    inputs["act24_sec"] = act24_seconds(inputs)
+    return inputs
+
+
+def expand(inputs: dict) -> pd.DataFrame:
+    return expand_states_to_seconds(inputs["am_events"], carry_cols=CARRY_COLS)
+
+
+def act24_seconds(inputs: dict) -> pd.DataFrame:
+    """The segment part of dataCleanOneChunk_ACT.ipynb cell 2."""
+    df = inputs["act24_events"]
+    activity = track_segments(df[df["_track"] == "activity"], value_cols={
+        "Behavior": "Behavior_activity",
+        "Modifier_1": "Modifier_1_activity",
+        "Modifier_2": "Modifier_2_activity",
+        "Modifier_3": "Modifier_3",
+    })
+    posture = track_segments(df[df["_track"] == "posture"], value_cols={
+        "Behavior": "Behavior_posture",
+        "Modifier_2": "Modifier_2_posture",
+    })
+    return segments_to_seconds(intersect_segments(activity, posture))
+
+
+def encode_am(inputs: dict) -> pd.DataFrame:
+    """AM_restart1.ipynb cells 6-7."""
+    encoder = am_encoder()
+    sec = inputs["am_sec"].copy()
+    sec["Activity_Type"] = encoder.activity.map(sec["Behavior"])
+    sec["posture_wbm"] = encoder.posture.map(sec["Behavior"])
+    sec[["Activity_Type", "posture_wbm"]] = sec.groupby("Observation", sort=False)[["Activity_Type", "posture_wbm"]].ffill()
+    return encoder.add_domains(sec)
+
+
+def encode_act24(inputs: dict) -> pd.DataFrame:
+    encoder = act24_encoder()
+    sec = inputs["act24_sec"].copy()
+    sec["Activity_Type"] = encoder.activity.map(sec["Behavior_activity"])
+    sec["posture_wbm"] = encoder.posture.map(sec["Behavior_posture"])
+    return encoder.add_domains(sec)
+
+
+def qc(inputs: dict) -> pd.DataFrame:
+    table, _ = validate_sec_by_sec(inputs["am_sec"])
+    return table
+
+
+def steps_ingest(inputs: dict) -> pd.DataFrame:
+    return load_steps(inputs["steps_dir"], columns=["Time_Relative_hmsf", "Behavior"], cache_dir=None)[0]
+
+
+def steps_recode(inputs: dict) -> pd.DataFrame:
+    return recode_steps(inputs["steps_events"], inputs["steps_log"])
+
+
+def device_align(inputs: dict) -> pd.DataFrame:
+    merged = [process_pair_aligned(p, a, k, epoch_s=15)[0] for p, a, k in inputs["device_pairs"]]
+    return pd.concat(merged, ignore_index=True)
+
+
+STAGES = {
+    "expand": expand,
+    "act24_segments": act24_seconds,
+    "encode_am": encode_am,
+    "encode_act24": encode_act24,
+    "qc": qc,
+    "steps_ingest": steps_ingest,
+    "steps_recode": steps_recode,
+    "device_align": device_align,
+}
+
+
+if pytest is not None:
+    SCALE = os.environ.get("WAVES_BENCH_SCALE", DEFAULT_SCALE)
+
+    @pytest.fixture(scope="module")
+    def inputs(tmp_path_factory):
+        return build_inputs(*parse_scale(SCALE), tmp_path_factory.mktemp("synthetic"))
+
+    @pytest.mark.parametrize("stage", list(STAGES))
+    def test_stage(benchmark, inputs, stage):
+        benchmark.group = f"stages {SCALE}"
+        benchmark.extra_info["scale"] = SCALE
+        out = benchmark.pedantic(STAGES[stage], args=(inputs,), rounds=3, iterations=1)
+        assert len(out) > 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--participants", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=2)
+    parser.add_argument("--hours", type=float, default=2.0)
+    parser.add_argument("--steps-workbooks", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        inputs = build_inputs(args.participants, args.sessions, args.hours, tmp, args.steps_workbooks)
+        print(f"Inputs: {len(inputs['am_events']):,} AM / {len(inputs['act24_events']):,} ACT24 events, "
+              f"{len(inputs['am_sec']):,} AM seconds ({time.perf_counter() - t0:.1f}s to build)")
+        for name, stage in STAGES.items():
+            t0 = time.perf_counter()
+            out = stage(inputs)
+            print(f"{name:<15} {time.perf_counter() - t0:8.3f}s  rows={len(out):,}")
+
+
+if __name__ == "__main__":
+    main()
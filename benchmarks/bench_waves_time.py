@@ -0,0 +1,148 @@
+"""
+Timing benchmark: waves_time vs the per-row time helpers it replaces.
+
+Run from the repo root:
+    python -m benchmarks.bench_waves_time --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from waves_time import format_hms, parse_clock, parse_seconds
+
+
+def make_time_strings(n: int, seed: int = 0) -> tuple[np.ndarray, pd.Series, pd.Series]:
+    """Whole seconds, "HH:MM:SS" relative times and "H:MM:SS AM" clock strings."""
+    rng = np.random.default_rng(seed)
+    secs = rng.integers(0, 12 * 3600, n)
+    rel = pd.Series(format_hms(secs))
+    tod = rng.integers(0, 24 * 3600, n)
+    h, m, s = tod // 3600, (tod % 3600) // 60, tod % 60
+    clock = pd.Series([f"{(hh % 12) or 12}:{mm:02d}:{ss:02d} {'PM' if hh >= 12 else 'AM'}" for hh, mm, ss in zip(h, m, s)])
+    return secs, rel, clock
+
+
+# --- the helpers as they were in the notebooks ---------------------------------
+
+def time_to_seconds(time_str):
+    """Steps Code/stepsExplore.ipynb"""
+    if pd.isna(time_str) or time_str == "NaT" or time_str == "":
+        return None
+    parts = time_str.split(":")
+    return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+
+
+def seconds_to_time(seconds):
+    """Steps Code/stepsExplore.ipynb"""
+    hours = seconds // 3600
+    minutes = (seconds % 3600) // 60
+    secs = seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def _parse_hms_to_seconds(series: pd.Series) -> pd.Series:
+    """ACT24 Full Code/dataCleanOneChunk_ACT.ipynb (blank mask fixed to use `s`)"""
+    s = series.astype(str).str.strip()
+    s = s.str.replace(",", ".", regex=False).str.replace(";", ".", regex=False)
+
+    td = pd.Series(pd.NaT, index=s.index, dtype="timedelta64[ns]")
+    mask_hms = s.str.count(":") == 2
+    mask_ms = s.str.count(":") == 1
+    mask_sec = s.str.fullmatch(r"/d+(/./d+)?")
+    mask_blank = s.eq("") | s.str.lower().isin(["nan", "none"])
+
+    td.loc[mask_hms] = pd.to_timedelta(s[mask_hms], errors="coerce")
+    td.loc[mask_ms] = pd.to_timedelta("00:" + s[mask_ms], errors="coerce")
+    if mask_sec.any():
+        td.loc[mask_sec] = pd.to_timedelta(s[mask_sec].astype(float), unit="s")
+    td.loc[mask_blank] = pd.NaT
+    return td.dt.total_seconds()
+
+
+def _format_hms(seconds_float: float, decimals: int = 0) -> str:
+    """ACT24 Full Code/dataCleanOneChunk_ACT.ipynb"""
+    if pd.isna(seconds_float):
+        return np.nan
+    scale = 10 ** decimals
+    total_units = int(round(seconds_float * scale))
+    secs = total_units // scale
+    frac_units = total_units % scale
+    h = secs // 3600
+    m = (secs % 3600) // 60
+    s = secs % 60
+    if decimals == 0:
+        return f"{h:02d}:{m:02d}:{s:02d}"
+    return f"{h:02d}:{m:02d}:{s:02d}.{frac_units:0{decimals}d}"
+
+
+def clock_two_pass(s: pd.Series) -> pd.Series:
+    """log_df2 start_time cleanup (ACT24)"""
+    s = s.astype(str).str.strip()
+    _dt1 = pd.to_datetime(s, format="%I:%M:%S %p", errors="coerce")
+    _dt2 = pd.to_datetime(s, format="%I:%M %p", errors="coerce")
+    return _dt1.fillna(_dt2).dt.strftime("%H:%M:%S")
+
+
+# -------------------------------------------------------------------------------
+
+def check_short_inputs() -> None:
+    """Arrays narrower than "HH:MM:SS" (no fast-path rows) must still parse."""
+    np.testing.assert_array_equal(parse_seconds(["75"]), [75.0])
+    np.testing.assert_array_equal(parse_seconds(["2:03"]), [123.0])
+    np.testing.assert_array_equal(parse_seconds(["0:00:42", "7.5", ""]), [42.0, 7.5, np.nan])
+    np.testing.assert_array_equal(parse_seconds(["75", "00:01:02"]), [75.0, 62.0])
+    np.testing.assert_array_equal(parse_seconds(["-00:00:05", "+1:02", " -7.5", "5-", "--1", "-"]), [-5.0, 62.0, -7.5, np.nan, np.nan, np.nan])
+    np.testing.assert_array_equal(parse_clock(["1:05 PM"]), [13 * 3600 + 5 * 60])
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def _report(name: str, t_old: float, t_new: float) -> None:
+    print(f"{name:<28} old {t_old:8.3f}s   new {t_new:8.3f}s   {t_old / max(t_new, 1e-9):6.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    check_short_inputs()
+    secs, rel, clock = make_time_strings(args.rows)
+    print(f"Rows: {args.rows:,}")
+
+    old, t_old = _timed(lambda: rel.apply(time_to_seconds))
+    new, t_new = _timed(parse_seconds, rel)
+    np.testing.assert_array_equal(old.to_numpy(dtype="float64"), new)
+    _report("time_to_seconds", t_old, t_new)
+
+    old, t_old = _timed(_parse_hms_to_seconds, rel)
+    new, t_new = _timed(parse_seconds, rel)
+    np.testing.assert_array_equal(old.to_numpy(), new)
+    _report("_parse_hms_to_seconds", t_old, t_new)
+
+    old, t_old = _timed(lambda: pd.Series(secs).apply(seconds_to_time))
+    new, t_new = _timed(format_hms, secs)
+    assert (old.to_numpy() == new).all()
+    _report("seconds_to_time", t_old, t_new)
+
+    old, t_old = _timed(lambda: [_format_hms(s, decimals=0) for s in secs])
+    new, t_new = _timed(format_hms, secs, 0)
+    assert old == list(new)
+    _report("_format_hms", t_old, t_new)
+
+    old, t_old = _timed(clock_two_pass, clock)
+    new, t_new = _timed(lambda: format_hms(parse_clock(clock)))
+    assert (old.to_numpy() == new).all()
+    _report("start_time _dt1/_dt2", t_old, t_new)
+
+    print("Outputs match.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Synthetic WAVES inputs in the real schemas, for benchmarks and offline runs.
+
+Run from the repo root:
+    python -m benchmarks.synthetic --participants 1000 --sessions 2 --hours 10 --out synthetic_data
+
+writes
+    am_behposture_onesheet.csv        AM BORIS export (State start + State stop rows)
+    DO_LOG_final.csv                  AM do_log (id "AM02", obs "DO1", start_time)
+    ACT24_behposture_event.csv        ACT24 BORIS export
+    do_log_final_behavior.csv         ACT24 / Steps do_log (id, do, start_month/day/year, "8:20:19 AM")
+    steps/Step_<id>_<do>_SY.xlsx      Steps workbooks (the first --steps-workbooks sessions)
+    pals/PALS<id>_*.csv               PALS epoch files (time, bicycling, ...)
+    activpal/PALS<id>_*.csv           activPAL epoch exports (";"-separated, clock-only times)
+
+Labels are drawn from the taxonomy.py tables, so every stage sees codable
+behaviors; everything comes from one seed, so a configuration always gives
+the same data. The generators are vectorized (no per-event Python):
+1000 x 2 x 10 h (4.8M AM rows) builds in seconds and writing the CSVs
+takes most of the time.
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import taxonomy
+from waves_time import format_hms
+
+
+INTENSITY_MODIFIERS = ["sedentary", "light", "moderate", "vigorous"]
+SPORT_MODIFIERS = ["Basketball", "Running", "Swimming", "Yoga"]
+WORK_MODIFIERS = ["SP- Education and Health Services", "SP- Professional and Business Services", "SP- Leisure and Hospitality"]
+STEP_QUALITY = ["Codable", "Non-codeable"]
+
+
+def session_table(participants: int, sessions: int = 2, hours: float = 10.0, seed: int = 0) -> pd.DataFrame:
+    """One row per (id, do): start (datetime64, 07:00-11:00 on its own day) and hours."""
+    rng = np.random.default_rng(seed)
+    ids = np.repeat(np.arange(1, participants + 1), sessions)
+    dos = np.tile(np.arange(1, sessions + 1), participants)
+    day = pd.Timestamp("2019-01-07") + pd.to_timedelta(np.arange(len(ids)), unit="D")
+    start = day + pd.to_timedelta(rng.integers(7 * 3600, 11 * 3600, len(ids)), unit="s")
+    return pd.DataFrame({"id": ids, "do": dos, "start": start, "hours": float(hours)})
+
+
+def _event_times(sessions: pd.DataFrame, mean_gap_s: float, rng) -> tuple[np.ndarray, np.ndarray]:
+    """(session row, relative start seconds) of every event; each session starts at 0."""
+    n = np.maximum((sessions["hours"].to_numpy() * 3600 / mean_gap_s).astype(np.int64), 1)
+    row = np.repeat(np.arange(len(sessions)), n)
+    gaps = rng.exponential(mean_gap_s, len(row)) + 0.2
+    first = np.cumsum(n) - n
+    gaps[first] = 0.0
+    t = np.cumsum(gaps)
+    t -= np.repeat(t[first], n)
+    return row, np.round(t, 3)
+
+
+def _sometimes(rng, values: list, n: int, p: float) -> np.ndarray:
+    """values drawn for a share p of n rows, None elsewhere."""
+    return np.where(rng.random(n) < p, rng.choice(np.asarray(values, dtype=object), n), None)
+
+
+def make_events(
+    sessions: pd.DataFrame,
+    kind: str = "am",
+    mean_gap_s: float = 30.0,
+    stops: bool = True,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    BORIS state events for every session: activity and posture labels
+    mixed 50/50, Duration_sf ~ 1.5x the gap, modifiers on a share of rows.
+    kind="am" names Observations "AM01DO1_J_FINAL_R" and adds
+    Modifier_4 / Comment; kind="act24" names them "ID_101_01_C".
+    With stops, each State start is followed by its State stop row.
+    """
+    if kind not in ("am", "act24"):
+        raise ValueError(f"kind must be 'am' or 'act24', not {kind!r}")
+    rng = np.random.default_rng(seed)
+    row, rel = _event_times(sessions, mean_gap_s, rng)
+    n = len(row)
+
+    if kind == "am":
+        activity, posture = list(taxonomy.activity_map), list(taxonomy.posture_map)
+        names = "AM" + sessions["id"].map("{:02d}".format) + "DO" + sessions["do"].astype(str) + "_J_FINAL_R"
+    else:
+        activity, posture = list(taxonomy.act24_activity_aliases), list(taxonomy.act24_posture_aliases)
+        names = "ID_" + sessions["id"].astype(str) + "_" + sessions["do"].map("{:02d}".format) + "_C"
+    is_activity = rng.random(n) < 0.5
+    behavior = np.where(
+        is_activity,
+        rng.choice(np.asarray(activity, dtype=object), n),
+        rng.choice(np.asarray(posture, dtype=object), n),
+    )
+
+    start = sessions["start"].to_numpy(dtype="datetime64[ns]")[row]
+    events = pd.DataFrame({
+        "Date_Time_Absolute_dmy_hmsf": start + (rel * 1e9).astype("timedelta64[ns]"),
+        "Time_Relative_hmsf": format_hms(rel, decimals=3),
+        "Time_Relative_hms": format_hms(np.floor(rel)),
+        "Duration_sf": np.round(rng.exponential(1.5 * mean_gap_s, n) + 1.0, 3),
+        "Observation": names.to_numpy()[row],
+        "Behavior": behavior,
+        "Modifier_1": np.where(is_activity, _sometimes(rng, SPORT_MODIFIERS, n, 0.2), None),
+        "Modifier_2": _sometimes(rng, INTENSITY_MODIFIERS, n, 0.4),
+        "Modifier_3": np.where(is_activity, _sometimes(rng, WORK_MODIFIERS, n, 0.2), None),
+        "Event_Type": "State start",
+    })
+    events["Date_Time_Absolute_dmy_hmsf"] = events["Date_Time_Absolute_dmy_hmsf"].dt.floor("ms")
+    if kind == "am":
+        events["Modifier_4"] = _sometimes(rng, ["copyA", "copyB"], n, 0.05)
+        events["Comment"] = _sometimes(rng, ["check video"], n, 0.01)
+
+    if stops:
+        stop = events.copy()
+        end = rel + events["Duration_sf"].to_numpy()
+        stop["Date_Time_Absolute_dmy_hmsf"] = events["Date_Time_Absolute_dmy_hmsf"] + pd.to_timedelta(events["Duration_sf"], unit="s").dt.floor("ms")
+        stop["Time_Relative_hmsf"] = format_hms(end, decimals=3)
+        stop["Time_Relative_hms"] = format_hms(np.floor(end))
+        stop["Duration_sf"] = np.nan
+        stop["Event_Type"] = "State stop"
+        # each stop row right after its start, so every Observation stays contiguous
+        events = pd.concat([events, stop], ignore_index=True).take(np.ravel(np.c_[np.arange(n), np.arange(n) + n]))
+        events = events.reset_index(drop=True)
+    return events
+
+
+def make_do_log(sessions: pd.DataFrame, kind: str = "act24") -> pd.DataFrame:
+    """
+    do_log for `sessions`: kind="act24" (also the Steps log) has numeric id/do,
+    start_month/day/year and a 12 h start_time; kind="am" has id "AM01",
+    obs "DO1" and a 24 h start_time.
+    """
+    start = sessions["start"]
+    log = pd.DataFrame({
+        "id": sessions["id"].to_numpy(),
+        "do": sessions["do"].to_numpy(),
+        "start_month": start.dt.month.to_numpy(),
+        "start_day": start.dt.day.to_numpy(),
+        "start_year": start.dt.year.to_numpy(),
+    })
+    if kind == "am":
+        log["id"] = "AM" + sessions["id"].map("{:02d}".format).to_numpy()
+        log["do"] = "DO" + sessions["do"].astype(str).to_numpy()
+        log = log.rename(columns={"do": "obs"})
+        log["start_time"] = start.dt.strftime("%H:%M:%S").to_numpy()
+    else:
+        hour = start.dt.hour
+        log["start_time"] = (
+            ((hour % 12).replace(0, 12)).astype(str) + start.dt.strftime(":%M:%S ") + np.where(hour < 12, "AM", "PM")
+        ).to_numpy()
+    return log
+
+
+def make_steps_events(sessions: pd.DataFrame, steps_per_min: float = 40.0, seed: int = 0) -> pd.DataFrame:
+    """
+    Steps workbook rows for every session: id, obs, Time_Relative_hms(f),
+    Behavior ("step" point events between Codable / Non-codeable quality
+    states), Event_Type.
+    """
+    rng = np.random.default_rng(seed)
+    row, rel = _event_times(sessions, 60.0 / steps_per_min, rng)
+    behavior = np.full(len(row), "step", dtype=object)
+    event_type = np.full(len(row), "Point", dtype=object)
+    # a quality state roughly every 10 minutes, and at the start of each session
+    quality = rng.random(len(row)) < (60.0 / steps_per_min) / 600.0
+    quality[np.r_[True, row[1:] != row[:-1]]] = True
+    behavior[quality] = rng.choice(np.asarray(STEP_QUALITY, dtype=object), int(quality.sum()), p=[0.9, 0.1])
+    event_type[quality] = "State start"
+    return pd.DataFrame({
+        "id": sessions["id"].to_numpy()[row],
+        "obs": sessions["do"].to_numpy()[row],
+        "Time_Relative_hms": format_hms(np.floor(rel)),
+        "Time_Relative_hmsf": format_hms(rel, decimals=3),
+        "Behavior": behavior,
+        "Event_Type": event_type,
+    })
+
+
+def write_steps_workbooks(steps: pd.DataFrame, out_dir: str | Path) -> list[Path]:
+    """One Step_<id>_<obs>_SY.xlsx per session (openpyxl write-only), named as steps_ingest expects."""
+    import openpyxl
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cols = [c for c in steps.columns if c not in ("id", "obs")]
+    paths = []
+    for (id_val, obs), g in steps.groupby(["id", "obs"], sort=True):
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(cols)
+        for r in g[cols].itertuples(index=False):
+            ws.append(list(r))
+        p = out_dir / f"Step_{id_val}_{obs:02d}_SY.xlsx"
+        wb.save(p)
+        paths.append(p)
+    return paths
+
+
+def make_device_epochs(
+    sessions: pd.DataFrame,
+    epoch_s: int = 15,
+    seed: int = 0,
+) -> dict[int, tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Per participant (first session's day): (PALS frame, activPAL frame).
+    PALS has time "%Y-%m-%d %H:%M:%S.%f" and fractional bicycling/sitting;
+    activPAL has clock-only Time(approx) a few seconds off the PALS grid and
+    Cycling Time (s) per epoch.
+    """
+    rng = np.random.default_rng(seed)
+    first = sessions.drop_duplicates("id", keep="first")
+    out = {}
+    for id_val, start, hours in first[["id", "start", "hours"]].itertuples(index=False):
+        n = int(hours * 3600 // epoch_s)
+        t = np.datetime64(start.floor("s"), "ms") + (np.arange(n) * epoch_s * 1000).astype("timedelta64[ms]")
+        cycling = (rng.random(n) < 0.05) * rng.random(n)
+        pals = pd.DataFrame({
+            "time": np.char.replace(np.datetime_as_string(t, unit="ms"), "T", " "),
+            "bicycling": np.round(cycling, 4),
+            "sitting": np.round(rng.random(n) * (cycling == 0), 4),
+        })
+        lag = rng.integers(-3, 4, n).astype("timedelta64[s]")
+        ap = pd.DataFrame({
+            "Time(approx)": pd.Series(t + lag).dt.strftime("%H:%M:%S").to_numpy(),
+            "Cycling Time (s)": np.round(cycling * epoch_s, 1),
+            "Steps": rng.integers(0, 30, n),
+        })
+        out[int(id_val)] = (pals, ap)
+    return out
+
+
+def write_device_epochs(epochs: dict, out_dir: str | Path) -> tuple[dict[str, Path], dict[str, Path]]:
+    """PALS and activPAL files under out_dir/pals and out_dir/activpal; returns {5-digit id: path} for each."""
+    out_dir = Path(out_dir)
+    (out_dir / "pals").mkdir(parents=True, exist_ok=True)
+    (out_dir / "activpal").mkdir(parents=True, exist_ok=True)
+    pals_files, ap_files = {}, {}
+    for id_val, (pals, ap) in epochs.items():
+        key = f"{10000 + id_val:05d}"
+        pals_files[key] = out_dir / "pals" / f"PALS{key}_pals_epochs.csv"
+        ap_files[key] = out_dir / "activpal" / f"PALS{key}_activpal_epochs.csv"
+        pals.to_csv(pals_files[key], index=False)
+        with open(ap_files[key], "w", newline="") as f:
+            f.write("sep=;\n")
+            ap.to_csv(f, sep=";", index=False)
+    return pals_files, ap_files
+
+
+def write_dataset(
+    out_dir: str | Path,
+    participants: int = 20,
+    sessions: int = 2,
+    hours: float = 2.0,
+    steps_workbooks: int = 10,
+    seed: int = 0,
+) -> Path:
+    """Every file listed in the module docstring under `out_dir`."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    table = session_table(participants, sessions, hours, seed)
+
+    make_events(table, "am", seed=seed).to_csv(out_dir / "am_behposture_onesheet.csv", index=False)
+    make_do_log(table, "am").to_csv(out_dir / "DO_LOG_final.csv", index=False)
+    make_events(table, "act24", seed=seed + 1).to_csv(out_dir / "ACT24_behposture_event.csv", index=False)
+    make_do_log(table, "act24").to_csv(out_dir / "do_log_final_behavior.csv", index=False)
+    if steps_workbooks:
+        write_steps_workbooks(make_steps_events(table.head(steps_workbooks), seed=seed + 2), out_dir / "steps")
+    write_device_epochs(make_device_epochs(table, seed=seed + 3), out_dir)
+    return out_dir
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", default="synthetic_data")
+    parser.add_argument("--participants", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=2)
+    parser.add_argument("--hours", type=float, default=2.0)
+    parser.add_argument("--steps-workbooks", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    out = write_dataset(args.out, args.participants, args.sessions, args.hours, args.steps_workbooks, args.seed)
+    print(f"Wrote {out} in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
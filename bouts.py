@@ -0,0 +1,135 @@
+"""
+Bout detection and bout-to-bout matching for two device series.
+
+A bout is a run of consecutive rows where the series is above `threshold`,
+stored as a half-open row interval [start, end). Runs never cross a group
+(participant) boundary. Matching two sets of bouts is a sorted sweep: since
+bouts of one series never overlap each other, the bouts of B that touch a
+bout of A form one contiguous block found with two searchsorted calls.
+
+Works for any pair of 0/positive series in the same frame (cycling,
+walking, sedentary ...):
+
+    summary = bout_summary(final_df, "cycle_pals", "cycle_activPal", group_col="ID")
+"""
+import numpy as np
+import pandas as pd
+
+
+def detect_bouts(
+    values,
+    min_duration: int = 4,
+    threshold: float = 0,
+    groups=None,
+) -> pd.DataFrame:
+    """
+    Run-length encode `values > threshold` into bouts of at least `min_duration` rows.
+
+    Returns one row per bout: group (if given), start, end (exclusive), length.
+    """
+    v = np.asarray(values, dtype="float64")
+    active = v > threshold
+    n = len(active)
+    if groups is not None:
+        g_codes, g_labels = pd.factorize(np.asarray(groups), sort=False)
+        new_group = np.r_[True, g_codes[1:] != g_codes[:-1]] if n else np.zeros(0, dtype=bool)
+    else:
+        new_group = np.r_[True, np.zeros(max(n - 1, 0), dtype=bool)][:n]
+
+    prev = np.r_[False, active[:-1]] if n else active
+    nxt = np.r_[active[1:], False] if n else active
+    next_group = np.r_[new_group[1:], True] if n else new_group
+    starts = np.flatnonzero(active & (~prev | new_group))
+    ends = np.flatnonzero(active & (~nxt | next_group)) + 1
+
+    lengths = ends - starts
+    keep = lengths >= min_duration
+    out = pd.DataFrame({"start": starts[keep], "end": ends[keep], "length": lengths[keep]})
+    if groups is not None:
+        out.insert(0, "group", g_labels.take(g_codes[out["start"].to_numpy()]) if len(out) else [])
+    return out
+
+
+def match_bouts(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """
+    All overlapping (a, b) bout pairs with their overlap.
+
+    `a` and `b` come from detect_bouts on the same frame (same row positions).
+    Returns a_bout, b_bout (row labels of a/b), overlap_start, overlap_end,
+    overlap (rows).
+    """
+    a_start = a["start"].to_numpy()
+    a_end = a["end"].to_numpy()
+    b_start = b["start"].to_numpy()
+    b_end = b["end"].to_numpy()
+
+    order_b = np.argsort(b_start, kind="mergesort")
+    b_start_s = b_start[order_b]
+    b_end_s = b_end[order_b]
+
+    # first B bout ending after a.start, first B bout starting at/after a.end
+    lo = np.searchsorted(b_end_s, a_start, side="right")
+    hi = np.searchsorted(b_start_s, a_end, side="left")
+    n_hits = np.maximum(hi - lo, 0)
+
+    a_pos = np.repeat(np.arange(len(a)), n_hits)
+    first = np.repeat(lo, n_hits)
+    offset = np.arange(int(n_hits.sum())) - np.repeat(np.cumsum(n_hits) - n_hits, n_hits)
+    b_pos = order_b[first + offset]
+
+    ov_start = np.maximum(a_start[a_pos], b_start[b_pos])
+    ov_end = np.minimum(a_end[a_pos], b_end[b_pos])
+    return pd.DataFrame({
+        "a_bout": a.index.to_numpy()[a_pos],
+        "b_bout": b.index.to_numpy()[b_pos],
+        "overlap_start": ov_start,
+        "overlap_end": ov_end,
+        "overlap": ov_end - ov_start,
+    })
+
+
+def bout_summary(
+    df: pd.DataFrame,
+    col_a: str,
+    col_b: str,
+    group_col: str = "ID",
+    min_duration: int = 4,
+    threshold: float = 0,
+    epoch_s: float = 1.0,
+) -> pd.DataFrame:
+    """
+    Per-group bout agreement between two columns of `df`.
+
+    Rows are taken in the frame's current order (sort by group/time first).
+    Columns: n_bouts_a/b, matched_a/b (bouts with any overlap), only_a/b,
+    overlap_s (matched overlap x epoch_s), total_a/total_b (column sums).
+    """
+    groups = df[group_col].to_numpy()
+    a = detect_bouts(df[col_a].to_numpy(), min_duration, threshold, groups)
+    b = detect_bouts(df[col_b].to_numpy(), min_duration, threshold, groups)
+    pairs = match_bouts(a, b)
+
+    a_matched = np.zeros(len(a), dtype=bool)
+    a_matched[pairs["a_bout"].to_numpy()] = True
+    b_matched = np.zeros(len(b), dtype=bool)
+    b_matched[pairs["b_bout"].to_numpy()] = True
+
+    labels = pd.unique(groups)
+    pairs_group = a["group"].to_numpy()[pairs["a_bout"].to_numpy()] if len(pairs) else np.array([])
+
+    out = pd.DataFrame({group_col: labels}).set_index(group_col)
+    out["n_bouts_a"] = a.groupby("group").size()
+    out["n_bouts_b"] = b.groupby("group").size()
+    out["matched_a"] = pd.Series(a_matched, index=a.index).groupby(a["group"]).sum()
+    out["matched_b"] = pd.Series(b_matched, index=b.index).groupby(b["group"]).sum()
+    out["overlap_s"] = pd.Series(pairs["overlap"].to_numpy() * epoch_s).groupby(pairs_group).sum()
+    out = out.fillna(0)
+    for c in ["n_bouts_a", "n_bouts_b", "matched_a", "matched_b"]:
+        out[c] = out[c].astype("int64")
+    out["only_a"] = out["n_bouts_a"] - out["matched_a"]
+    out["only_b"] = out["n_bouts_b"] - out["matched_b"]
+
+    sums = df.groupby(group_col, sort=False)[[col_a, col_b]].sum()
+    out["total_a"] = sums[col_a].round()
+    out["total_b"] = sums[col_b].round()
+    return out.reset_index()
@@ -0,0 +1,163 @@
+"""
+Shared writer/reader for pipeline exports.
+
+Exports go to a Parquet dataset partitioned by id/do_session (hive layout,
+e.g. Cameron_AM_Clean/id=2/do_session=DO1/part-0.parquet). Categorical
+columns are stored as dictionary columns and come back as categoricals.
+Readers can ask for a subset of columns and a subset of ids/sessions; only
+the matching files and column chunks are read.
+
+Paths ending in .csv keep working everywhere, so scripts can switch one
+side of a comparison at a time.
+
+Exports that are produced chunk by chunk use append_table: part 0 starts
+the export, later parts add rows (CSV) or part files (Parquet).
+"""
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+
+PARTITION_COLS = ["id", "do_session"]
+
+
+def _is_csv(path: Path) -> bool:
+    return path.suffix.lower() == ".csv"
+
+
+def _dataset(path: Path):
+    import pyarrow.dataset as ds
+
+    return ds.dataset(path, format="parquet", partitioning="hive")
+
+
+def remove_table(path: str | Path) -> None:
+    """Delete an export (CSV file or dataset directory) if it exists."""
+    path = Path(path)
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+def write_table(
+    df: pd.DataFrame,
+    path: str | Path,
+    partition_cols: list[str] | None = None,
+) -> Path:
+    """
+    Write `df` to `path`.
+
+    A .csv path writes one CSV (old behavior); anything else writes a Parquet
+    dataset partitioned by `partition_cols` (default id/do_session, using
+    whichever of them exist). Existing partitions that are rewritten are
+    replaced; others are left alone.
+    """
+    path = Path(path)
+    if _is_csv(path):
+        df.to_csv(path, index=False)
+        return path
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if partition_cols is None:
+        partition_cols = [c for c in PARTITION_COLS if c in df.columns]
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_to_dataset(
+        table,
+        root_path=str(path),
+        partition_cols=partition_cols or None,
+        existing_data_behavior="delete_matching",
+    )
+    return path
+
+
+def append_table(
+    df: pd.DataFrame,
+    path: str | Path,
+    part: int,
+    partition_cols: list[str] | None = None,
+) -> Path:
+    """
+    Write chunk number `part` of a streamed export.
+
+    Part 0 replaces whatever is at `path` (a .csv is rewritten with its
+    header, a dataset directory is cleared); later parts append rows to the
+    CSV or add one part-<part>-*.parquet file per partition. Partition
+    columns default to id/do_session as in write_table.
+    """
+    path = Path(path)
+    if _is_csv(path):
+        df.to_csv(path, index=False, mode="w" if part == 0 else "a", header=part == 0)
+        return path
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if part == 0:
+        remove_table(path)
+    if partition_cols is None:
+        partition_cols = [c for c in PARTITION_COLS if c in df.columns]
+    pq.write_to_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        root_path=str(path),
+        partition_cols=partition_cols or None,
+        basename_template=f"part-{part:05d}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return path
+
+
+def table_columns(path: str | Path) -> list[str]:
+    """Column names without loading any rows."""
+    path = Path(path)
+    if _is_csv(path):
+        return list(pd.read_csv(path, nrows=0).columns)
+    return list(_dataset(path).schema.names)
+
+
+def read_table(
+    path: str | Path,
+    columns: list[str] | None = None,
+    ids: list | None = None,
+    sessions: list | None = None,
+    id_col: str = "id",
+    session_col: str = "do_session",
+) -> pd.DataFrame:
+    """
+    Read an export, loading only `columns` and only rows for `ids`/`sessions`.
+
+    For Parquet datasets the id/session filters are pushed down to the
+    partition directories; for CSV they are applied after a usecols read.
+    """
+    path = Path(path)
+    if _is_csv(path):
+        usecols = None
+        if columns is not None:
+            usecols = list(dict.fromkeys(
+                list(columns)
+                + ([id_col] if ids is not None else [])
+                + ([session_col] if sessions is not None else [])
+            ))
+        df = pd.read_csv(path, usecols=usecols, low_memory=False)
+        if ids is not None:
+            df = df[df[id_col].isin(ids)]
+        if sessions is not None:
+            df = df[df[session_col].isin(sessions)]
+        if columns is not None:
+            df = df[list(columns)]
+        return df.reset_index(drop=True)
+
+    import pyarrow.dataset as ds
+
+    dataset = _dataset(path)
+    expr = None
+    if ids is not None:
+        expr = ds.field(id_col).isin(list(ids))
+    if sessions is not None:
+        sess = ds.field(session_col).isin(list(sessions))
+        expr = sess if expr is None else expr & sess
+    table = dataset.to_table(columns=list(columns) if columns is not None else None, filter=expr)
+    return table.to_pandas()
@@ -0,0 +1,197 @@
+"""
+Timestamp alignment for PALS (ActiGraph export) vs activPAL epoch files.
+
+Both time columns are parsed once into datetime64 with explicit formats.
+activPAL's date-less "Time(approx)" is anchored to the PALS start date
+(rolling over at midnight). The files are then joined either on rounded
+integer epochs or with merge_asof inside a tolerance, and every ID gets an
+unmatched-row report instead of silently producing 0 rows.
+
+    merged, report = align_all(pals_files, activpal_files, epoch_s=30)   # one process per pair
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from batch_runner import run_units
+
+
+PALS_TIME_FORMATS = ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S")
+ACTIVPAL_DATETIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S", "%m/%d/%Y %H:%M:%S")
+ACTIVPAL_TIME_FORMATS = ("%H:%M:%S", "%H:%M")
+
+
+def parse_with_formats(values: pd.Series, formats: tuple[str, ...]) -> pd.Series:
+    """to_datetime with each explicit format in turn, only on rows still unparsed."""
+    s = values.astype("string").str.strip()
+    out = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    todo = s.notna()
+    for fmt in formats:
+        if not todo.any():
+            break
+        parsed = pd.to_datetime(s[todo], format=fmt, errors="coerce")
+        out.loc[parsed.index] = parsed
+        todo &= out.isna()
+    return out
+
+
+def anchor_times_to_date(times: pd.Series, start_date: pd.Timestamp) -> pd.Series:
+    """
+    Date-less clock strings -> datetime64 on `start_date`, adding a day each
+    time the clock goes backwards (recording crossed midnight). Unparseable
+    rows stay NaT and are skipped: a wrap is judged against the last valid
+    clock before them.
+    """
+    tod = parse_with_formats(times, ACTIVPAL_TIME_FORMATS)
+    offset = tod - tod.dt.normalize()
+    secs = offset.dt.total_seconds()
+    wrapped = np.r_[False, np.diff(secs.ffill().to_numpy()) < 0]
+    wrapped[secs.isna().to_numpy()] = False
+    days = pd.to_timedelta(np.cumsum(wrapped), unit="D")
+    return pd.Timestamp(start_date).normalize() + offset + days
+
+
+def read_pals(path, value_col: str = "bicycling", out_col: str = "cycle_pals", scale: float = 30) -> pd.DataFrame:
+    """PALS epoch file -> time (datetime64, floored to the second), value * scale."""
+    df = pd.read_csv(path, usecols=["time", value_col])
+    df["time"] = parse_with_formats(df["time"], PALS_TIME_FORMATS).dt.floor("s")
+    df = df.rename(columns={value_col: out_col})
+    df[out_col] = df[out_col] * scale
+    return df
+
+
+def read_activpal(
+    path,
+    start_date: pd.Timestamp | None = None,
+    value_col: str = "Cycling Time (s)",
+    out_col: str = "cycle_activPal",
+) -> pd.DataFrame:
+    """
+    activPAL epoch export -> time (datetime64), value.
+
+    Full datetimes are parsed as-is; clock-only times are anchored to
+    `start_date` (normally the first PALS date).
+    """
+    df = pd.read_csv(path, sep=";", skiprows=1, usecols=["Time(approx)", value_col])
+    raw = df["Time(approx)"].astype("string").str.strip()
+    has_date = raw.str.len().gt(8).fillna(False)
+
+    time = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+    if has_date.any():
+        time.loc[has_date] = parse_with_formats(raw[has_date], ACTIVPAL_DATETIME_FORMATS)
+    if (~has_date).any():
+        if start_date is None:
+            raise ValueError(f"{path}: clock-only activPAL times need a start_date to anchor to")
+        time.loc[~has_date] = anchor_times_to_date(raw[~has_date], start_date)
+
+    return pd.DataFrame({"time": time, out_col: df[value_col]})
+
+
+def to_epoch(times: pd.Series, epoch_s: int = 30) -> pd.Series:
+    """
+    Round datetimes to the nearest `epoch_s` boundary (ties round up), on
+    integer seconds. epoch_s=30 reproduces round_time_to_30sec.
+    """
+    secs = times.to_numpy().astype("datetime64[s]").astype("int64")
+    rounded = ((secs + epoch_s // 2) // epoch_s) * epoch_s
+    out = pd.Series(rounded.astype("datetime64[s]"), index=times.index)
+    return out.where(times.notna())
+
+
+def align_pair(
+    pals_df: pd.DataFrame,
+    ap_df: pd.DataFrame,
+    epoch_s: int | None = None,
+    tolerance_s: float = 0,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Join two parsed epoch frames on time.
+
+    epoch_s set: both sides are rounded to the epoch grid and joined exactly.
+    Otherwise: merge_asof to the nearest activPAL row within tolerance_s.
+    Returns (merged rows that matched, counts dict).
+    """
+    left = pals_df.dropna(subset=["time"]).copy()
+    right = ap_df.dropna(subset=["time"]).copy()
+    if epoch_s is not None:
+        left["time"] = to_epoch(left["time"], epoch_s)
+        right["time"] = to_epoch(right["time"], epoch_s)
+
+    left = left.sort_values("time", kind="mergesort")
+    right = right.sort_values("time", kind="mergesort")
+    left["time"] = left["time"].astype("datetime64[ns]")
+    right["time"] = right["time"].astype("datetime64[ns]")
+    value_cols = [c for c in right.columns if c != "time"]
+
+    if epoch_s is not None:
+        right = right.drop_duplicates(subset=["time"], keep="first")
+        merged = left.merge(right, on="time", how="left")
+    else:
+        merged = pd.merge_asof(
+            left,
+            right,
+            on="time",
+            direction="nearest",
+            tolerance=pd.Timedelta(seconds=tolerance_s),
+        )
+
+    matched = merged[value_cols].notna().all(axis=1)
+    counts = {
+        "n_pals": len(pals_df),
+        "n_activpal": len(ap_df),
+        "pals_unparsed": int(pals_df["time"].isna().sum()),
+        "activpal_unparsed": int(ap_df["time"].isna().sum()),
+        "matched": int(matched.sum()),
+        "unmatched_pals": int((~matched).sum()),
+    }
+    return merged[matched].dropna().reset_index(drop=True), counts
+
+
+def process_pair_aligned(
+    pals_file,
+    activpal_file,
+    id_value,
+    epoch_s: int | None = None,
+    tolerance_s: float = 0,
+) -> tuple[pd.DataFrame, dict]:
+    """Drop-in for process_pair / process_pair_rounded that also reports unmatched counts."""
+    pals_df = read_pals(pals_file)
+    start = pals_df["time"].dropna().min()
+    ap_df = read_activpal(activpal_file, start_date=start)
+    merged, counts = align_pair(pals_df, ap_df, epoch_s=epoch_s, tolerance_s=tolerance_s)
+    merged["ID"] = id_value
+    counts = {"ID": id_value, **counts}
+    return merged, counts
+
+
+def align_unit(unit: dict, epoch_s: int | None = None, tolerance_s: float = 0) -> tuple[pd.DataFrame, dict]:
+    """batch_runner unit function: unit["inputs"] has "pals" and "activpal"."""
+    return process_pair_aligned(
+        unit["inputs"]["pals"], unit["inputs"]["activpal"], unit["key"], epoch_s, tolerance_s
+    )
+
+
+def align_all(
+    pals_files: dict,
+    activpal_files: dict,
+    epoch_s: int | None = None,
+    tolerance_s: float = 0,
+    max_workers: int | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Every ID present in both dicts, one process per pair; returns
+    (merged rows, per-ID report). A failing pair is reported, not raised.
+    """
+    units = [
+        {"key": id_val, "inputs": {"pals": pals_files[id_val], "activpal": activpal_files[id_val]}}
+        for id_val in sorted(set(pals_files) & set(activpal_files))
+    ]
+    merged_df, report = run_units(
+        partial(align_unit, epoch_s=epoch_s, tolerance_s=tolerance_s),
+        units,
+        max_workers=max_workers,
+        skip_up_to_date=False,
+    )
+    report = report.drop(columns=["ID"], errors="ignore").rename(columns={"key": "ID"})
+    return merged_df, report
@@ -0,0 +1,183 @@
+"""
+Chunked reader for BORIS event exports (ACT24 CSV, AM onesheet workbook).
+
+Only the declared columns are parsed, with their dtypes fixed up front;
+rows whose Event_Type is not wanted are dropped chunk by chunk; complete
+Observations come out one at a time. At a chunk boundary only the rows of
+the Observation still in progress are held back, so peak memory is the
+largest single Observation plus one chunk, not the whole study.
+
+    for obs, events in iter_observations(path, ACT24_EVENT_DTYPES):
+        ...                                            # one Observation's State start rows
+    for events in iter_observation_batches(path, ACT24_EVENT_DTYPES, max_rows=5_000):
+        ...                                            # whole Observations, ~5k rows at a time
+    events = read_events(path, ACT24_EVENT_DTYPES)     # or all of them, filtered while reading
+
+The export must list each Observation's rows together (BORIS does);
+an Observation that shows up again after it was emitted raises ValueError.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# Columns dataCleanOneChunk_ACT.ipynb uses after its column drop
+ACT24_EVENT_DTYPES = {
+    "Time_Relative_hmsf": "str",
+    "Time_Relative_hms": "str",
+    "Duration_sf": "float64",
+    "Observation": "str",
+    "Behavior": "str",
+    "Modifier_1": "str",
+    "Modifier_2": "str",
+    "Modifier_3": "str",
+    "Event_Type": "str",
+}
+
+# Columns AM_restart1.ipynb / am_behposture_profile.py carry into sec_by_sec
+AM_EVENT_DTYPES = {
+    "Date_Time_Absolute_dmy_hmsf": "object",
+    "Duration_sf": "float64",
+    "Observation": "str",
+    "Behavior": "str",
+    "Modifier_1": "str",
+    "Modifier_2": "str",
+    "Modifier_3": "str",
+    "Modifier_4": "str",
+    "Comment": "str",
+    "Event_Type": "str",
+}
+
+STATE_START = ("State start",)
+
+
+def _csv_chunks(path: Path, dtypes: dict, chunksize: int):
+    return pd.read_csv(path, usecols=list(dtypes), dtype=dtypes, chunksize=chunksize)
+
+
+def _xlsx_chunks(path: Path, dtypes: dict, chunksize: int):
+    """First sheet in read_only mode, `chunksize` rows per frame, only the declared columns."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb[wb.sheetnames[0]].iter_rows(values_only=True)
+        header = [str(h) if h is not None else "" for h in next(rows, ())]
+        missing = [c for c in dtypes if c not in header]
+        if missing:
+            raise ValueError(f"{path.name}: missing columns {missing}")
+        take = [header.index(c) for c in dtypes]
+
+        def _frame(batch):
+            out = pd.DataFrame([[r[i] if i < len(r) else None for i in take] for r in batch], columns=list(dtypes))
+            return out.astype({c: t for c, t in dtypes.items() if t != "object"})
+
+        batch = []
+        for r in rows:
+            batch.append(r)
+            if len(batch) == chunksize:
+                yield _frame(batch)
+                batch = []
+        if batch:
+            yield _frame(batch)
+    finally:
+        wb.close()
+
+
+def iter_chunks(
+    path: str | Path,
+    dtypes: dict,
+    event_types=STATE_START,
+    event_col: str = "Event_Type",
+    chunksize: int = 100_000,
+):
+    """Filtered chunks of the export (.csv via read_csv, .xlsx via openpyxl)."""
+    path = Path(path)
+    reader = _xlsx_chunks if path.suffix.lower() in (".xlsx", ".xlsm") else _csv_chunks
+    for chunk in reader(path, dtypes, chunksize):
+        if event_types is not None:
+            chunk = chunk[chunk[event_col].isin(list(event_types))]
+        if len(chunk):
+            yield chunk
+
+
+def iter_observations(
+    path: str | Path,
+    dtypes: dict = ACT24_EVENT_DTYPES,
+    event_types=STATE_START,
+    group_col: str = "Observation",
+    event_col: str = "Event_Type",
+    chunksize: int = 100_000,
+):
+    """
+    Yield (Observation, events) for each Observation, in file order, once
+    all of its rows have been read. Rows keep their file order and a
+    0-based index within the Observation; rows with no Observation are
+    dropped.
+    """
+    held = None
+    done = set()
+    for chunk in iter_chunks(path, dtypes, event_types, event_col, chunksize):
+        chunk = chunk[chunk[group_col].notna()]
+        if held is not None:
+            chunk = pd.concat([held, chunk], ignore_index=True)
+        if len(chunk) == 0:
+            continue
+        g = chunk[group_col].to_numpy(dtype=object)
+        heads = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+        bounds = np.r_[heads, len(g)]
+        # the last run may continue in the next chunk
+        for a, b in zip(bounds[:-2], bounds[1:-1]):
+            obs = g[a]
+            if obs in done:
+                raise ValueError(f"Observation {obs!r} is not contiguous in {Path(path).name}")
+            done.add(obs)
+            yield obs, chunk.iloc[a:b].reset_index(drop=True)
+        held = chunk.iloc[bounds[-2]:].reset_index(drop=True)
+
+    if held is not None and len(held):
+        obs = held[group_col].iloc[0]
+        if obs in done:
+            raise ValueError(f"Observation {obs!r} is not contiguous in {Path(path).name}")
+        yield obs, held
+
+
+def iter_observation_batches(
+    path: str | Path,
+    dtypes: dict = ACT24_EVENT_DTYPES,
+    event_types=STATE_START,
+    max_rows: int = 5_000,
+    group_col: str = "Observation",
+    event_col: str = "Event_Type",
+    chunksize: int = 100_000,
+):
+    """
+    Yield frames of whole consecutive Observations with at most `max_rows`
+    rows (or one Observation, if it alone is larger). Per-Observation
+    stages run once per batch, which keeps their fixed cost off short
+    Observations while memory stays bounded by the batch.
+    """
+    batch, n = [], 0
+    for _, events in iter_observations(path, dtypes, event_types, group_col, event_col, chunksize):
+        if batch and n + len(events) > max_rows:
+            yield pd.concat(batch, ignore_index=True)
+            batch, n = [], 0
+        batch.append(events)
+        n += len(events)
+    if batch:
+        yield pd.concat(batch, ignore_index=True)
+
+
+def read_events(
+    path: str | Path,
+    dtypes: dict = ACT24_EVENT_DTYPES,
+    event_types=STATE_START,
+    event_col: str = "Event_Type",
+    chunksize: int = 100_000,
+) -> pd.DataFrame:
+    """All wanted rows in one frame, still parsed and filtered chunk by chunk."""
+    chunks = list(iter_chunks(path, dtypes, event_types, event_col, chunksize))
+    if not chunks:
+        return pd.DataFrame({c: pd.Series(dtype=t) for c, t in dtypes.items()})
+    return pd.concat(chunks, ignore_index=True)
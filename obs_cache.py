@@ -0,0 +1,183 @@
+"""
+Incremental per-Observation recompute for the AM / ACT24 cleaners.
+
+Each Observation gets a content key: sha1 over its input event rows, any
+context rows it depends on (its do_log row(s)) and a version string (the
+source of the mapping tables and helper modules the cleaner uses). Its
+output is pickled to <cache_dir>/observation=<name>/<key>.pkl. A run
+hashes every Observation, loads the ones whose key is already on disk and
+rebuilds only the rest, a few thousand events per call, then reassembles
+the export in input order.
+
+    cache = ObservationCache(".act24_cache", source_version(taxonomy, behavior_encoder, extra="act24-1"))
+    out, report = cache.run(iter_observations(events_path), clean, context=log_rows_of)
+    report[report["status"] == "rebuilt"]
+    _, report = cache.run(iter_observations(events_path), clean, sink=write_part)  # streamed
+
+Re-exporting a few sessions, editing one log start_time or changing a
+mapping table only rebuilds what it touches (the last rebuilds all).
+"""
+import hashlib
+import inspect
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+
+def frame_digest(df: pd.DataFrame | None) -> bytes:
+    """Order-sensitive sha1 of a frame's column names, dtypes and values (not its index)."""
+    h = hashlib.sha1()
+    if df is None:
+        return h.digest()
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode("utf-8"))
+    if len(df):
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.digest()
+
+
+def source_version(*objects, extra: str = "") -> str:
+    """
+    Short hash of the given modules'/functions' source plus `extra`. Pass
+    what holds the mapping tables / helpers a cleaner uses, and bump
+    `extra` when the notebook's own cleaning code changes.
+    """
+    h = hashlib.sha1(extra.encode("utf-8"))
+    for obj in objects:
+        h.update(inspect.getsource(obj).encode("utf-8"))
+    return h.hexdigest()[:12]
+
+
+class ObservationCache:
+    """Per-Observation output frames under `cache_dir`, keyed by content + `version`."""
+
+    def __init__(self, cache_dir: str | Path, version: str = ""):
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+
+    def key(self, *frames: pd.DataFrame | None) -> str:
+        h = hashlib.sha1(self.version.encode("utf-8"))
+        for df in frames:
+            h.update(frame_digest(df))
+        return h.hexdigest()
+
+    def _dir(self, obs) -> Path:
+        return self.cache_dir / f"observation={quote(str(obs), safe='')}"
+
+    def load(self, obs, key: str) -> pd.DataFrame | None:
+        p = self._dir(obs) / f"{key}.pkl"
+        return pd.read_pickle(p) if p.exists() else None
+
+    def store(self, obs, key: str, df: pd.DataFrame) -> None:
+        """Write one Observation's output and drop its outputs for older keys."""
+        d = self._dir(obs)
+        d.mkdir(parents=True, exist_ok=True)
+        tmp = d / f"{key}.pkl.tmp"
+        df.to_pickle(tmp)
+        tmp.replace(d / f"{key}.pkl")
+        for old in d.glob("*.pkl"):
+            if old.stem != key:
+                old.unlink()
+
+    def prune(self, keep) -> int:
+        """Remove cached Observations not in `keep`; returns how many were removed."""
+        keep = {self._dir(obs).name for obs in keep}
+        removed = 0
+        if self.cache_dir.exists():
+            for d in self.cache_dir.glob("observation=*"):
+                if d.name not in keep:
+                    for p in d.iterdir():
+                        p.unlink()
+                    d.rmdir()
+                    removed += 1
+        return removed
+
+    def run(
+        self,
+        observations,
+        build,
+        context=None,
+        group_col: str = "Observation",
+        max_rows: int = 5_000,
+        prune: bool = False,
+        sink=None,
+    ) -> tuple[pd.DataFrame | None, pd.DataFrame]:
+        """
+        Output of `build` for every Observation, rebuilding only changed ones.
+
+        `observations` yields (Observation, events) (e.g.
+        event_stream.iter_observations); `context(Observation)` returns the
+        extra rows hashed with them. `build(events)` gets whole
+        Observations, up to ~`max_rows` events at a time, and must return a
+        frame with `group_col`. Returns (output in input order, report:
+        group_col, key, status cached/rebuilt, rows, seconds).
+
+        With `sink`, each Observation's non-empty output is passed to
+        sink(frame) in input order as soon as it and everything before it
+        are done, and nothing is concatenated (returns None, report): memory
+        stays at one batch of Observations. Pending rebuilds are flushed
+        before a cached Observation is queued behind them, so cached output
+        never piles up waiting for `max_rows`.
+
+        `prune=True` deletes the cache of every Observation not in this
+        run; only pass it when `observations` is the whole export.
+        """
+        order, parts, report, frames = [], {}, [], []
+        pending, pending_keys, n_pending = [], {}, 0
+        emitted = 0
+
+        def _emit():
+            nonlocal emitted
+            while emitted < len(order) and order[emitted] in parts:
+                part = parts.pop(order[emitted])
+                if sink is None:
+                    frames.append(part)
+                elif len(part):
+                    sink(part)
+                emitted += 1
+
+        def _flush():
+            nonlocal pending, pending_keys, n_pending
+            t = time.perf_counter()
+            out = build(pd.concat(pending, ignore_index=True))
+            secs = (time.perf_counter() - t) / len(pending_keys)
+            g = out[group_col].to_numpy(dtype=object)
+            for obs, idx in pd.Series(np.arange(len(out))).groupby(g, sort=False):
+                parts[obs] = out.iloc[idx.to_numpy()].reset_index(drop=True)
+            for obs, key in pending_keys.items():
+                part = parts.setdefault(obs, out.iloc[:0])
+                self.store(obs, key, part)
+                report.append((obs, key, "rebuilt", len(part), secs))
+            pending, pending_keys, n_pending = [], {}, 0
+            _emit()
+
+        for obs, events in observations:
+            key = self.key(events, context(obs) if context is not None else None)
+            order.append(obs)
+            cached = self.load(obs, key)
+            if cached is not None:
+                if pending:
+                    _flush()
+                parts[obs] = cached
+                report.append((obs, key, "cached", len(cached), 0.0))
+                _emit()
+                continue
+            if pending and n_pending + len(events) > max_rows:
+                _flush()
+            pending.append(events)
+            pending_keys[obs] = key
+            n_pending += len(events)
+        if pending:
+            _flush()
+
+        if prune:
+            self.prune(order)
+        report = pd.DataFrame(report, columns=[group_col, "key", "status", "rows", "seconds"])
+        rebuilt = int((report["status"] == "rebuilt").sum())
+        print(f"Observations: {len(order)} ({rebuilt} rebuilt, {len(order) - rebuilt} from cache)")
+        if sink is not None:
+            return None, report
+        out = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return out, report
@@ -0,0 +1,90 @@
+import pandas as pd
+import numpy as np
+
+
+def _to_epoch_seconds(values: pd.Series) -> np.ndarray:
+    """datetime64 Series -> int64 seconds since 1970 (floored)."""
+    return values.dt.floor("s").to_numpy().astype("datetime64[s]").astype("int64")
+
+
+def expand_states_to_seconds(
+    df: pd.DataFrame,
+    start_col: str = "Date_Time_Absolute_dmy_hmsf",
+    duration_col: str = "Duration_sf",
+    group_col: str = "Observation",
+    carry_cols: list[str] | None = None,
+    time_col: str = "date_time_abs",
+) -> pd.DataFrame:
+    """
+    Expand State start events to one row per second for every group in one pass.
+
+    Same rules as the per-Observation loop it replaces:
+      - event start = start_col floored to the second
+      - event end   = start + ceil(duration) (inclusive)
+      - grid per group runs from min(start) to max(end), 1s steps
+      - each second takes the LAST-starting event; if that event has already
+        ended, the second is left empty (NaN in the carry columns)
+    """
+    if carry_cols is None:
+        carry_cols = [c for c in df.columns if c != group_col]
+    carry_cols = [c for c in carry_cols if c != group_col]
+
+    work = df.loc[:, [group_col] + [c for c in dict.fromkeys([start_col, duration_col] + carry_cols) if c in df.columns]]
+    work = work.copy()
+    work[start_col] = pd.to_datetime(work[start_col], errors="coerce")
+    work = work.dropna(subset=[group_col, start_col])
+
+    out_cols = [group_col, time_col, "_sec"] + carry_cols
+    if work.empty:
+        return pd.DataFrame(columns=out_cols)
+
+    start_s = _to_epoch_seconds(work[start_col])
+    dur_s = np.ceil(pd.to_numeric(work[duration_col], errors="coerce").fillna(0.0).to_numpy()).astype("int64")
+    work["_start_s"] = start_s
+    work["_end_s"] = start_s + dur_s
+
+    # stable ordering for "latest start wins"
+    work = work.sort_values([group_col, "_start_s", start_col], kind="mergesort").reset_index(drop=True)
+    starts = work["_start_s"].to_numpy()
+    ends = work["_end_s"].to_numpy()
+
+    codes, labels = pd.factorize(work[group_col], sort=False)
+    bounds = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    n_events = np.diff(np.r_[bounds, len(work)])
+
+    g_start = starts[bounds]
+    g_end = np.maximum.reduceat(ends, bounds)
+    g_last_start = starts[bounds + n_events - 1]
+    n_sec = np.maximum(g_end - g_start + 1, 0)
+
+    # Key space per group must hold both its grid and all its event starts
+    # (negative durations can put a start after the grid end).
+    span = np.maximum(n_sec, g_last_start - g_start + 1)
+    key_base = np.r_[0, np.cumsum(span)[:-1]]
+
+    event_group = np.repeat(np.arange(len(bounds)), n_events)
+    event_key = key_base[event_group] + (starts - g_start[event_group])
+
+    grid_group = np.repeat(np.arange(len(bounds)), n_sec)
+    grid_first = np.r_[0, np.cumsum(n_sec)[:-1]]
+    sec = np.arange(int(n_sec.sum()), dtype="int64") - np.repeat(grid_first, n_sec)
+    t = g_start[grid_group] + sec
+
+    idx = np.searchsorted(event_key, key_base[grid_group] + sec, side="right") - 1
+    valid = (idx >= 0) & (t <= ends[np.maximum(idx, 0)])
+
+    res = pd.DataFrame({
+        group_col: labels.take(grid_group),
+        time_col: t.astype("datetime64[s]").astype(work[start_col].dtype),
+        "_sec": sec,
+    })
+
+    take_idx = np.maximum(idx, 0)
+    valid_s = pd.Series(valid)
+    for c in carry_cols:
+        if c not in work.columns:
+            continue
+        col = work[c].take(take_idx).reset_index(drop=True)
+        res[c] = col if valid.all() else col.where(valid_s)
+
+    return res
@@ -0,0 +1,160 @@
+"""
+One-pass QC for sec-by-sec outputs.
+
+    table, summary = validate_sec_by_sec(sec_by_sec)
+    print(summary.to_string(index=False))
+    table[~table["passed"]]
+
+Rows are put in (Observation, second) order once (skipped if they already
+are), then every check is a reduction over integer-second diffs per
+Observation (np.*.reduceat / bincount), so QC costs a few array passes
+instead of one groupby().apply per check. Replaces the integrity checks in
+am_behposture_profile.py (duplicates, _is_contig, coverage lambda,
+span-vs-count, post-ffill NaN counts).
+"""
+import numpy as np
+import pandas as pd
+
+from waves_time import parse_seconds
+
+
+CARRY_COLS = ["Behavior", "Modifier_1", "Modifier_2", "Modifier_3", "Modifier_4"]
+
+# check name -> table column that must be 0 for an Observation to pass
+ZERO_CHECKS = {
+    "missing_time": "missing_time",
+    "duplicate_seconds": "duplicates",
+    "gaps": "gaps",
+    "span_mismatch": "n_minus_span",
+    "negative_rel_time": "negative_rel",
+}
+
+
+def _seconds(df: pd.DataFrame, time_col: str | None, sec_col: str | None) -> tuple[np.ndarray, np.ndarray]:
+    """(int64 seconds, valid mask) from an integer second column or a datetime column."""
+    if sec_col is not None:
+        s = pd.to_numeric(df[sec_col], errors="coerce").to_numpy(dtype="float64")
+        valid = ~np.isnan(s)
+        return np.where(valid, np.floor(s), 0).astype(np.int64), valid
+    t = pd.to_datetime(df[time_col], errors="coerce")
+    if t.dt.tz is not None:
+        # tz-aware values have no numpy datetime64 form; count seconds in UTC
+        t = t.dt.tz_convert(None)
+    valid = t.notna().to_numpy()
+    return t.to_numpy().astype("datetime64[s]").astype(np.int64), valid
+
+
+def validate_sec_by_sec(
+    df: pd.DataFrame,
+    group_col: str = "Observation",
+    time_col: str = "date_time_abs",
+    sec_col: str | None = None,
+    label_col: str | None = "Behavior",
+    ffill_cols: list[str] | None = None,
+    rel_col: str | None = None,
+    min_coverage: float = 0.0,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Per-Observation QC table and a pass/fail summary.
+
+    Time comes from `sec_col` (integer seconds, e.g. ACT24 "_second") or
+    else `time_col` (datetimes). Table columns:
+      rows, first_s, last_s, span_s (last - first + 1), n_minus_span,
+      duplicates (repeated seconds), gaps (jumps > 1 s), missing_seconds
+      (seconds inside those jumps), missing_time (rows with no time),
+      coverage (share of rows with `label_col`), negative_rel (rows with
+      `rel_col` < 0, numeric or a waves_time.parse_seconds string such as
+      "-00:00:05"; default `sec_col`, else "_sec" if present),
+      nan_after_ffill_<col> (rows still NaN after a per-Observation ffill,
+      i.e. before the column's first value; default CARRY_COLS present),
+      passed.
+    An Observation passes when all ZERO_CHECKS are 0 and coverage >= min_coverage.
+    """
+    if ffill_cols is None:
+        ffill_cols = [c for c in CARRY_COLS if c in df.columns]
+    if rel_col is None:
+        rel_col = sec_col if sec_col is not None else ("_sec" if "_sec" in df.columns else None)
+
+    gcode, glabels = pd.factorize(df[group_col], sort=False)
+    sec, has_time = _seconds(df, time_col, sec_col)
+    keep = gcode >= 0
+    n_groups = len(glabels)
+
+    missing_time = np.bincount(gcode[keep & ~has_time], minlength=n_groups)
+    order = np.flatnonzero(keep & has_time)
+    g, s = gcode[order], sec[order]
+    if len(order) > 1 and not np.all((np.diff(g) > 0) | ((np.diff(g) == 0) & (np.diff(s) >= 0))):
+        o = np.lexsort((s, g))
+        order, g, s = order[o], g[o], s[o]
+
+    rows = np.bincount(g, minlength=n_groups)
+    present = rows > 0
+    g_first = np.cumsum(rows) - rows
+    starts = g_first[present]
+
+    # diffs that stay inside one Observation
+    d = np.diff(s)
+    same = g[1:] == g[:-1]
+    dup_at = np.r_[False, same & (d == 0)]
+    gap_at = np.r_[False, same & (d > 1)]
+    missing_at = np.r_[0, np.where(same & (d > 1), d - 1, 0)]
+
+    def _per_group(values, ufunc=np.add, fill=0):
+        out = np.full(n_groups, fill, dtype=np.asarray(values).dtype if len(values) else np.int64)
+        if len(values):
+            out[present] = ufunc.reduceat(values, starts)
+        return out
+
+    first_s = _per_group(s, np.minimum)
+    last_s = _per_group(s, np.maximum)
+    span = np.where(present, last_s - first_s + 1, 0)
+
+    table = pd.DataFrame({
+        group_col: glabels,
+        "rows": rows,
+        "first_s": first_s,
+        "last_s": last_s,
+        "span_s": span,
+        "n_minus_span": rows - span,
+        "duplicates": _per_group(dup_at.astype(np.int64)),
+        "gaps": _per_group(gap_at.astype(np.int64)),
+        "missing_seconds": _per_group(missing_at.astype(np.int64)),
+        "missing_time": missing_time,
+    })
+
+    if label_col is not None and label_col in df.columns:
+        labelled = df[label_col].notna().to_numpy()[order].astype(np.int64)
+        table["coverage"] = np.where(present, _per_group(labelled) / np.maximum(rows, 1), np.nan)
+    else:
+        table["coverage"] = np.nan
+
+    if rel_col is not None and rel_col in df.columns:
+        rel = parse_seconds(df[rel_col])[order]
+        table["negative_rel"] = _per_group((rel < 0).astype(np.int64))
+    else:
+        table["negative_rel"] = 0
+
+    # NaN left after a per-Observation ffill = rows before the first non-null value
+    pos = np.arange(len(order), dtype=np.int64)
+    for c in ffill_cols:
+        first_valid = np.where(df[c].notna().to_numpy()[order], pos, len(order))
+        lead = _per_group(first_valid, np.minimum, fill=len(order))
+        table[f"nan_after_ffill_{c}"] = np.minimum(lead, g_first + rows) - g_first
+
+    passed = np.ones(n_groups, dtype=bool)
+    for col in ZERO_CHECKS.values():
+        passed &= table[col].to_numpy() == 0
+    if min_coverage > 0:
+        passed &= table["coverage"].fillna(0).to_numpy() >= min_coverage
+    table["passed"] = passed
+
+    checks = {name: table[col].to_numpy() != 0 for name, col in ZERO_CHECKS.items()}
+    if min_coverage > 0:
+        checks["coverage"] = table["coverage"].fillna(0).to_numpy() < min_coverage
+    summary = pd.DataFrame({
+        "check": list(checks),
+        "failing_observations": [int(bad.sum()) for bad in checks.values()],
+        "total": [int(table[ZERO_CHECKS[k]].abs().sum()) if k in ZERO_CHECKS else np.nan for k in checks],
+    })
+    summary["passed"] = summary["failing_observations"] == 0
+    return table, summary
@@ -0,0 +1,311 @@
+"""
+Opt-in compact schema for sec-by-sec frames.
+
+A compact frame stores time as int32 seconds since the start of its
+Observation (column "_sec") plus a small per-Observation base table, and
+every label column as a pd.Categorical sharing one dictionary per column.
+Build the dictionaries once per run with build_label_dtypes() and pass them
+to every stage so codes stay comparable across Observations and files. A
+value missing from a dictionary raises ValueError rather than becoming NaN;
+extend_label_dtypes() appends a later file's new values without moving the
+existing codes.
+
+    dtypes = build_label_dtypes(sec_by_sec)
+    dtypes = extend_label_dtypes(dtypes, next_file)    # before to_compact(next_file, dtypes=dtypes)
+    compact, bases = to_compact(sec_by_sec, dtypes=dtypes)
+    compact = ffill_compact(compact, ["Behavior", "Modifier_1"])
+    compact = add_domains_compact(compact, dtypes)
+    write_compact_csv(compact, bases, "Cameron_AM_Clean.csv")
+
+AM_restart1.ipynb (COMPACT = True) and am_behposture_profile.py --compact
+use it.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from taxonomy import activity_domain_map, activity_map, posture_domain_map, posture_map
+
+
+LABEL_COLUMNS = [
+    "Observation",
+    "Behavior",
+    "Modifier_1",
+    "Modifier_2",
+    "Modifier_3",
+    "Modifier_4",
+    "Comment",
+    "Activity_Type",
+    "posture_wbm",
+    "broad_domain",
+    "waves_domain",
+    "posture_broad",
+    "posture_waves",
+]
+
+SEC_COL = "_sec"
+BASE_COL = "base_epoch_s"
+
+
+def _uniq(values) -> list[str]:
+    return list(dict.fromkeys(str(v) for v in values if not pd.isna(v)))
+
+
+def build_label_dtypes(data: pd.DataFrame | None = None) -> dict[str, pd.CategoricalDtype]:
+    """
+    One CategoricalDtype per label column, seeded from the taxonomy vocabularies.
+
+    If `data` is given, values seen there (raw Behavior spellings, modifiers,
+    comments, Observation names) are appended after the taxonomy entries.
+    """
+    vocab: dict[str, list] = {c: [] for c in LABEL_COLUMNS}
+    vocab["Behavior"] = list(activity_map) + list(posture_map)
+    vocab["Activity_Type"] = list(activity_map.values()) + list(activity_domain_map)
+    vocab["posture_wbm"] = list(posture_map.values()) + list(posture_domain_map)
+    vocab["broad_domain"] = [v[0] for v in activity_domain_map.values()]
+    vocab["waves_domain"] = [v[1] for v in activity_domain_map.values()]
+    vocab["posture_broad"] = [v[0] for v in posture_domain_map.values()]
+    vocab["posture_waves"] = [v[1] for v in posture_domain_map.values()] + ["sed_drive"]
+
+    if data is not None:
+        for c in LABEL_COLUMNS:
+            if c in data.columns:
+                col = data[c]
+                seen = col.cat.categories if isinstance(col.dtype, pd.CategoricalDtype) else col.unique()
+                vocab[c] += _uniq(seen)
+
+    return {c: pd.CategoricalDtype(_uniq(v)) for c, v in vocab.items()}
+
+
+def extend_label_dtypes(
+    dtypes: dict[str, pd.CategoricalDtype],
+    data: pd.DataFrame,
+) -> dict[str, pd.CategoricalDtype]:
+    """Append values of `data` missing from `dtypes` after the existing categories (existing codes keep their meaning)."""
+    out = dict(dtypes)
+    for c, dtype in dtypes.items():
+        if c in data.columns:
+            col = data[c]
+            seen = col.cat.categories if isinstance(col.dtype, pd.CategoricalDtype) else col.unique()
+            new = [v for v in _uniq(seen) if v not in set(dtype.categories)]
+            if new:
+                out[c] = pd.CategoricalDtype(list(dtype.categories) + new)
+    return out
+
+
+def _check_categories(values: pd.Series, dtype: pd.CategoricalDtype, name: str) -> None:
+    """ValueError if a non-null value is not in `dtype` (astype would turn it into NaN)."""
+    missing = values.dropna()
+    missing = missing[~missing.isin(dtype.categories)].unique()
+    if len(missing):
+        shown = ", ".join(repr(v) for v in missing[:5]) + (", ..." if len(missing) > 5 else "")
+        raise ValueError(
+            f"{name}: {len(missing)} value(s) not in its categories ({shown}); "
+            "build the dtypes from this data or use extend_label_dtypes()"
+        )
+
+
+def to_compact(
+    df: pd.DataFrame,
+    group_col: str = "Observation",
+    time_col: str | None = "date_time_abs",
+    sec_col: str | None = None,
+    dtypes: dict[str, pd.CategoricalDtype] | None = None,
+    base_times: pd.Series | dict | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Convert a sec-by-sec frame to the compact schema.
+
+    Either `time_col` (absolute datetimes; the base table keeps each group's
+    first second) or `sec_col` (already-relative integer seconds, e.g. the
+    ACT24 `_second`) supplies the time axis. With `sec_col` the absolute
+    start of each group is not in the data: pass it as `base_times`
+    (group -> datetime, e.g. the log start_time), otherwise the bases stay
+    missing and from_compact refuses to invent one. Returns (compact,
+    bases). Raises ValueError on missing times/seconds and on label values
+    outside `dtypes`.
+    """
+    if dtypes is None:
+        dtypes = build_label_dtypes(df)
+
+    out = df.copy()
+    if sec_col is not None:
+        sec = pd.to_numeric(out[sec_col], errors="coerce")
+        if sec.isna().any():
+            bad = out.loc[sec.isna(), sec_col]
+            raise ValueError(f"{sec_col}: {len(bad)} row(s) without integer seconds (first: {bad.iloc[0]!r})")
+        out[SEC_COL] = sec.astype("int32")
+        groups = out[group_col].drop_duplicates().to_numpy()
+        base = pd.Series(pd.NA, index=range(len(groups)), dtype="Int64")
+        if base_times is not None:
+            t = pd.to_datetime(pd.Series(groups).map(base_times))
+            base = base.mask(t.notna(), pd.Series(t.to_numpy().astype("datetime64[s]").astype("int64")))
+        bases = pd.DataFrame({group_col: groups, BASE_COL: base})
+        if sec_col != SEC_COL:
+            out = out.drop(columns=[sec_col])
+    else:
+        t = pd.to_datetime(out[time_col])
+        if t.isna().any():
+            raise ValueError(f"{time_col}: {int(t.isna().sum())} row(s) without a time")
+        epoch = t.to_numpy().astype("datetime64[s]").astype("int64")
+        base = pd.Series(epoch, index=out.index).groupby(out[group_col], sort=False).transform("min")
+        out[SEC_COL] = (epoch - base.to_numpy()).astype("int32")
+        bases = (
+            pd.DataFrame({group_col: out[group_col].to_numpy(), BASE_COL: base.to_numpy()})
+            .drop_duplicates(subset=[group_col])
+            .reset_index(drop=True)
+        )
+        out = out.drop(columns=[time_col])
+
+    for c, dtype in dtypes.items():
+        if c in out.columns:
+            values = out[c].astype("string")
+            _check_categories(values, dtype, c)
+            out[c] = values.astype(dtype)
+
+    if group_col in dtypes:
+        bases[group_col] = bases[group_col].astype(dtypes[group_col])
+    return out, bases
+
+
+def from_compact(
+    compact: pd.DataFrame,
+    bases: pd.DataFrame,
+    group_col: str = "Observation",
+    time_col: str = "date_time_abs",
+) -> pd.DataFrame:
+    """
+    Inverse of to_compact: rebuild the absolute datetime column (labels stay categorical).
+
+    Raises ValueError for groups without a base time (relative-only frames
+    built from `sec_col` without `base_times`).
+    """
+    out = compact.copy()
+    base = out[group_col].map(bases.set_index(group_col)[BASE_COL])
+    if base.isna().any():
+        missing = pd.unique(out.loc[base.isna().to_numpy(), group_col])
+        raise ValueError(
+            f"no base time for {len(missing)} {group_col}(s) (first: {missing[0]!r}); "
+            "pass base_times to to_compact"
+        )
+    base = base.to_numpy().astype("int64")
+    out.insert(1, time_col, (base + out[SEC_COL].to_numpy().astype("int64")).astype("datetime64[s]"))
+    return out
+
+
+def ffill_compact(compact: pd.DataFrame, cols: list[str], group_col: str = "Observation") -> pd.DataFrame:
+    """
+    Forward-fill categorical columns within each group, working on the codes.
+
+    Rows must be ordered by (group, _sec); they are re-sorted if not.
+    """
+    g_codes = pd.factorize(compact[group_col], sort=False)[0]
+    sec = compact[SEC_COL].to_numpy()
+    dg = np.diff(g_codes)
+    if np.all((dg > 0) | ((dg == 0) & (np.diff(sec) >= 0))):
+        out = compact.copy()
+    else:
+        order = np.lexsort((sec, g_codes))
+        out = compact.iloc[order].reset_index(drop=True)
+        g_codes = g_codes[order]
+
+    pos = np.arange(len(out))
+    g_first = np.r_[True, g_codes[1:] != g_codes[:-1]][: len(out)]
+    first_pos = np.maximum.accumulate(np.where(g_first, pos, 0)) if len(out) else pos
+
+    for c in cols:
+        if c not in out.columns:
+            continue
+        codes = out[c].cat.codes.to_numpy()
+        last = np.maximum.accumulate(np.where(codes >= 0, pos, -1))
+        src = np.where(last >= first_pos, last, -1)
+        filled = np.where(src >= 0, codes[np.maximum(src, 0)], -1)
+        out[c] = pd.Categorical.from_codes(filled, dtype=out[c].dtype)
+    return out
+
+
+def recode_compact(compact: pd.DataFrame, dtypes: dict[str, pd.CategoricalDtype]) -> pd.DataFrame:
+    """
+    Move label columns built with other dictionaries (e.g. cached parts of an
+    earlier run) onto `dtypes`, so frames concatenate without falling back to
+    object. Raises ValueError on a used value outside `dtypes`.
+    """
+    out = compact.copy()
+    for c, dtype in dtypes.items():
+        if c in out.columns and out[c].dtype != dtype:
+            col = out[c].astype("category")
+            used = pd.Series(col.cat.remove_unused_categories().cat.categories, dtype=object)
+            _check_categories(used, dtype, c)
+            out[c] = col.cat.set_categories(dtype.categories)
+    return out
+
+
+def map_categorical(
+    series: pd.Series,
+    mapping: dict,
+    dtype: pd.CategoricalDtype,
+) -> pd.Series:
+    """
+    Map a categorical through `mapping` by translating its categories (one lookup per category).
+
+    Categories mapped to a value outside `dtype` raise ValueError; unmapped
+    categories become NaN.
+    """
+    mapped = pd.Series([mapping.get(cat) for cat in series.cat.categories], dtype=object)
+    _check_categories(mapped, dtype, series.name or "mapped")
+    target = {v: i for i, v in enumerate(dtype.categories)}
+    lookup = np.array(
+        [target.get(mapping.get(cat), -1) for cat in series.cat.categories] + [-1],
+        dtype="int64",
+    )
+    codes = series.cat.codes.to_numpy()
+    return pd.Series(
+        pd.Categorical.from_codes(lookup[codes], dtype=dtype),
+        index=series.index,
+        name=series.name,
+    )
+
+
+def add_domains_compact(compact: pd.DataFrame, dtypes: dict[str, pd.CategoricalDtype]) -> pd.DataFrame:
+    """broad_domain/waves_domain and posture_broad/posture_waves on a compact frame, incl. the sitting override."""
+    out = compact.copy()
+    if "Activity_Type" in out.columns:
+        at = out["Activity_Type"]
+        out["broad_domain"] = map_categorical(at, {k: v[0] for k, v in activity_domain_map.items()}, dtypes["broad_domain"])
+        out["waves_domain"] = map_categorical(at, {k: v[1] for k, v in activity_domain_map.items()}, dtypes["waves_domain"])
+    if "posture_wbm" in out.columns:
+        pw = out["posture_wbm"]
+        out["posture_broad"] = map_categorical(pw, {k: v[0] for k, v in posture_domain_map.items()}, dtypes["posture_broad"])
+        out["posture_waves"] = map_categorical(pw, {k: v[1] for k, v in posture_domain_map.items()}, dtypes["posture_waves"])
+
+        # Sitting rule override for posture_waves
+        if "Activity_Type" in out.columns:
+            is_sitting = pw.eq("sitting").to_numpy()
+            trav = out["Activity_Type"].isin(["trav_drive", "trav_pass"]).to_numpy()
+            cats = list(dtypes["posture_waves"].categories)
+            codes = out["posture_waves"].cat.codes.to_numpy().copy()
+            codes[is_sitting & trav] = cats.index("sed_drive")
+            codes[is_sitting & ~trav] = cats.index("sedentary")
+            out["posture_waves"] = pd.Categorical.from_codes(codes, dtype=dtypes["posture_waves"])
+    return out
+
+
+def write_compact_csv(
+    compact: pd.DataFrame,
+    bases: pd.DataFrame,
+    path: str | Path,
+    group_col: str = "Observation",
+    time_col: str = "date_time",
+    chunk_rows: int = 500_000,
+    keep_sec: bool = False,
+) -> None:
+    """Write a compact frame as a regular CSV, decoding times chunk by chunk."""
+    path = Path(path)
+    base_lookup = bases.set_index(group_col)[BASE_COL]
+    for i, start in enumerate(range(0, max(len(compact), 1), chunk_rows)):
+        chunk = compact.iloc[start:start + chunk_rows]
+        chunk = from_compact(chunk, base_lookup.reset_index(), group_col=group_col, time_col=time_col)
+        if not keep_sec:
+            chunk = chunk.drop(columns=[SEC_COL])
+        chunk.to_csv(path, index=False, mode="w" if i == 0 else "a", header=i == 0)
@@ -0,0 +1,150 @@
+"""
+Per-session time spans for sec-by-sec sources (GT, steps, AM clean, ACT24).
+
+    gt_cat = SessionCatalog.from_frame(ground_truth, keys=["id", "observation"])
+    steps_cat = SessionCatalog.from_frame(seconds, keys=["id", "observation"])
+    info = gt_cat.overlap(steps_cat, suffixes=("_GT", "_secondsFile"))
+    offsets = clock_offsets(info["start_diff_s"])                   # 12 h AM/PM slips
+    seconds["date_time"] = steps_cat.shift_times(seconds, offsets_for(info, steps_cat, offsets))
+    inside = in_window(merged, info, keys=["id", "observation"])    # max_start <= t <= min_end
+
+One groupby min/max/size builds the catalog. Every per-row step afterwards
+(shifting, trimming) is an index lookup of the row's session plus array
+arithmetic. Replaces start_end/start_time_dataframe (a full-frame filter
+per session) and the row-wise flag_military in (1-2) merge_behavior_steps.
+"""
+import numpy as np
+import pandas as pd
+
+
+HALF_DAY_S = 12 * 3600
+
+
+def _key_index(df: pd.DataFrame, keys: list[str]) -> pd.MultiIndex | pd.Index:
+    return pd.MultiIndex.from_frame(df[keys]) if len(keys) > 1 else pd.Index(df[keys[0]])
+
+
+def _session_rows(df: pd.DataFrame, index: pd.MultiIndex | pd.Index, keys: list[str]) -> np.ndarray:
+    """Position in `index` of each df row's session, -1 if it has none."""
+    return index.get_indexer(_key_index(df, keys))
+
+
+class SessionCatalog:
+    """
+    One row per session: keys, start, end, rows, duration_s
+    (end - start in seconds). `.spans` is the table.
+    """
+
+    def __init__(self, spans: pd.DataFrame, keys: list[str]):
+        self.keys = list(keys)
+        self.spans = spans.reset_index(drop=True)
+        self.index = _key_index(self.spans, self.keys)
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        keys: list[str] = ("id", "observation"),
+        time_col: str = "date_time",
+    ) -> "SessionCatalog":
+        keys = list(keys)
+        t = pd.to_datetime(df[time_col], errors="coerce")
+        g = t.groupby([df[k] for k in keys], sort=True)
+        spans = pd.DataFrame({"start": g.min(), "end": g.max(), "rows": g.size()}).reset_index()
+        spans.columns = keys + ["start", "end", "rows"]
+        spans["duration_s"] = (spans["end"] - spans["start"]).dt.total_seconds()
+        return cls(spans, keys)
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def rows_of(self, df: pd.DataFrame) -> np.ndarray:
+        """Catalog row of each df row's session (-1 where the session is not catalogued)."""
+        return _session_rows(df, self.index, self.keys)
+
+    def overlap(self, other: "SessionCatalog", suffixes: tuple[str, str] = ("_a", "_b")) -> pd.DataFrame:
+        """
+        Outer join of two catalogs on the session keys:
+        start/end<suffix> per side, start_diff_s / end_diff_s (self - other),
+        and the common window max_start / min_end (the present side's
+        start/end when the other side has no such session, as in (1-2)).
+        """
+        a, b = suffixes
+        left = self.spans[self.keys + ["start", "end"]].rename(columns={"start": f"start{a}", "end": f"end{a}"})
+        right = other.spans[self.keys + ["start", "end"]].rename(columns={"start": f"start{b}", "end": f"end{b}"})
+        out = left.merge(right, on=self.keys, how="outer", sort=True)
+        out["start_diff_s"] = (out[f"start{a}"] - out[f"start{b}"]).dt.total_seconds()
+        out["end_diff_s"] = (out[f"end{a}"] - out[f"end{b}"]).dt.total_seconds()
+        out["max_start"] = out[[f"start{a}", f"start{b}"]].max(axis=1)
+        out["min_end"] = out[[f"end{a}", f"end{b}"]].min(axis=1)
+        return out
+
+    def shift_times(self, df: pd.DataFrame, offsets_s, time_col: str = "date_time") -> pd.Series:
+        """
+        df[time_col] moved by the per-session offset (seconds, aligned with
+        .spans rows); rows of uncatalogued sessions are left as they are.
+        """
+        rows = self.rows_of(df)
+        offsets_s = np.asarray(offsets_s, dtype="float64")
+        per_row = np.where(rows >= 0, offsets_s[np.maximum(rows, 0)], 0.0)
+        per_row = np.nan_to_num(per_row)
+        return pd.to_datetime(df[time_col]) + pd.to_timedelta(per_row, unit="s")
+
+    def shifted(self, offsets_s) -> "SessionCatalog":
+        """A catalog with every session's start/end moved by its offset (seconds)."""
+        delta = pd.to_timedelta(np.nan_to_num(np.asarray(offsets_s, dtype="float64")), unit="s")
+        spans = self.spans.copy()
+        spans["start"] = spans["start"] + delta
+        spans["end"] = spans["end"] + delta
+        return SessionCatalog(spans, self.keys)
+
+
+def clock_offsets(
+    diff_s,
+    threshold_s: float = 40000,
+    step_s: float = HALF_DAY_S,
+    symmetric: bool = False,
+) -> np.ndarray:
+    """
+    Offset (seconds) to add to the later-listed side of an overlap so its
+    clock matches: +step_s where diff_s > threshold_s (the old
+    flag_military rule), else 0. symmetric=True also gives -step_s where
+    diff_s < -threshold_s (a slip the other way); flag_military never
+    shifted those, so it is opt-in.
+    """
+    d = np.asarray(diff_s, dtype="float64")
+    with np.errstate(invalid="ignore"):
+        out = np.where(d > threshold_s, step_s, 0.0)
+        if symmetric:
+            out = np.where(d < -threshold_s, -step_s, out)
+    return out
+
+
+def offsets_for(overlap: pd.DataFrame, catalog: SessionCatalog, offsets_s) -> np.ndarray:
+    """Re-align per-session offsets computed on an overlap table to `catalog.spans` rows."""
+    pos = _session_rows(catalog.spans, _key_index(overlap, catalog.keys), catalog.keys)
+    offsets_s = np.asarray(offsets_s, dtype="float64")
+    return np.where(pos >= 0, offsets_s[np.maximum(pos, 0)], 0.0)
+
+
+def in_window(
+    df: pd.DataFrame,
+    windows: pd.DataFrame,
+    keys: list[str] = ("id", "observation"),
+    time_col: str = "date_time",
+    start_col: str = "max_start",
+    end_col: str = "min_end",
+) -> np.ndarray:
+    """
+    Bool mask: df row's time within [start_col, end_col] of its session in
+    `windows` (e.g. an overlap table). Rows of sessions missing from
+    `windows` are False.
+    """
+    keys = list(keys)
+    rows = _session_rows(df, _key_index(windows, keys), keys)
+    t = pd.to_datetime(df[time_col]).to_numpy()
+    lo = windows[start_col].to_numpy(dtype="datetime64[ns]")
+    hi = windows[end_col].to_numpy(dtype="datetime64[ns]")
+    r = np.maximum(rows, 0)
+    with np.errstate(invalid="ignore"):
+        return (rows >= 0) & (t >= lo[r]) & (t <= hi[r])
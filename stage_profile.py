@@ -0,0 +1,287 @@
+"""
+Per-stage wall time, memory and row/byte counts for the pipelines.
+
+    profiler = StageProfiler("am")
+    with profiler.stage("expand", events) as st:       # rows/bytes in from `events`
+        sec_by_sec = expand_states_to_seconds(events)
+        st.output(sec_by_sec)                          # rows/bytes out
+    profiler.write("am_profile.json")                  # or .csv
+
+Notebook cells can't share a `with` block, so the same thing is
+profiler.start("expand", events) at the top of a cell and
+profiler.stop(sec_by_sec) at the bottom. @profiler.timed("encode") wraps
+a function (rows in from its first argument, out from its return value).
+A stage run once per batch (a timed function, or start/stop inside a
+per-Observation cleaner) records every call; totals() and summary() add
+them up per stage name, so a streamed pipeline still reports which of
+its stages the time went to.
+
+Each stage records wall_s, cpu_s, process RSS before/after, the process
+peak RSS and how much the stage raised it, the tracemalloc peak above
+the stage's starting level (trace_memory=True; slows allocation-heavy
+code), and rows_in/bytes_in/rows_out/bytes_out. A path as output counts
+the file (or dataset folder) size. Sizes are measured outside the timed
+window. StageProfiler(enabled=False) records nothing and costs nothing,
+so the calls can stay in place.
+"""
+import functools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+_MB = 1024 * 1024
+
+REPORT_COLUMNS = [
+    "pipeline", "stage", "started_s", "wall_s", "cpu_s",
+    "rss_before_mb", "rss_after_mb", "rss_peak_mb", "rss_peak_growth_mb", "traced_peak_mb",
+    "rows_in", "bytes_in", "rows_out", "bytes_out",
+]
+
+
+def _rss_mb() -> tuple[float, float]:
+    """(current RSS, process peak RSS) in MB; NaN where the platform can't tell."""
+    current = peak = np.nan
+    try:
+        import psutil
+
+        info = psutil.Process().memory_info()
+        current = info.rss / _MB
+        if hasattr(info, "peak_wset"):  # Windows
+            peak = info.peak_wset / _MB
+    except ImportError:
+        try:
+            with open("/proc/self/statm") as f:
+                current = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / _MB
+        except (OSError, ValueError, AttributeError):
+            pass
+    if np.isnan(peak):
+        try:
+            import resource
+
+            # ru_maxrss is KB on Linux, bytes on macOS
+            scale = 1 if sys.platform == "darwin" else 1024
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / _MB
+        except ImportError:
+            pass
+    return current, peak
+
+
+def _path_bytes(path: Path) -> int:
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return path.stat().st_size if path.exists() else 0
+
+
+def measure(obj, deep: bool = True) -> tuple[float, float]:
+    """
+    (rows, bytes) of a stage input/output: DataFrame/Series (memory_usage,
+    deep counts string contents), ndarray, a path (size on disk, rows NaN),
+    or a list/tuple/dict of those (summed). None -> (NaN, NaN).
+    """
+    if obj is None:
+        return np.nan, np.nan
+    if isinstance(obj, pd.DataFrame):
+        return len(obj), int(obj.memory_usage(index=True, deep=deep).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return len(obj), int(obj.memory_usage(deep=deep))
+    if isinstance(obj, np.ndarray):
+        return len(obj), int(obj.nbytes)
+    if isinstance(obj, (str, Path)):
+        return np.nan, _path_bytes(Path(obj))
+    if isinstance(obj, dict):
+        obj = list(obj.values())
+    if isinstance(obj, (list, tuple)):
+        sizes = [measure(o, deep) for o in obj]
+        rows = [r for r, _ in sizes if not np.isnan(r)]
+        nbytes = [b for _, b in sizes if not np.isnan(b)]
+        return (sum(rows) if rows else np.nan), (sum(nbytes) if nbytes else np.nan)
+    return np.nan, np.nan
+
+
+class _Stage:
+    __slots__ = ("outputs",)
+
+    def __init__(self):
+        self.outputs = None
+
+    def output(self, *objs) -> None:
+        self.outputs = objs[0] if len(objs) == 1 else list(objs)
+
+
+class StageProfiler:
+    """Stage records for one pipeline run; see the module docstring."""
+
+    def __init__(self, pipeline: str, enabled: bool = True, trace_memory: bool = False, deep: bool = True):
+        self.pipeline = pipeline
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.deep = deep
+        self.records: list[dict] = []
+        self._open: list[dict] = []
+        self._t0 = time.perf_counter()
+        if enabled and trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def start(self, stage: str, inputs=None) -> None:
+        if not self.enabled:
+            return
+        rows_in, bytes_in = measure(inputs, self.deep)
+        traced = np.nan
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open:
+                # keep the enclosing stage's peak before resetting it for this one
+                self._open[-1]["_traced_peak"] = max(self._open[-1]["_traced_peak"], peak)
+            tracemalloc.reset_peak()
+            traced = current
+        rss, rss_peak = _rss_mb()
+        self._open.append({
+            "pipeline": self.pipeline,
+            "stage": stage,
+            "rows_in": rows_in,
+            "bytes_in": bytes_in,
+            "rss_before_mb": rss,
+            "_rss_peak_before": rss_peak,
+            "_traced_start": traced,
+            "_traced_peak": traced,
+            "_wall": time.perf_counter(),
+            "_cpu": time.process_time(),
+        })
+
+    def stop(self, outputs=None) -> dict | None:
+        """Close the most recently started stage; returns its record."""
+        if not self.enabled:
+            return None
+        if not self._open:
+            raise RuntimeError("StageProfiler.stop() without a matching start()")
+        wall, cpu = time.perf_counter(), time.process_time()
+        rec = self._open.pop()
+        traced_peak = np.nan
+        if self.trace_memory and tracemalloc.is_tracing():
+            peak = max(rec["_traced_peak"], tracemalloc.get_traced_memory()[1])
+            traced_peak = (peak - rec["_traced_start"]) / _MB
+            if self._open:
+                self._open[-1]["_traced_peak"] = max(self._open[-1]["_traced_peak"], peak)
+        rss, rss_peak = _rss_mb()
+        rows_out, bytes_out = measure(outputs, self.deep)
+
+        out = {
+            "pipeline": rec["pipeline"],
+            "stage": rec["stage"],
+            "started_s": rec["_wall"] - self._t0,
+            "wall_s": wall - rec["_wall"],
+            "cpu_s": cpu - rec["_cpu"],
+            "rss_before_mb": rec["rss_before_mb"],
+            "rss_after_mb": rss,
+            "rss_peak_mb": rss_peak,
+            "rss_peak_growth_mb": rss_peak - rec["_rss_peak_before"],
+            "traced_peak_mb": traced_peak,
+            "rows_in": rec["rows_in"],
+            "bytes_in": rec["bytes_in"],
+            "rows_out": rows_out,
+            "bytes_out": bytes_out,
+        }
+        self.records.append(out)
+        return out
+
+    @contextmanager
+    def stage(self, stage: str, inputs=None):
+        """`with profiler.stage(name, inputs) as st: ...; st.output(result)`."""
+        st = _Stage()
+        self.start(stage, inputs)
+        try:
+            yield st
+        finally:
+            self.stop(st.outputs)
+
+    def timed(self, stage: str):
+        """Decorator: rows in from the first argument, out from the return value (first item of a tuple)."""
+        def wrap(func):
+            @functools.wraps(func)
+            def inner(*args, **kwargs):
+                self.start(stage, args[0] if args else None)
+                result = None
+                try:
+                    result = func(*args, **kwargs)
+                    return result
+                finally:
+                    self.stop(result[0] if isinstance(result, tuple) else result)
+            return inner
+        return wrap
+
+    def report(self) -> pd.DataFrame:
+        """One row per finished stage, in the order they finished."""
+        rep = pd.DataFrame(self.records, columns=REPORT_COLUMNS)
+        counts = ["rows_in", "bytes_in", "rows_out", "bytes_out"]
+        rep[counts] = rep[counts].astype("Int64")
+        return rep
+
+    def totals(self) -> pd.DataFrame:
+        """
+        One row per stage name, in order of first start: calls, summed
+        wall/cpu time, RSS peak growth and rows/bytes, the last RSS after and
+        the largest traced peak. A stage nested in another is also counted
+        in the outer one.
+        """
+        rep = self.report()
+        counts = ["rows_in", "bytes_in", "rows_out", "bytes_out"]
+        first = rep.groupby("stage", sort=False)["started_s"].min().sort_values(kind="mergesort")
+        g = rep.groupby("stage", sort=False)
+        out = pd.DataFrame({
+            "pipeline": self.pipeline,
+            "calls": g.size(),
+            "wall_s": g["wall_s"].sum(),
+            "cpu_s": g["cpu_s"].sum(),
+            "rss_after_mb": g["rss_after_mb"].last(),
+            "rss_peak_growth_mb": g["rss_peak_growth_mb"].sum(min_count=1),
+            "traced_peak_mb": g["traced_peak_mb"].max(),
+        })
+        for c in counts:
+            out[c] = g[c].sum(min_count=1).astype("Int64")
+        out = out.loc[first.index].rename_axis("stage").reset_index()
+        return out[["pipeline", "stage"] + [c for c in out.columns if c not in ("pipeline", "stage")]]
+
+    def summary(self) -> str:
+        """The per-stage totals as a fixed-width table (seconds, MB, rows)."""
+        rep = self.totals()
+        if rep.empty:
+            return f"{self.pipeline}: no stages recorded"
+        rep = rep.assign(mb_in=rep["bytes_in"] / _MB, mb_out=rep["bytes_out"] / _MB)
+        cols = ["stage", "calls", "wall_s", "cpu_s", "rss_after_mb", "rss_peak_growth_mb", "traced_peak_mb", "rows_in", "mb_in", "rows_out", "mb_out"]
+        return rep[cols].to_string(index=False, float_format=lambda x: f"{x:,.2f}")
+
+    def write(self, path: str | Path) -> Path | None:
+        """
+        .csv: the report table. Anything else: JSON with the run's
+        pipeline, platform and python version, a "stages" list (every call)
+        and the per-stage "totals".
+        """
+        if not self.enabled:
+            return None
+        path = Path(path)
+        rep = self.report()
+        if path.suffix.lower() == ".csv":
+            rep.to_csv(path, index=False)
+            return path
+        stages = json.loads(rep.to_json(orient="records"))
+        doc = {
+            "pipeline": self.pipeline,
+            "created": pd.Timestamp.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "trace_memory": self.trace_memory,
+            "total_wall_s": time.perf_counter() - self._t0,
+            "stages": stages,
+            "totals": json.loads(self.totals().to_json(orient="records")),
+        }
+        path.write_text(json.dumps(doc, indent=2))
+        return path
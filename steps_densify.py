@@ -0,0 +1,169 @@
+"""
+Densify Steps event rows to one row per relative second, for all sessions at once.
+
+Replaces the per-(id, obs) complete_seconds/merge/ffill loop in
+Steps Code/stepsExplore.ipynb and the quality_agg groupby in
+Eric's Old Code/(1-2) merge_behavior_steps.ipynb:
+
+    combined_df["rel_time_seconds"] = parse_seconds(combined_df["rel_time"])
+    combined_df = densify_rel_time(combined_df)
+    seconds_2 = collapse_duplicate_seconds(seconds_2, ["id", "observation", "Date", "Time", "relative_time_steps"])
+
+Each session's grid is laid out with integer-second offsets (np.repeat/cumsum),
+events are scattered into it, and forward fill is one gather through a
+running-maximum index, so no per-group frames are built.
+"""
+import numpy as np
+import pandas as pd
+
+
+NONCODABLE_LABELS = ("Non-codable", "Non-codeable")
+
+
+def _group_starts(codes: np.ndarray) -> np.ndarray:
+    """Start positions of runs in an already grouped code array."""
+    if len(codes) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+
+def _is_sorted(df: pd.DataFrame, cols: list[str]) -> bool:
+    """O(n) check that `df` is already ordered by `cols` (numeric columns only)."""
+    if len(df) < 2:
+        return True
+    tied = np.ones(len(df) - 1, dtype=bool)
+    for c in cols:
+        v = df[c].to_numpy()
+        if v.dtype.kind not in "iuf":
+            return False
+        d = v[1:] - v[:-1]
+        if (tied & (d < 0)).any():
+            return False
+        tied &= d == 0
+    return True
+
+
+def densify_rel_time(
+    events: pd.DataFrame,
+    id_col: str = "id",
+    obs_col: str = "obs",
+    sec_col: str = "rel_time_seconds",
+    ffill_cols: tuple[str, ...] = ("Behavior",),
+    fill_values: dict | None = None,
+) -> pd.DataFrame:
+    """
+    One row per second from each session's first to last event second.
+
+    Seconds with events keep every event row (in input order); empty
+    seconds get one row. `ffill_cols` are forward filled within the
+    session, `fill_values` ({"Event_Type": "State point"} by default) fill
+    the remaining gaps. Events with a NaN or fractional second never land
+    on the grid (as with the merge), but still set the session's min/max.
+
+    Output is sorted by (id, obs, second) with columns
+    sec_col, id, obs, then the carried columns, like the loop's merge.
+    """
+    if fill_values is None:
+        fill_values = {"Event_Type": "State point"}
+    carry = list(ffill_cols) + [c for c in fill_values if c not in ffill_cols]
+
+    ev = events[events[sec_col].notna()]
+    if not _is_sorted(ev, [id_col, obs_col, sec_col]):
+        ev = ev.sort_values([id_col, obs_col, sec_col], kind="mergesort")
+    sec = ev[sec_col].to_numpy(dtype="float64")
+
+    keys = ev[[id_col, obs_col]]
+    gcode = keys.groupby([id_col, obs_col], sort=False).ngroup().to_numpy()
+    starts = _group_starts(gcode)
+    ends = np.r_[starts[1:], len(gcode)][: len(starts)]
+
+    g_min = np.trunc(sec[starts]).astype(np.int64)
+    g_max = np.trunc(sec[ends - 1]).astype(np.int64)
+    g_len = g_max - g_min + 1
+    g_off = np.cumsum(g_len) - g_len
+    n_slots = int(g_len.sum())
+
+    # grid slot of every event that sits on a whole second
+    on_grid = sec == np.floor(sec)
+    ev_pos = np.flatnonzero(on_grid)
+    ev_slot = g_off[gcode[ev_pos]] + (sec[ev_pos].astype(np.int64) - g_min[gcode[ev_pos]])
+
+    rows_per_slot = np.maximum(np.bincount(ev_slot, minlength=n_slots), 1)
+    slot_out = np.cumsum(rows_per_slot) - rows_per_slot
+    n_out = int(rows_per_slot.sum())
+
+    # k-th event of a slot goes to slot_out + k (events are already in slot order)
+    run_start = _group_starts(ev_slot)
+    rank = np.arange(len(ev_slot)) - np.repeat(run_start, np.diff(np.r_[run_start, len(ev_slot)]))
+    src = np.full(n_out, -1, dtype=np.int64)
+    src[slot_out[ev_slot] + rank] = ev_pos
+
+    # per-group / per-slot values, expanded with one repeat each
+    g_rows = np.add.reduceat(rows_per_slot, g_off) if n_slots else g_len
+    sec_of_slot = np.arange(n_slots) - np.repeat(g_off - g_min, g_len)
+    group_first_row = np.repeat(slot_out[g_off], g_rows)
+
+    out = pd.DataFrame({
+        sec_col: np.repeat(sec_of_slot, rows_per_slot),
+        id_col: np.repeat(keys[id_col].to_numpy()[starts], g_rows),
+        obs_col: np.repeat(keys[obs_col].to_numpy()[starts], g_rows),
+    })
+
+    row = np.arange(n_out)
+    for c in carry:
+        # gather integer codes, then decode once
+        codes, uniques = pd.factorize(ev[c], use_na_sentinel=True)
+        has = src >= 0
+        if c in ffill_cols:
+            has &= codes[np.maximum(src, 0)] >= 0
+            last = np.maximum.accumulate(np.where(has, row, -1))
+            has = last >= group_first_row
+            taken = codes[src[np.maximum(last, 0)]]
+        else:
+            taken = codes[np.maximum(src, 0)]
+        taken = np.where(has, taken, -1)
+        if c in fill_values:
+            fill = fill_values[c]
+            pos = np.flatnonzero(uniques == fill)
+            if len(pos) == 0:
+                uniques = uniques.append(pd.Index([fill], dtype=uniques.dtype))
+                pos = [len(uniques) - 1]
+            taken = np.where(taken >= 0, taken, pos[0])
+        out[c] = uniques.array.take(taken, allow_fill=True)
+    return out
+
+
+def collapse_duplicate_seconds(
+    df: pd.DataFrame,
+    keys: list[str],
+    quality_col: str = "Quality",
+    step_col: str = "Step",
+    noncodable_wins: bool = True,
+) -> pd.DataFrame:
+    """
+    One row per `keys`: max Step, and Quality "Non-codeable" if any row in
+    the second is non-codable, otherwise the first row's Quality.
+
+    quality_agg in (1-2) tested `"Non-codable" in srs`, which looks at the
+    Series index, so it always returned the first Quality;
+    noncodable_wins=False reproduces that. Rows with a missing key are
+    dropped and the result is sorted by `keys`, as groupby().agg does.
+    """
+    codes = df.groupby(keys, sort=True, dropna=True).ngroup().to_numpy()
+    keep = np.flatnonzero(codes >= 0)
+    order = keep[np.argsort(codes[keep], kind="mergesort")]
+    starts = _group_starts(codes[order])
+
+    first = order[starts]
+    out = df[keys].iloc[first].reset_index(drop=True)
+
+    quality = df[quality_col].to_numpy()[first]
+    if noncodable_wins and len(order):
+        is_nc = df[quality_col].isin(NONCODABLE_LABELS).to_numpy()[order]
+        any_nc = np.maximum.reduceat(is_nc, starts)
+        quality = np.where(any_nc, "Non-codeable", quality)
+    out[quality_col] = quality
+
+    step = df[step_col].to_numpy()[order]
+    out[step_col] = np.maximum.reduceat(step, starts) if len(order) else step
+    return out
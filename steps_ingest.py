@@ -0,0 +1,187 @@
+"""
+Discover, parse and cache the Steps event-log workbooks.
+
+Workbooks are read with openpyxl in read_only mode in a process pool, only
+the requested columns are kept, and each parsed sheet is cached as a pickle
+keyed on path + mtime + size + columns. Re-running after one workbook is
+re-exported parses that one file only, and drops the outdated pickle.
+
+    steps_df, report = load_steps()                       # all workbooks, cached
+    steps_df, report = load_steps(columns=STEP_COLUMNS)   # same, explicit columns
+    report[report["status"] == "skipped"]                 # names without id/obs, superseded exports
+"""
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+
+
+STEPS_DIR = Path(__file__).resolve().parent / "Steps Data WAVES" / "steps"
+CACHE_DIR = STEPS_DIR.parent / ".steps_cache"
+
+STEP_COLUMNS = ["Time_Relative_hms", "Behavior", "Event_Type"]
+
+# "Step_116_02_MD", "step_143_2_GB_recode", "Step_127-02_KY-", "Step_128-01_KY"
+_FILENAME_RE = re.compile(r"step[_-](\d+)[_-](\d+)", re.IGNORECASE)
+
+
+def parse_steps_filename(name: str) -> tuple[int, int] | None:
+    """(id, obs) from a Steps workbook file name, or None if it doesn't match."""
+    m = _FILENAME_RE.search(Path(name).name)
+    if m is None:
+        return None
+    return int(m.group(1)), int(m.group(2))
+
+
+def discover_workbooks(directory: str | Path = STEPS_DIR, prefer_recode: bool = True) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    (files, skipped). files: one row per (id, obs) workbook with path, id,
+    obs, mtime_ns, size. skipped: path, id, obs, reason for every other
+    workbook in `directory`.
+
+    When a session has more than one export (e.g. Step_135_01_KY and
+    Step_135_01_GB_recode), the "recode" file is kept if prefer_recode.
+    """
+    rows, skipped = [], []
+    for p in sorted(Path(directory).glob("*.xlsx")):
+        if p.name.startswith("~$"):
+            continue
+        parsed = parse_steps_filename(p.name)
+        if parsed is None:
+            skipped.append({"path": p, "id": None, "obs": None, "reason": "cannot parse id/obs"})
+            continue
+        st = p.stat()
+        rows.append({
+            "path": p,
+            "id": parsed[0],
+            "obs": parsed[1],
+            "is_recode": "recode" in p.name.lower(),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+        })
+
+    files = pd.DataFrame(rows, columns=["path", "id", "obs", "is_recode", "mtime_ns", "size"])
+    if prefer_recode and not files.empty:
+        files = files.sort_values(["id", "obs", "is_recode"], kind="mergesort")
+        dup = files.duplicated(subset=["id", "obs"], keep="last")
+        for r in files[dup].itertuples():
+            skipped.append({"path": r.path, "id": r.id, "obs": r.obs, "reason": "superseded by another export"})
+        files = files[~dup]
+    skipped = pd.DataFrame(skipped, columns=["path", "id", "obs", "reason"])
+    return files.drop(columns=["is_recode"]).reset_index(drop=True), skipped
+
+
+def read_workbook(path: str | Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """First sheet of one workbook, header row as column names, only `columns` kept."""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[wb.sheetnames[0]]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame(columns=columns or [])
+        header = list(header)
+        keep = header if columns is None else [c for c in columns if c in header]
+        pos = [header.index(c) for c in keep]
+        data = [tuple(r[i] for i in pos) for r in rows if any(v is not None for v in r)]
+    finally:
+        wb.close()
+
+    df = pd.DataFrame.from_records(data, columns=keep)
+    # openpyxl gives datetime.timedelta for duration cells; keep them as timedelta64
+    for c in df.columns:
+        first = df[c].first_valid_index()
+        if first is not None and isinstance(df.at[first, c], timedelta):
+            df[c] = pd.to_timedelta(df[c])
+    return df
+
+
+def _cache_key(path: Path, mtime_ns: int, size: int, columns: list[str] | None) -> str:
+    raw = f"{path.resolve()}|{mtime_ns}|{size}|{columns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_prefix(directory: str | Path, columns: list[str] | None) -> str:
+    """Names the pickles of one (directory, columns) load, so pruning leaves other loads' alone."""
+    raw = f"{Path(directory).resolve()}|{columns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def _load_report(loaded: list[tuple], skipped: pd.DataFrame) -> pd.DataFrame:
+    rows = loaded + [(Path(r.path).name, r.id, r.obs, "skipped", 0, r.reason) for r in skipped.itertuples()]
+    report = pd.DataFrame(rows, columns=["path", "id", "obs", "status", "rows", "reason"])
+    return report.astype({"id": "Int64", "obs": "Int64"})
+
+
+def load_steps(
+    directory: str | Path = STEPS_DIR,
+    columns: list[str] | None = STEP_COLUMNS,
+    cache_dir: str | Path | None = CACHE_DIR,
+    max_workers: int | None = None,
+    prefer_recode: bool = True,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    All Steps workbooks as one frame with id/obs in front, plus a report:
+    one row per workbook with path, id, obs, status (parsed/cached/skipped),
+    rows and the reason a workbook was skipped.
+
+    Cached sheets are loaded from `cache_dir`; the rest are parsed in
+    parallel and written back to the cache. Pickles left by earlier loads of
+    the same directory and columns that no current workbook matches (a
+    re-exported or removed file) are deleted. cache_dir=None disables
+    caching.
+    """
+    files, skipped = discover_workbooks(directory, prefer_recode=prefer_recode)
+    if files.empty:
+        return pd.DataFrame(columns=["id", "obs"] + list(columns or [])), _load_report([], skipped)
+
+    if cache_dir is not None:
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        prefix = _cache_prefix(directory, columns)
+        cache_paths = [
+            cache_dir / f"{prefix}_{_cache_key(r.path, r.mtime_ns, r.size, columns)}.pkl"
+            for r in files.itertuples()
+        ]
+        current = set(cache_paths)
+        for p in cache_dir.glob(f"{prefix}_*.pkl"):
+            if p not in current:
+                p.unlink()
+    else:
+        cache_paths = [None] * len(files)
+
+    frames: list[pd.DataFrame | None] = [None] * len(files)
+    todo = []
+    for i, cp in enumerate(cache_paths):
+        if cp is not None and cp.exists():
+            frames[i] = pd.read_pickle(cp)
+        else:
+            todo.append(i)
+
+    if todo:
+        paths = [files.at[i, "path"] for i in todo]
+        if len(todo) == 1:
+            parsed = [read_workbook(paths[0], columns)]
+        else:
+            workers = max_workers or min(len(todo), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(read_workbook, paths, [columns] * len(paths)))
+        for i, df in zip(todo, parsed):
+            frames[i] = df
+            if cache_paths[i] is not None:
+                df.to_pickle(cache_paths[i])
+
+    parsed_idx = set(todo)
+    out, loaded = [], []
+    for i, (r, df) in enumerate(zip(files.itertuples(), frames)):
+        loaded.append((r.path.name, r.id, r.obs, "parsed" if i in parsed_idx else "cached", len(df), None))
+        df = df.copy()
+        df.insert(0, "obs", r.obs)
+        df.insert(0, "id", r.id)
+        out.append(df)
+    return pd.concat(out, ignore_index=True), _load_report(loaded, skipped)
@@ -0,0 +1,79 @@
+"""
+Columnar step ground-truth recode (one row per `step` event).
+
+Replaces the iterrows/strptime loop in
+Eric's Old Code/(1-0) step_count_ground_truth_recode_v2.ipynb:
+
+    events, _ = load_steps(columns=["Time_Relative_hmsf", "Behavior"])
+    log_final = pd.read_csv(".../do_log_final_steps.csv")
+    step_ground_truth_recode = recode_steps(events, log_final)
+"""
+import numpy as np
+import pandas as pd
+
+
+RECODE_COLUMNS = ["ID", "Session", "Relative Time", "Date", "Time", "Quality", "Step"]
+
+
+def recode_steps(
+    events_df: pd.DataFrame,
+    log_df: pd.DataFrame,
+    id_col: str = "id",
+    session_col: str = "obs",
+    rel_col: str = "Time_Relative_hmsf",
+    honor_ampm: bool = False,
+) -> pd.DataFrame:
+    """
+    One row per `step` event with typed columns.
+
+    Quality is the most recent non-step Behavior in the same workbook
+    (ffill of a masked column), absolute time is the log start_time plus the
+    relative time. The log is matched on (id, do); the first log row wins, as
+    with `.iloc[0]` in the notebook.
+
+    The notebook parsed start_time with "%H:%M:%S %p", which ignores AM/PM;
+    that is kept by default (honor_ampm=False) so output matches the existing
+    files and the 12-hour correction in (1-2) merge_behavior_steps.
+
+    Columns: ID, Session, Step (int64), Relative Time (timedelta64),
+    Date, Time (datetime64; Time is the full timestamp of the step), Quality.
+    """
+    ev = events_df[[id_col, session_col, rel_col, "Behavior"]].reset_index(drop=True)
+    keys = [id_col, session_col]
+
+    behavior = ev["Behavior"]
+    is_step = behavior.eq("step").to_numpy()
+    quality = behavior.where(~is_step).groupby([ev[id_col], ev[session_col]], sort=False).ffill()
+    quality = quality.fillna("")
+
+    steps = ev.loc[is_step, keys + [rel_col]].copy()
+    steps["Quality"] = quality[is_step].to_numpy()
+    steps[rel_col] = pd.to_timedelta(steps[rel_col])
+
+    log = (
+        log_df[["id", "do", "start_time", "start_month", "start_day", "start_year"]]
+        .drop_duplicates(subset=["id", "do"], keep="first")
+        .rename(columns={"id": id_col, "do": session_col})
+    )
+    fmt = "%I:%M:%S %p" if honor_ampm else "%H:%M:%S %p"
+    start_tod = pd.to_datetime(log["start_time"].astype(str).str.strip(), format=fmt, errors="coerce")
+    log["_start_tod"] = start_tod - start_tod.dt.normalize()
+    log["_date"] = pd.to_datetime(
+        {"year": log["start_year"], "month": log["start_month"], "day": log["start_day"]},
+        errors="coerce",
+    )
+    steps = steps.merge(log[keys + ["_date", "_start_tod"]], on=keys, how="left", validate="many_to_one")
+
+    out = pd.DataFrame({
+        "ID": steps[id_col].astype("int64"),
+        "Session": steps[session_col].astype("int64"),
+        "Relative Time": steps[rel_col],
+        "Date": steps["_date"],
+        "Time": steps["_date"] + steps["_start_tod"] + steps[rel_col],
+        "Quality": steps["Quality"],
+        "Step": np.ones(len(steps), dtype="int64"),
+    })
+
+    # same post-fix as the notebook: a step inside a Non-codeable state counts as Codable
+    out.loc[out["Quality"].eq("Non-codeable") & (out["Step"] >= 1), "Quality"] = "Codable"
+    return out
@@ -0,0 +1,303 @@
+"""
+WAVES coding vocabularies shared by the AM and ACT24 cleaners.
+
+Copied from the mapping cells in AM Full Code/AM_restart1.ipynb so scripts
+can import them instead of re-declaring the dicts. The act24_* tables come
+from the encoding cell of ACT24 Full Code/dataCleanOneChunk_ACT.ipynb;
+behavior_encoder.py compiles both sets into lookup arrays.
+"""
+
+# Activity type mapping (normalized Behavior -> activity_type code)
+activity_map = {
+    "sl- sleep": "sleep",
+    "pc- groom, health-related": "pc_groom",
+    "pc- other personal care": "pc_other",
+    "ha- housework": "ha_housework",
+    "ha- food prep and cleanup": "ha_food",
+    "ha- interior maintenance, repair, & decoration": "ha_interior",
+    "ha- exterior maintenance, repair, & decoration": "ha_exterior",
+    "ha- lawn, garden and houseplants": "ha_lawn",
+    "ha- animals and pets": "ha_pets",
+    "ha- household management/other household activities": "ha_other",
+    "ca- caring for and helping children": "care_children",
+    "ca- caring for and helping adults": "care_adults",
+    "wrk- general": "work_general",
+    "wrk- screen based": "work_screen",
+    "edu- taking class, research, homework": "edu_class",
+    "edu- extracurricular": "edu_other",
+    "org- organizational civic, volunteer, and religious activities": "com_church",
+    "org - volunteer work": "com_volunteer",
+    "org- volunteer work": "com_volunteer",
+    "pur- purchasing goods and services": "com_purchase",
+    "eat- eating and drinking, waiting": "ha_eat",
+    "les- socializing, communicating, leisure time not screen": "les_social",
+    "les- screen based leisure time (tv, video game, computer)": "les_screen",
+    "ex- participating in sport, exercise or recreation": "ex_sport",
+    "ex- attending sport, recreational event, or performance": "les_attend",
+    "trav- passenger bus or train": "trav_pass",
+    "trav- driver (car/truck/motorcycle)": "trav_drive",
+    "trav- biking": "trav_bike",
+    "trav- walking": "trav_walk",
+    "trav-walking": "trav_walk",
+    "other- non codable": "non_codable",
+}
+
+# Posture mapping (normalized Behavior -> posture_wbm code)
+posture_map = {
+    "sb-sitting": "sitting",
+    "sb- lying": "lying",
+    "la- kneeling/ squatting": "kneel_squat",
+    "la- stretching": "stretch",
+    "la- stand": "stand",
+    "la- stand and move": "stand_move",
+    "la- stand and move with upper body movement": "stand_move",
+    "la- stand and move with unidentifiable upper body movement": "stand_move",
+    "wa- walk": "walk",
+    "wa-walk with load": "walk_load",
+    "wa- ascend stairs": "ascend",
+    "wa- descend stairs": "descend",
+    "wa- running": "running",
+    "sp- bike": "biking",
+    "sp- other sport movement": "sport_move",
+    "sp- muscle strengthening": "muscle_strength",
+    "sp -kick": "sport_move",
+    "sp- jump": "sport_move",
+    "sp- throw": "sport_move",
+    "private/not coded": "not_coded",
+}
+
+# Activity_Type -> (broad_domain, waves_domain)
+activity_domain_map = {
+    "sleep": ("sleep", "other"),
+    "pc_groom": ("personal", "household"),
+    "pc_other": ("personal", "household"),
+    "ha_housework": ("household", "household"),
+    "ha_food": ("household", "household"),
+    "ha_interior": ("maintenance_repair", "household"),
+    "ha_exterior": ("maintenance_repair", "household"),
+    "ha_lawn": ("lawn_garden", "household"),
+    "ha_pets": ("household", "household"),
+    "ha_other": ("household", "household"),
+    "care_children": ("household", "household"),
+    "care_adults": ("household", "household"),
+    "work_general": ("work_education", "occupation"),
+    "work_screen": ("work_education", "occupation"),
+    "edu_class": ("work_education", "occupation"),
+    "edu_other": ("work_education", "occupation"),
+    "com_church": ("purchase_other", "other"),
+    "com_volunteer": ("purchase_other", "other"),
+    "com_purchase": ("purchase_other", "shopping"),
+    "ha_eat": ("personal", "leisure_inactive"),
+    "les_social": ("leisure", "leisure_inactive"),
+    "les_screen": ("Leisure_Screen", "leisure_inactive"),
+    "ex_sport": ("exercise", "active_time"),
+    "les_attend": ("leisure", "leisure_inactive"),
+    "trav_pass": ("Trav_car", "travel_inactive"),
+    "trav_drive": ("Trav_car", "travel_inactive"),
+    "trav_bike": ("active_transportation", "active_time"),
+    "trav_walk": ("active_transportation", "active_time"),
+    "trav_other": ("transportation", "other"),
+    "non_codable": ("non_codable", "non_pa"),
+}
+
+# posture_wbm -> (posture_broad, posture_waves)
+posture_domain_map = {
+    "sitting": ("sedentary", "sedentary"),
+    "lying": ("sedentary", "sedentary"),
+    "kneel_squat": ("sedentary", "stationary"),
+    "stretch": ("sport", "mixed_movement"),
+    "stand": ("stand_move", "stationary"),
+    "stand_move": ("stand_move", "stationary"),
+    "walk": ("walk", "walking"),
+    "walk_load": ("mod_walk", "walking"),
+    "ascend": ("mod_walk", "mixed_movement"),
+    "descend": ("mod_walk", "mixed_movement"),
+    "running": ("running", "running"),
+    "biking": ("biking", "cycling"),
+    "sport_move": ("sport", "mixed_movement"),
+    "muscle_strength": ("sport", "mixed_movement"),
+    "not_coded": ("not_coded", "not_coded"),
+}
+
+
+# --- ACT24 (ACT24 Full Code/dataCleanOneChunk_ACT.ipynb) ---------------------
+# Behavior keys below are normalized (see behavior_encoder.normalize_labels).
+# Prefix tables are checked in order, before the exact aliases.
+
+# Behavior prefix -> track the event belongs to
+act24_track_prefixes = {
+    "sl-": "activity",
+    "pc-": "activity",
+    "ha-": "activity",
+    "ca-": "activity",
+    "wrk-": "activity",
+    "edu-": "activity",
+    "org-": "activity",
+    "pur-": "activity",
+    "eat-": "activity",
+    "les-": "activity",
+    "ex-": "activity",
+    "trav-": "activity",
+    "other-": "activity",
+    "sb-": "posture",
+    "la-": "posture",
+    "wa-": "posture",
+    "sp-": "posture",
+}
+
+# Canonical Activity_Type -> (activity_type, broad_domain, waves_domain)
+act24_activity_meta = {
+    "SL- Sleep": ("sleep", "sleep", "other"),
+    "PC- Groom, Health-Related": ("pc_groom", "personal", "household"),
+    "PC- Other Personal Care": ("pc_other", "personal", "household"),
+    "HA- Housework": ("ha_housework", "household", "household"),
+    "HA- Food Prep and Cleanup": ("ha_food", "household", "household"),
+    "HA- Interior Maintenance, Repair, & Decoration": ("ha_interior", "maintenance_repair", "household"),
+    "HA- Exterior Maintenance, Repair, & Decoration": ("ha_exterior", "maintenance_repair", "household"),
+    "HA- Lawn, Garden and Houseplants": ("ha_lawn", "lawn_garden", "household"),
+    "HA- Animals and Pets": ("ha_pets", "household", "household"),
+    "HA- Household Management/Other household activities": ("ha_other", "household", "household"),
+    "CA- Caring for and Helping Children": ("care_children", "household", "household"),
+    "CA- Caring for and Helping Adults": ("care_adults", "household", "household"),
+    "WRK- General**": ("work_general", "work_education", "occupation"),
+    "WRK- Desk/Screen Based": ("work_screen", "work_education", "occupation"),
+    "EDU- Taking Class, Research, Homework": ("edu_class", "work_education", "occupation"),
+    "EDU- Extracurricular": ("edu_other", "work_education", "occupation"),
+    "ORG- Church, Spiritual": ("com_church", "purchase_other", "other"),
+    "Volunteer Work (ORG - Volunteer Work)": ("com_volunteer", "purchase_other", "other"),
+    "PUR- Purchasing Goods and Services": ("com_purchase", "purchase_other", "shopping"),
+    "EAT- Eating and Drinking, Waiting": ("ha_eat", "personal", "leisure_inactive"),
+    "LES- Socializing, Communicating, Non-Screen Based": ("les_social", "leisure", "leisure_inactive"),
+    "LES- Screen-Based (TV, Video Game, Computer, Phone)": ("les_screen", "Leisure_Screen", "leisure_inactive"),
+    "EX- Participating in Sport, Exercise or Recreation***": ("ex_sport", "exercise", "active_time"),
+    "EX- Attending Sport, Exercise Recreation Event, or Performance": ("les_attend", "leisure", "leisure_inactive"),
+    "TRAV- Passenger (Car/Truck/Motorcycle)": ("trav_pass", "Trav_car", "travel_inactive"),
+    "TRAV- Driver (Car/Truck/Motorcycle)": ("trav_drive", "Trav_car", "travel_inactive"),
+    "TRAV- Passenger (Bus, Train, Tram, Plane, Boat, Ship)": ("trav_pass", "Trav_public", "travel_inactive"),
+    "TRAV- Biking": ("trav_bike", "active_transportation", "active_time"),
+    "TRAV-Walking": ("trav_walk", "active_transportation", "active_time"),
+    "TRAV- General": ("trav_other", "transportation", "other"),
+    "OTHER- Non-Codable (delete these rows from dataset)": ("non_codable", "non_codable", "non_pa"),
+}
+
+# Activity_Type built from EX + Modifier_1 ("EX-basketball"). Checked before
+# the exact Activity_Type keys, so "EX- Participating ..." and "EX- Attending ..."
+# also take this row, as _activity_meta_lookup did.
+act24_activity_meta_prefixes = {
+    "EX-": ("ex_sport", "exercise", "leisure"),
+}
+
+# Behavior -> canonical Activity_Type
+act24_activity_prefixes = {
+    "les- screen": "LES- Screen-Based (TV, Video Game, Computer, Phone)",
+    "trav- passenger (bus": "TRAV- Passenger (Bus, Train, Tram, Plane, Boat, Ship)",
+}
+act24_activity_aliases = {
+    "sl- sleep": "SL- Sleep",
+    "pc- groom, health-related": "PC- Groom, Health-Related",
+    "pc- other personal care": "PC- Other Personal Care",
+    "ha- housework": "HA- Housework",
+    "ha- food prep and cleanup": "HA- Food Prep and Cleanup",
+    "ha- interior maintenance, repair, & decoration": "HA- Interior Maintenance, Repair, & Decoration",
+    "ha- exterior maintenance, repair, & decoration": "HA- Exterior Maintenance, Repair, & Decoration",
+    "ha- lawn, garden and houseplants": "HA- Lawn, Garden and Houseplants",
+    "ha- animals and pets": "HA- Animals and Pets",
+    "ha- household management/other household activities": "HA- Household Management/Other household activities",
+    "ca- caring for and helping children": "CA- Caring for and Helping Children",
+    "ca- caring for and helping adults": "CA- Caring for and Helping Adults",
+    "wrk- general": "WRK- General**",
+    "wrk- screen based": "WRK- Desk/Screen Based",
+    "edu- taking class, research, homework": "EDU- Taking Class, Research, Homework",
+    "edu- extracurricular": "EDU- Extracurricular",
+    "org- church, spiritual": "ORG- Church, Spiritual",
+    "org- volunteer": "Volunteer Work (ORG - Volunteer Work)",
+    "pur- purchasing goods and services": "PUR- Purchasing Goods and Services",
+    "eat- eating and drinking, waiting": "EAT- Eating and Drinking, Waiting",
+    "les- socializing, communicating, leisure time not screen": "LES- Socializing, Communicating, Non-Screen Based",
+    "les- screen based leisure time (tv, video game, computer)": "LES- Screen-Based (TV, Video Game, Computer, Phone)",
+    "les- screen-based (tv, video game, computer, phone)": "LES- Screen-Based (TV, Video Game, Computer, Phone)",
+    "ex- participating in sport, exercise or recreation": "EX- Participating in Sport, Exercise or Recreation***",
+    "ex- attending sport, recreational event, or performance": "EX- Attending Sport, Exercise Recreation Event, or Performance",
+    "trav- passenger (car/truck/motorcycle)": "TRAV- Passenger (Car/Truck/Motorcycle)",
+    "trav- driver (car/truck/motorcycle)": "TRAV- Driver (Car/Truck/Motorcycle)",
+    "trav- passenger (bus, train, tram, plane, boat, ship)": "TRAV- Passenger (Bus, Train, Tram, Plane, Boat, Ship)",
+    "trav- biking": "TRAV- Biking",
+    "trav- walking": "TRAV-Walking",
+    "trav-walking": "TRAV-Walking",
+    "trav- general": "TRAV- General",
+    "other- non codable": "OTHER- Non-Codable (delete these rows from dataset)",
+    "private/not coded": "OTHER- Non-Codable (delete these rows from dataset)",
+}
+
+# Behavior -> posture_wbm
+act24_posture_prefixes = {
+    "sb-sitting": "sitting",
+    "sb-lying": "lying",
+    "sb- lying": "lying",
+    "la- kneeling": "kneel_squat",
+}
+act24_posture_aliases = {
+    "la- stretching": "stretch",
+    "la- stand and move": "stand_move",
+    "la- stand": "stand",
+    "wa- walk": "walk",
+    "wa- walking": "walk",
+    "trav- walking": "walk",
+    "trav-walking": "walk",
+    "wa-walk with load": "walk_load",
+    "wa- walk with load": "walk_load",
+    "wa- ascend stairs": "ascend",
+    "wa- descend stairs": "descend",
+    "wa- running": "running",
+    "sp- bike": "biking",
+    "sp- other sport movement": "sport_move",
+    "sp- swing": "sport_move",
+    "sp -kick": "sport_move",
+    "sp- jump": "sport_move",
+    "sp- muscle strengthening": "muscle_strength",
+    "private/not coded": "not_coded",
+}
+
+# posture_wbm -> (posture_broad, posture_waves, waves_sedentary)
+# posture_waves keeps the ACT24 spellings ("sationary", walk_load) so exports
+# stay comparable with earlier runs; AM uses posture_domain_map above.
+act24_posture_domain_map = {
+    "sitting": ("sedentary", "sedentary", "sedentary"),
+    "lying": ("sedentary", "sedentary", "sedentary"),
+    "kneel_squat": ("sedentary", "stationary", "sedentary"),
+    "stretch": ("sport", "mixed_movement", "active"),
+    "stand": ("stand_move", "sationary", "active"),
+    "stand_move": ("stand_move", "sationary", "active"),
+    "walk": ("walk", "walking", "active"),
+    "walk_load": ("mod_walk", "sationary", "active"),
+    "ascend": ("mod_walk", "mixed_movement", "active"),
+    "descend": ("mod_walk", "mixed_movement", "active"),
+    "running": ("running", "running", "active"),
+    "biking": ("biking", "cycling", "active"),
+    "sport_move": ("sport", "mixed_movement", "active"),
+    "muscle_strength": ("sport", "mixed_movement", "active"),
+    "not_coded": ("not_coded", "not_coded", "active"),
+}
+
+# Behavior -> intensity (posture events first, then activity events)
+act24_intensity_prefixes = {
+    "sb-sitting": "sedentary",
+    "sb-lying": "sedentary",
+    "sb- lying": "sedentary",
+    "la- kneeling": "sedentary",
+}
+act24_intensity_aliases = {
+    "la- stand": "light",
+    "la- stand and move": "light",
+    "la- stretching": "light",
+}
+
+# Modifier_2 -> intensity, where the Behavior gave none
+act24_modifier_intensity_prefixes = {
+    "vig": "vigorous",
+    "mod": "moderate",
+}
+act24_modifier_intensity_aliases = {
+    "light": "light",
+    "sedentary": "sedentary",
+}
@@ -0,0 +1,234 @@
+"""
+Vectorized parsing/formatting of the time strings used across the pipelines.
+
+    parse_seconds(["01:02:03.5", "2:03", "75", "0 days 00:00:10"])  -> [3723.5, 123., 75., 10.]
+    parse_clock(["1:05 PM", "01:05:30 AM", "13:05"])               -> seconds since midnight
+    format_hms([3723.5, 5], decimals=0)                            -> ["01:02:04", "00:00:05"]
+
+Strings are laid out as one fixed-width UCS4 array and read column by column
+as code points, so a million "HH:MM:SS" values are parsed with a handful of
+NumPy passes instead of a Python call per row. Formatting builds the code
+point array directly and views it back as strings. Unparseable values come
+back as NaN, missing seconds format to NaN, as the per-row helpers did.
+
+Replaces _parse_hms_to_seconds/_format_hms (ACT24), time_to_seconds/
+seconds_to_time (Steps) and the _dt1/_dt2 start_time passes (log cleanup).
+"""
+import numpy as np
+import pandas as pd
+
+
+_ZERO, _COLON, _DOT = ord("0"), ord(":"), ord(".")
+_MINUS, _PLUS = ord("-"), ord("+")
+_DECIMAL_MARKS = (ord("."), ord(","), ord(";"))
+_SPACES = (ord(" "), ord("\t"))
+
+
+def _codes(values) -> np.ndarray:
+    """
+    (n, width) uint32 code points, zero-padded on the right.
+
+    Missing values become "nan"/"None"/"<NA>" text, which never parses.
+    """
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values.to_numpy(dtype=object)
+    arr = np.asarray(values, dtype=object).ravel()
+    if len(arr) == 0:
+        return np.zeros((0, 1), dtype=np.uint32)
+    u = np.asarray(arr, dtype=str)
+    width = max(u.dtype.itemsize // 4, 1)
+    return u.view(np.uint32).reshape(len(u), width)
+
+
+def _hhmmss_rows(codes: np.ndarray) -> np.ndarray:
+    """Rows that are exactly "HH:MM:SS" (the common case), checked column-wise."""
+    n, width = codes.shape
+    if width < 8:
+        return np.zeros(n, dtype=bool)
+    d = codes[:, :8].astype(np.int64) - _ZERO
+    digits = d[:, [0, 1, 3, 4, 6, 7]]
+    fast = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    fast &= (codes[:, 2] == _COLON) & (codes[:, 5] == _COLON)
+    fast &= (d[:, 3] <= 5) & (d[:, 6] <= 5)
+    if width > 8:
+        fast &= (codes[:, 8:] == 0).all(axis=1)
+    return fast
+
+
+def _parse_fields(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    One left-to-right pass over [+|-][[d]d:][d]d:d[d][.f] code points.
+
+    Leading/trailing blanks are ignored and "," / ";" count as the decimal
+    point. Returns (value, n_colons, ok) where value folds every ":" as x60, so
+    "H:M:S" -> H*3600+M*60+S and "M:S" -> M*60+S. Fields after a colon must
+    be < 60. A leading "-" negates the whole value ("-00:00:05" -> -5.0,
+    "-0" -> -0.0).
+    """
+    n = codes.shape[0]
+    total = np.zeros(n)
+    cur = np.zeros(n)
+    frac = np.zeros(n)
+    n_frac = np.zeros(n, dtype=np.int64)
+    in_frac = np.zeros(n, dtype=bool)
+    n_digits = np.zeros(n, dtype=np.int64)
+    n_colons = np.zeros(n, dtype=np.int64)
+    negative = np.zeros(n, dtype=bool)
+    started = np.zeros(n, dtype=bool)
+    ended = np.zeros(n, dtype=bool)
+    ok = np.ones(n, dtype=bool)
+
+    for j in range(codes.shape[1]):
+        c = codes[:, j].astype(np.int64)
+        d = c - _ZERO
+        is_digit = (d >= 0) & (d <= 9)
+        is_colon = c == _COLON
+        is_dot = np.isin(c, _DECIMAL_MARKS)
+        is_blank = np.isin(c, _SPACES) | (c == 0)
+        is_sign = ((c == _MINUS) | (c == _PLUS)) & ~started
+        negative |= is_sign & (c == _MINUS)
+        ok &= is_digit | is_colon | is_dot | is_blank | is_sign
+        ended |= started & is_blank
+        ok &= ~(ended & ~is_blank)
+        started |= ~is_blank
+
+        dig_int = is_digit & ~in_frac
+        cur = np.where(dig_int, cur * 10 + d, cur)
+        n_digits += dig_int
+        dig_frac = is_digit & in_frac
+        frac = np.where(dig_frac, frac * 10 + d, frac)
+        n_frac += dig_frac
+
+        ok &= ~(is_colon & (in_frac | (n_digits == 0) | ((n_colons > 0) & (cur >= 60))))
+        total = np.where(is_colon, (total + cur) * 60, total)
+        cur = np.where(is_colon, 0, cur)
+        n_digits = np.where(is_colon, 0, n_digits)
+        n_colons += is_colon
+
+        ok &= ~(is_dot & in_frac)
+        in_frac |= is_dot
+
+    frac = frac / 10.0 ** n_frac
+    ok &= (n_digits > 0) | (n_frac > 0)
+    ok &= ~((n_colons > 0) & (cur + frac >= 60))
+    value = total + cur + frac
+    return np.where(negative, -value, value), n_colons, ok
+
+
+def parse_seconds(values) -> np.ndarray:
+    """
+    Durations -> float seconds (NaN where unparseable).
+
+    Accepts "H:M:S(.f)", "M:S(.f)", bare "S(.f)", each with an optional
+    leading sign, pandas' "N days HH:MM:SS" and "," / ";" as decimal point.
+    timedelta64 and numeric input pass through.
+    """
+    if isinstance(values, (pd.Series, pd.Index, np.ndarray)):
+        if pd.api.types.is_timedelta64_dtype(values.dtype):
+            return pd.to_timedelta(np.asarray(values)).total_seconds().to_numpy(dtype="float64")
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            return np.asarray(values, dtype="float64")
+
+    codes = _codes(values)
+    days = np.zeros(codes.shape[0])
+    has_days = (codes == ord("y")).any(axis=1)
+    if has_days.any():
+        # pandas timedelta text: "0 days 00:01:02", "-1 days +23:59:59"
+        s = pd.Series(codes[has_days].view(f"U{codes.shape[1]}").ravel())
+        parts = s.str.extract(r"^\s*(-?\d+)\s+days?\s*\+?(.*)$")
+        days[has_days] = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype="float64")
+        rest = parts[1].fillna("x").where(parts[1].ne(""), "0")
+        sub = _codes(rest)
+        codes = codes.copy()
+        codes[has_days] = 0
+        codes[has_days, : sub.shape[1]] = sub
+
+    out = np.full(codes.shape[0], np.nan)
+    fast = _hhmmss_rows(codes)
+    if fast.any():
+        d = codes[fast, :8].astype(np.int64) - _ZERO
+        out[fast] = (d[:, 0] * 10 + d[:, 1]) * 3600 + (d[:, 3] * 10 + d[:, 4]) * 60 + d[:, 6] * 10 + d[:, 7]
+
+    slow = ~fast
+    if slow.any():
+        value, n_colons, ok = _parse_fields(codes[slow])
+        value[~(ok & (n_colons <= 2))] = np.nan
+        out[slow] = value
+    return out + days * 86400
+
+
+def parse_clock(values) -> np.ndarray:
+    """
+    Clock strings -> float seconds since midnight (NaN where unparseable).
+
+    "H:MM", "H:MM:SS(.f)", either 24h or 12h with an AM/PM suffix
+    (12 AM -> 00, 12 PM -> 12). 12h hours must be 1..12, 24h hours 0..23.
+    """
+    s = pd.Series(np.asarray(values, dtype=object).ravel()).astype("string").str.strip().str.upper()
+    suffix = s.str.extract(r"\s*([AP])\.?M\.?$")[0]
+    s = s.str.replace(r"\s*[AP]\.?M\.?$", "", regex=True)
+
+    value, n_colons, ok = _parse_fields(_codes(s.fillna("")))
+    value = np.where(n_colons == 1, value * 60, value)
+    ok &= ((n_colons == 1) | (n_colons == 2)) & ~np.signbit(value)
+
+    hour = np.floor(value / 3600)
+    is_pm = suffix.eq("P").fillna(False).to_numpy()
+    has_ampm = suffix.notna().to_numpy()
+    ok &= np.where(has_ampm, (hour >= 1) & (hour <= 12), hour <= 23)
+    value = np.where(has_ampm, value + (hour % 12 - hour + 12 * is_pm) * 3600, value)
+    value[~ok] = np.nan
+    return value
+
+
+def _format_one(seconds: float, decimals: int) -> str:
+    scale = 10 ** decimals
+    total_units = int(round(seconds * scale))
+    secs, frac_units = divmod(total_units, scale)
+    h, rem = divmod(secs, 3600)
+    m, s = divmod(rem, 60)
+    if decimals == 0:
+        return f"{h:02d}:{m:02d}:{s:02d}"
+    return f"{h:02d}:{m:02d}:{s:02d}.{frac_units:0{decimals}d}"
+
+
+def format_hms(seconds, decimals: int = 0) -> np.ndarray:
+    """
+    Seconds -> "HH:MM:SS" (or "HH:MM:SS.ff" with decimals) as an object array.
+
+    Seconds are rounded to `decimals` first (half to even, like round()).
+    NaN formats to NaN. Values of 100 h or more, or negative, fall back to
+    per-row formatting.
+    """
+    x = np.asarray(seconds, dtype="float64")
+    shape = x.shape
+    x = x.ravel()
+    scale = 10 ** decimals
+    out = np.full(x.shape, np.nan, dtype=object)
+
+    valid = ~np.isnan(x)
+    units = np.zeros(x.shape, dtype=np.int64)
+    units[valid] = np.rint(x[valid] * scale).astype(np.int64)
+    fast = valid & (units >= 0) & (units < 100 * 3600 * scale)
+
+    u = units[fast]
+    secs, frac = np.divmod(u, scale)
+    h, rem = np.divmod(secs, 3600)
+    m, s = np.divmod(rem, 60)
+
+    width = 8 + (decimals + 1 if decimals else 0)
+    buf = np.empty((len(u), width), dtype=np.uint32)
+    buf[:, 0], buf[:, 1] = h // 10 + _ZERO, h % 10 + _ZERO
+    buf[:, 2] = _COLON
+    buf[:, 3], buf[:, 4] = m // 10 + _ZERO, m % 10 + _ZERO
+    buf[:, 5] = _COLON
+    buf[:, 6], buf[:, 7] = s // 10 + _ZERO, s % 10 + _ZERO
+    if decimals:
+        buf[:, 8] = _DOT
+        for k in range(decimals):
+            buf[:, 9 + k] = (frac // 10 ** (decimals - 1 - k)) % 10 + _ZERO
+    out[fast] = buf.view(f"U{width}").ravel().astype(object)
+
+    for i in np.flatnonzero(valid & ~fast):
+        out[i] = _format_one(float(x[i]), decimals)
+    return out.reshape(shape)